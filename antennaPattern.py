@@ -0,0 +1,131 @@
+###################################################################
+# antennaPattern.py
+#
+# This python module contains the declaration and definition of
+# AntennaPattern class, which gives the vertical discrimination of
+# the antenna for arrays of elevation angles. The discrimination
+# curve shifted by the tilt is computed once per tilt and kept in
+# an LRU cache, so that many tilts can be swept without computing
+# the same curve again.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import numpy as np
+import functools
+import os
+
+
+ANTENNA_PATTERN_CACHE_SIZE = 64   # Number of tilts whose curves are kept in cache
+
+
+class AntennaPattern:
+
+    def __init__(self, vertDiscrmnData, cacheSize = ANTENNA_PATTERN_CACHE_SIZE):
+        """ Constructor is called when instantiating the object
+
+            Input:
+                1. vertDiscrmnData - list of vertical discrimination values for angles
+                                     0 to 360 degrees (see util.readVertDiscrmData)
+                2. cacheSize - number of tilts whose curves are kept in cache """
+
+        self._vertDiscrmnData = np.array(vertDiscrmnData, dtype=float)
+        self._vertDiscrmnData.flags.writeable = False
+
+        #Curves of each tilt, least recently used tilt is removed when cache is full
+        self._getCurve = functools.lru_cache(maxsize=cacheSize)(self._buildCurve)
+
+    def getVertDiscrmnData(self):
+        return self._vertDiscrmnData.tolist()
+
+    def getCacheInfo(self):
+        """ Returns (hits, misses, maxsize, currsize) of the curve cache """
+
+        return self._getCurve.cache_info()
+
+    def _buildCurve(self, tilt):
+        """ Builds the discrimination curve of the antenna tilted by 'tilt' degrees as a
+            function of the elevation angle of the mobile (gamma), for gamma in [-180, 180].
+
+            Discrimination at gamma is the value of the pattern at beta = gamma - tilt
+            (wrapped to [0, 360)), linearly interpolated between integer values of beta.
+            So the knots of the curve are at gamma = k + tilt for integer k, and the curve
+            between them is the same straight line as calculateEIRP uses.
+
+            Output:
+                (array of knot angles, array of discrimination values at knots) """
+
+        #Integer beta values covering gamma from -180 to 180
+        betaKnots = np.arange(int(np.floor(-180 - tilt)), int(np.ceil(180 - tilt)) + 1)
+
+        gammaKnots = betaKnots + tilt
+        values = self._vertDiscrmnData[betaKnots % 360]
+
+        gammaKnots.flags.writeable = False
+        values.flags.writeable = False
+
+        return gammaKnots, values
+
+    def getDiscrimination(self, tilt, gamma):
+        """ Returns the vertical discrimination (in dB) for elevation angles 'gamma'
+            (in degrees, scalar or numpy array) of the antenna tilted by 'tilt' degrees """
+
+        gammaKnots, values = self._getCurve(float(tilt))
+
+        return np.interp(gamma, gammaKnots, values)
+
+    def getDiscriminationGrid(self, tilts, gamma):
+        """ Returns the vertical discrimination (in dB) for every tilt in 'tilts' at the
+            elevation angles 'gamma', as numpy array of shape (tilts,) + gamma.shape.
+            All the tilts are interpolated in one np.interp call over the whole pattern
+            (same values as getDiscrimination, no curves are cached) """
+
+        tilts = np.asarray(tilts, dtype=float)
+        gamma = np.asarray(gamma, dtype=float)
+
+        beta = (gamma[np.newaxis] - tilts.reshape((-1,) + (1,)*gamma.ndim)) % 360
+
+        #Pattern closed at 360 degrees, so values between 359 and 360 are interpolated with 0
+        knots = np.arange(len(self._vertDiscrmnData) + 1)
+        values = np.append(self._vertDiscrmnData, self._vertDiscrmnData[0])
+
+        return np.interp(beta, knots, values)
+
+    def calculateEIRP(self, EIRP_boreSight, tilt, Hb, Hm, dstFromBstn):
+        """ Same as util.calculateEIRP for an array of distances, as one array operation
+
+            Input:
+                1. EIRP_boreSight - EIRP in the direction of bore sight
+                2. tilt - Angle by which antenna is down tilted
+                3. Hb - Height of base station (in meters)
+                4. Hm - Height of mobile (in meters)
+                5. dstFromBstn - distance (or numpy array of distances) of the mobiles
+                                 from base station (in meters)
+
+            Output:
+                EIRP value (or numpy array of values) in dB in the direction of mobiles """
+
+        gamma = np.rad2deg( np.arctan2((Hb - Hm), np.asarray(dstFromBstn, dtype=float)) )
+
+        return EIRP_boreSight - self.getDiscrimination(tilt, gamma)
+
+
+#------------------------------------------------------------------
+# Function to load antenna pattern from file
+#------------------------------------------------------------------
+def loadAntennaPattern(filepath):
+    """ Reads the vertical pattern file and returns the AntennaPattern object. Object
+        is created once per file, so all the base stations and runs in a process share
+        the cached curves """
+
+    return _loadAntennaPattern(os.path.abspath(filepath))
+
+
+@functools.lru_cache(maxsize=None)
+def _loadAntennaPattern(filepath):
+    return AntennaPattern(util.readVertDiscrmData(filepath))
@@ -11,31 +11,134 @@
 #
 ###################################################################
 
+import utilities as util
 import statRecord as stat
+import antennaPattern as antenna
+import pathLoss
+import shadowMap
+import config as cfg
+import numpy as np
+
+def _checkTableResolution(tableResolution):
+    """ Raises ValueError unless 'tableResolution' divides SHADOWING_RESOLUTION, so that
+        no cell of the RSL table spans two shadow values """
+
+    ratio = cfg.SHADOWING_RESOLUTION/tableResolution if tableResolution > 0 else 0
+
+    if ratio < 1 or abs(ratio - round(ratio)) > 1e-9:
+        raise ValueError('RSL table resolution must divide SHADOWING_RESOLUTION ({0} m), got {1} m' \
+                         .format(cfg.SHADOWING_RESOLUTION, tableResolution))
+    return
+
 
 class BaseStation:
     
     def __init__(self, ID, height, location, txPower, lineLoss, \
-                 antennaGain, channels, opFreq, tilt, vertDiscrmnData, shadow):
+                 antennaGain, channels, opFreq, tilt, vertDiscrmnData, shadow, \
+                 moblHeight = cfg.MOBILE_HEIGHT, tableResolution = cfg.RSL_TABLE_RESOLUTION, \
+                 pathLossModel = cfg.PATH_LOSS_MODEL, roadPosition = 0, maxRange = cfg.BSTN_MAX_RANGE):
         
         self._ID = ID                              #ID of bstn
         self._height = height                      #height of bstn
         self._location = location                  #location of bstn orthogonal to road
+        self._roadPosition = roadPosition          #position of bstn along the road (in meters)
+        self._maxRange = maxRange                  #distance along the road covered by bstn (in meters)
         self._txPower = txPower                    #transmitter power
         self._lineLoss = lineLoss                  #connector line losses
         self._antennaGain = antennaGain            #antenna gain
         self._channels = channels                  #number of channels per sector
         self._opFreq = opFreq                      #operating frequency
         self._tilt = tilt                          #tilt angle of antenna
-        self._vertDiscrmnData = vertDiscrmnData[:] #Copying list
+
+        #Vertical discrimination (list of values, or AntennaPattern object to share cached curves)
+        if isinstance(vertDiscrmnData, antenna.AntennaPattern):
+            self._antennaPattern = vertDiscrmnData
+        else:
+            self._antennaPattern = antenna.AntennaPattern(vertDiscrmnData)
+
         self._shadowValues = shadow.copy()         #Copying Array
+        self._moblHeight = moblHeight              #height of the mobiles served
+        self._tableResolution = tableResolution    #resolution of RSL table (in meters)
+        _checkTableResolution(tableResolution)
+
+        #Path loss model (name in pathLoss.PATH_LOSS_MODELS, created again when height changes,
+        #or a pathLoss.PathLossModel object which is used as it is)
+        self._pathLossModelName = None
+        self._pathLossModel = None
+        self.setPathLossModel(pathLossModel, bRebuild = False)
 
         #More initializations
         self._boreEIRP = self._txPower - self._lineLoss + self._antennaGain 
         
         self.freeChannels = self._channels         #Number of free channels
         self.stats = stat.Statistics()             #Statistics object
-        
+
+        #Precompute the RSL table (EIRP - path loss + shadow) along the road
+        self._rslTable = None
+        self._buildRSLTable()
+
+    def _buildRSLTable(self):
+        """ Builds the table of RSL values without fading for distances 0 to maxRange
+            from the bstn. Each row of the table belongs to one cell of 'tableResolution' 
+            meters and holds [RSL at the start of the cell, change of RSL across the cell].
+            Shadow value is constant inside a cell (tableResolution divides
+            SHADOWING_RESOLUTION, see _checkTableResolution), so only the EIRP and path
+            loss part is interpolated. Must be called again when any parameter of bstn changes """
+
+        numOfCells = int(np.ceil(self._maxRange/self._tableResolution))
+
+        distances = np.arange(numOfCells + 1) * self._tableResolution
+        actualDistances = np.sqrt( (self._location ** 2) + (distances ** 2) )
+
+        eirp = self._antennaPattern.calculateEIRP(self._boreEIRP, self._tilt, self._height, self._moblHeight, \
+                                                  actualDistances)
+
+        pLoss = self._pathLossModel.getPathLoss(actualDistances/1000)
+
+        rslNoShadow = eirp - pLoss
+
+        #Shadow value of each cell is taken at the middle of the cell
+        shadowIndex = ((distances[:-1] + self._tableResolution/2)//cfg.SHADOWING_RESOLUTION).astype(int)
+        shadowIndex = np.minimum(shadowIndex, len(self._shadowValues) - 1)
+
+        self._rslTable = np.empty((numOfCells, 2))
+        self._rslTable[:, 0] = rslNoShadow[:-1] + self._shadowValues[shadowIndex]
+        self._rslTable[:, 1] = np.diff(rslNoShadow)
+
+        return
+
+    def getMedianRSL(self, dstFromBstn):
+        """ Returns the RSL value without fading (EIRP - path loss + shadow) at the distance
+            'dstFromBstn' (in meters along the road) by looking up the precomputed table.
+            Accepts a single distance or a numpy array of distances. RSL is -inf beyond
+            maxRange (bstn can not be received) """
+
+        dstFromBstn = np.asarray(dstFromBstn)
+
+        cellIndex = np.minimum(dstFromBstn//self._tableResolution, len(self._rslTable) - 1).astype(int)
+        fraction = dstFromBstn/self._tableResolution - cellIndex
+
+        medianRSL = self._rslTable[cellIndex, 0] + fraction * self._rslTable[cellIndex, 1]
+
+        return np.where(dstFromBstn > self._maxRange, -np.inf, medianRSL)
+
+    def getRSLTable(self):
+        """ Returns the RSL table, rows of [RSL at the start of the cell, change of RSL across
+            the cell] for cells of 'tableResolution' meters from the bstn """
+
+        return self._rslTable
+
+    def getRoadPosition(self):
+        return self._roadPosition
+
+    def getMaxRange(self):
+        return self._maxRange
+
+    def getDistance(self, position):
+        """ Returns the distance along the road (in meters) of 'position' (scalar or numpy array) from bstn """
+
+        return np.abs(np.asarray(position) - self._roadPosition)
+
     def getID(self):
         return self._ID
 
@@ -51,8 +154,58 @@ class BaseStation:
     def getTilt(self):
         return self._tilt
 
+    def setTilt(self, tilt):
+        self._tilt = tilt
+        self._buildRSLTable()
+        return
+
+    def setHeight(self, height):
+        self._height = height
+
+        if self._pathLossModelName is not None:
+            self._pathLossModel = pathLoss.createPathLossModel(self._pathLossModelName, self._opFreq, \
+                                                               self._height, self._moblHeight)
+        self._buildRSLTable()
+        return
+
+    def getPathLossModel(self):
+        return self._pathLossModel
+
+    def setPathLossModel(self, pathLossModel, bRebuild = True):
+        """ Sets the path loss model, either by name (see pathLoss.PATH_LOSS_MODELS) or as
+            a pathLoss.PathLossModel object """
+
+        if isinstance(pathLossModel, pathLoss.PathLossModel):
+            self._pathLossModelName = None
+            self._pathLossModel = pathLossModel
+        else:
+            self._pathLossModelName = pathLossModel
+            self._pathLossModel = pathLoss.createPathLossModel(pathLossModel, self._opFreq, \
+                                                               self._height, self._moblHeight)
+        if bRebuild:
+            self._buildRSLTable()
+        return
+
+    def setTxPower(self, txPower):
+        self._txPower = txPower
+        self._boreEIRP = self._txPower - self._lineLoss + self._antennaGain
+        self._buildRSLTable()
+        return
+
+    def getTableResolution(self):
+        return self._tableResolution
+
+    def setTableResolution(self, tableResolution):
+        _checkTableResolution(tableResolution)
+        self._tableResolution = tableResolution
+        self._buildRSLTable()
+        return
+
     def getVertDiscrmnData(self):
-        return self._vertDiscrmnData
+        return self._antennaPattern.getVertDiscrmnData()
+
+    def getAntennaPattern(self):
+        return self._antennaPattern
 
     def getBoreSightEIRP(self):
         return self._boreEIRP
@@ -70,8 +223,8 @@ class BaseStation:
         self.freeChannels = self.freeChannels - 1
         return
 
-    def incrFreeChanCount(self):
-        self.freeChannels = self.freeChannels + 1
+    def incrFreeChanCount(self, count = 1):
+        self.freeChannels = self.freeChannels + count
         return
 
     def getShadowValues(self):
@@ -95,3 +248,26 @@ class BaseStation:
 
         return
 
+
+#------------------------------------------------------------------
+# Functions to name the base stations and compute their shadowing
+#------------------------------------------------------------------
+def getBstnID(iBstn, numOfBstns):
+    """ Returns ID of the iBstn-th base station from the left ('A', 'B', ... or
+        'BS000', 'BS001', ... if there are more than 26 stations) """
+
+    return chr(ord('A') + iBstn) if numOfBstns <= 26 else 'BS{0:03d}'.format(iBstn)
+
+
+def createShadowValues(iBstn):
+    """ Returns shadowing values of the iBstn-th base station, covering its range
+        BSTN_MAX_RANGE. Seed of each station is fixed (0 for A, 4 for B ...), so the
+        values are the same in every run """
+
+    numOfShadowValues = int(np.ceil(cfg.BSTN_MAX_RANGE/cfg.SHADOWING_RESOLUTION))
+
+    if cfg.SHADOWING_MODEL == 'correlated':
+        return shadowMap.getShadowMap(numOfShadowValues, cfg.SHADOWING_RESOLUTION, cfg.SHADOWING_MEAN, \
+                                      cfg.SHADOWING_STD, cfg.SHADOWING_DECORR_DISTANCE, 4*iBstn, cfg.SHADOW_MAP_CACHE_DIR)
+
+    return util.shadowing(numOfShadowValues, cfg.SHADOWING_MEAN, cfg.SHADOWING_STD, 4*iBstn, True)
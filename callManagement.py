@@ -30,61 +30,198 @@ def findRSL(mobl, bstn):
         Output:
             RSL value in (dBm)  """
 
-    moblPosition = mobl.getPosition()
-    bstnID = bstn.getID()
-    bstnLocation = bstn.getLocation()
+    #Calculate the distance along the road between mobile & bstn
+    dstFromBstn = bstn.getDistance(mobl.getPosition())
 
-    #Calculate the distance between mobile & bstn based on the position and bstn ID
-    dstFromBstn = moblPosition
+    #EIRP, path loss and shadow are fixed for a distance, so take them from bstn's RSL table
+    medianRSL = bstn.getMedianRSL(dstFromBstn)
 
-    if bstnID == 'B':
-        dstFromBstn = cfg.ROAD_LENGTH - moblPosition
+    fade = util.rayleighFadingInvCDF()
 
-    actualDstFromBstn = np.sqrt( (bstnLocation ** 2)  + (dstFromBstn ** 2) )
-    #actualDstFromBstn = dstFromBstn
+    #Compute RSL
+    rsl = medianRSL + fade
 
-    eirp = util.calculateEIRP(bstn.getBoreSightEIRP(), bstn.getTilt(), \
-                              bstn.getHeight(), mobl.getHeight(), \
-                              actualDstFromBstn, bstn.getVertDiscrmnData())
+    return rsl
 
-    pLoss = util.okamuraHata(actualDstFromBstn/1000, bstn.getOperationalFreq(), \
-                             bstn.getHeight(), mobl.getHeight())
+#------------------------------------------------------------------
+# Function for Calculating RSL for a batch of mobiles
+#------------------------------------------------------------------
+def findRSLBatch(positions, bstnIDs, bstnDataBase):
+    """ Vectorized version of findRSL. Calculates the RSL values at many mobiles
+        in one pass. The i-th RSL value is the same as the value findRSL returns
+        for the i-th mobile when called in the same order (for a fixed seed, up 
+        to floating point rounding)
 
-    shadowValues = bstn.getShadowValues()
+        Input:
+            1. positions - array of mobile positions on the road
+            2. bstnIDs - array of base station IDs (one for each position)
+                         from which RSL is calculated
+            3. bstnDataBase - dictionary of base station objects with key as ID
 
-    shadowIndex = int(dstFromBstn//cfg.SHADOWING_RESOLUTION)
+        Output:
+            numpy array of RSL values in (dBm)  """
 
-    #This happens when distance is exactly 6000, then take the value of shadow from last index
-    if shadowIndex >= len(shadowValues):
-        shadowIndex = len(shadowValues) - 1
-    
-    shadow = shadowValues[shadowIndex]
+    positions = np.asarray(positions, dtype=float)
+    bstnIDs = np.asarray(bstnIDs)
 
-    fade = util.rayleighFading()
+    rsl = np.empty(len(positions))
 
-    #Compute RSL
-    rsl = eirp - pLoss + shadow + fade
+    #Look up the RSL without fading for all mobiles served by the same bstn at once
+    for bstnID in np.unique(bstnIDs):
+        mask = (bstnIDs == bstnID)
+
+        dstFromBstn = bstnDataBase[bstnID].getDistance(positions[mask])
+
+        rsl[mask] = bstnDataBase[bstnID].getMedianRSL(dstFromBstn)
+
+    #Fading values are drawn in the order of the mobiles (same as calling findRSL one by one)
+    rsl += util.rayleighFadingInvCDF(len(positions))
 
     return rsl
 
+#------------------------------------------------------------------
+# Functions for Calculating RSL with the station index
+#------------------------------------------------------------------
+def findRSLByIndex(stationIdx, bstnIndex, positions, fadeSource = None, userIds = None):
+    """ Calculates the RSL values at mobiles in 'positions' from the stations
+        'bstnIndex' (indices in stationIdx, one for each position). Fading values
+        are drawn with np.random, or taken from fadeSource(userIds, bstnIndex) which
+        returns one fading value per (user, station) pair (e.g. a traffic trace)
+
+        Output:
+            numpy array of RSL values in (dBm)  """
+
+    rsl = stationIdx.getMedianRSL(bstnIndex, positions)
+
+    rsl += _drawFades(fadeSource, userIds, bstnIndex)
+
+    return rsl
+
+
+def findNeighbourRSLBatch(stationIdx, positions, serverIndex, numOfNeighbours, fadeSource = None, userIds = None):
+    """ Finds the 'numOfNeighbours' strongest stations (other than the server) near
+        each mobile and calculates their RSL values. Only the stations near the mobile
+        are evaluated (see StationIndex.getStrongest)
+
+        Input:
+            1. stationIdx - StationIndex object of the base stations
+            2. positions - array of mobile positions on the road
+            3. serverIndex - array of indices of serving stations of the mobiles
+            4. numOfNeighbours - number of neighbour stations per mobile
+            5. fadeSource - optional source of fading values (see findRSLByIndex)
+            6. userIds - IDs of the users (needed with fadeSource)
+
+        Output:
+            (2-D array of neighbour station indices, 2-D array of their RSL values in dBm),
+            both of shape (mobiles x neighbours) """
+
+    positions = np.asarray(positions, dtype=float)
+
+    neighbourIndex = stationIdx.getStrongest(positions, numOfNeighbours, serverIndex)
+
+    rsl = stationIdx.getMedianRSL(neighbourIndex, positions[:, np.newaxis])
+    rsl += _drawFades(fadeSource, userIds, neighbourIndex)
+
+    return neighbourIndex, rsl
+
+
+def findCallCandidatesBatch(stationIdx, positions, fadeSource = None, userIds = None):
+    """ Finds the two strongest stations near each mobile making a call request and
+        calculates their RSL values. Fading values are drawn for the first candidate
+        of all the mobiles and then for the second (with two stations this is the same
+        as findRSLBatch for 'A' and then for 'B'). With fadeSource, fading values are
+        taken from fadeSource(userIds, candidate indices) (see findRSLByIndex)
+
+        Output:
+            (2-D array of candidate station indices, 2-D array of their RSL values in dBm),
+            both of shape (mobiles x 2), fewer columns if there is only one station """
+
+    positions = np.asarray(positions, dtype=float)
+
+    candidateIndex = stationIdx.getStrongest(positions, 2)
+
+    rsl = stationIdx.getMedianRSL(candidateIndex, positions[:, np.newaxis])
+    if fadeSource is None:
+        rsl += util.rayleighFadingInvCDF(rsl.size).reshape(rsl.shape[::-1]).T
+    else:
+        rsl += _drawFades(fadeSource, userIds, candidateIndex)
+
+    return candidateIndex, rsl
+
+
+def _drawFades(fadeSource, userIds, bstnIndex):
+    """ Returns fading values of the shape of bstnIndex (one row per user), drawn in
+        order with np.random, or from fadeSource(userIds, bstnIndex) """
+
+    bstnIndex = np.asarray(bstnIndex)
+
+    if fadeSource is None:
+        return util.rayleighFadingInvCDF(bstnIndex.size).reshape(bstnIndex.shape)
+
+    return fadeSource(userIds, bstnIndex)
+
+
+def findHandoffTargets(neighbourIndex, rslNeighbours):
+    """ Returns (array of indices of the strongest neighbour of each mobile, array of
+        their RSL values in dBm). RSL is -inf if a mobile has no neighbours """
+
+    if rslNeighbours.shape[1] == 0:
+        return np.zeros(len(rslNeighbours), dtype=int), np.full(len(rslNeighbours), -np.inf)
+
+    best = np.argmax(rslNeighbours, axis=1)
+    rows = np.arange(len(rslNeighbours))
+
+    return neighbourIndex[rows, best], rslNeighbours[rows, best]
+
+
+#------------------------------------------------------------------
+# Function for Calculating S/I
+#------------------------------------------------------------------
+def calculateSgnlIx(rslServer, rslNeighbours):
+    """ Calculates S/I (in dB) as the power of serving station over the sum of the
+        powers (in linear scale) of the neighbour stations
+
+        Input:
+            1. rslServer - array of RSL values from the serving stations (in dBm)
+            2. rslNeighbours - array (mobiles x neighbours, or any shape with neighbours
+                               as last axis) of RSL values from the neighbour stations (in dBm)
+
+        Output:
+            numpy array of S/I values in dB (inf if there are no neighbours) """
+
+    if rslNeighbours.shape[-1] == 0:
+        return np.full(np.shape(rslServer), np.inf)
+
+    if rslNeighbours.shape[-1] == 1:
+        return rslServer - rslNeighbours[..., 0]
+
+    interference = 10*np.log10(np.sum(np.power(10, rslNeighbours/10), axis=-1))
+
+    return rslServer - interference
+
+
 #------------------------------------------------------------------
 # Function to establish call 
 #------------------------------------------------------------------
-def establishCall(user, bstn):
+def establishCall(user, bstn, duration = None, speed = None):
     """ This function takes care of the actions required to establish call.
         Determines the length of the call duration, Speed of the user etc 
         and saves the information in the user 
 
         Input:
             1. user - mobile object for which call is getting established
-            2. bstn - base station to which the boile is getting connected"""
+            2. bstn - base station to which the boile is getting connected
+            3. duration - optional call duration (in seconds), drawn if not given
+            4. speed - optional speed of the user (in meter per sec), drawn if not given"""
     
     #1. Determine length of the call
-    duration = np.random.exponential(cfg.AVG_CALL_DURATION) # value passed in is 180sec
+    if duration is None:
+        duration = np.random.exponential(cfg.AVG_CALL_DURATION) # value passed in is 180sec
     user.setCallDurationLeft(duration)
 
     #2. Determine the speed of the user
-    speed = np.random.normal(cfg.MOBILE_SPEED_MEAN, cfg.MOBILE_SPEED_STD)
+    if speed is None:
+        speed = np.random.normal(cfg.MOBILE_SPEED_MEAN, cfg.MOBILE_SPEED_STD)
     user.setSpeed(speed)
 
     #3. Set the bstn ID as serving base station in mobile object
@@ -129,7 +266,7 @@ def updateUserCallInfo(user, delta_T):
 
     bRet = False #Initializing that call is not terminated
 
-    if newDurLeft <= 0 or (newLocation >= 6000 or newLocation <= 0):
+    if newDurLeft <= 0 or (newLocation >= cfg.ROAD_LENGTH or newLocation <= 0):
         bRet = True
     else:
         user.setCallDurationLeft(newDurLeft)
@@ -138,3 +275,155 @@ def updateUserCallInfo(user, delta_T):
     return bRet
 
 
+#------------------------------------------------------------------
+# Function to update call info of many users at once
+#------------------------------------------------------------------
+def updateUserCallInfoBatch(population, slots, delta_T):
+    """ Vectorized version of updateUserCallInfo. Updates the position and call 
+        duration left of all the users in 'slots' with whole array operations.
+
+        Input: 
+            1. population - population object holding the state of users
+            2. slots - numpy array of slots (in population) of users to be updated
+            3. delta_T - time difference
+        
+        Output:
+            numpy boolean array, True for the users whose call is successfully 
+            completed (their info is not updated, same as updateUserCallInfo)"""
+
+    # New location = current Location (+ or -) distance travelled
+    newLocation = population.position[slots] + population.direction[slots] * (population.speed[slots] * delta_T)
+
+    newDurLeft = population.callDurationLeft[slots] - delta_T
+
+    bCompleted = (newDurLeft <= 0) | (newLocation >= cfg.ROAD_LENGTH) | (newLocation <= 0)
+
+    continuing = slots[~bCompleted]
+    population.callDurationLeft[continuing] = newDurLeft[~bCompleted]
+    population.position[continuing] = newLocation[~bCompleted]
+
+    return bCompleted
+
+#------------------------------------------------------------------
+# Function to attempt a new call
+#------------------------------------------------------------------
+def attemptCall(user, rslCandidates, bstnCandidates, duration = None, speed = None):
+    """ This function takes care of the call request of a user. Selects the 
+        candidate base station with higher RSL as server, checks the signal strength
+        and capacity, and establishes the call (on the other candidate if server
+        is out of capacity). Stats are updated on the base stations.
+
+        Input:
+            1. user - mobile object which is making the call request
+            2. rslCandidates - RSL values at the mobile from the candidate base
+                               stations (one or two values)
+            3. bstnCandidates - candidate base station objects (same order)
+            4. duration, speed - optional call duration and speed (see establishCall)
+
+        Output:
+            True - Call is established
+            False - Call is not established"""
+
+    bstn = chooseCallServer(user.getRxThreshold(), rslCandidates, bstnCandidates)
+
+    if bstn is None:
+        return False
+
+    establishCall(user, bstn, duration, speed)   #establish the call
+    return True
+
+
+def chooseCallServer(rxThreshold, rslCandidates, bstnCandidates):
+    """ Decides the base station on which a call request is established (see attemptCall).
+        Stats of the request are updated on the base stations, except successful call
+        establishment, which is counted when the call is established.
+
+        Input:
+            1. rxThreshold - Rx threshold of the mobile (in dBm)
+            2. rslCandidates - RSL values at the mobile from the candidate base
+                               stations (one or two values)
+            3. bstnCandidates - candidate base station objects (same order)
+
+        Output:
+            base station object to establish the call on (None if call is not established) """
+
+    rslServer = rslCandidates[0]   #Initialize higher value as first candidate
+    serverBstn = bstnCandidates[0]
+    rslOther = -np.inf
+    otherBstn = None
+
+    if len(rslCandidates) > 1:
+        rslOther = rslCandidates[1]
+        otherBstn = bstnCandidates[1]
+
+        if rslOther > rslServer:
+            rslServer, rslOther = rslOther, rslServer
+            serverBstn, otherBstn = otherBstn, serverBstn
+
+    bstn = None #Initializing that call is not established
+
+    #Check if the RSL server is greater than mobile threshold
+    if rslServer < rxThreshold:
+        #Increment call drop stat for server bstn
+        serverBstn.stats.incrStat(util.StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH)
+    
+    else:
+    #{ start of else
+        #Attempt to establish a call, increment stat
+        serverBstn.stats.incrStat(util.StatName.CALL_ATTEMPTS)
+
+        if serverBstn.isFreeChanAvailable():
+            bstn = serverBstn
+
+        else:
+            #1.Increment the call blocked due to capacity stat for serving base station
+            serverBstn.stats.incrStat(util.StatName.CALL_BLOCK_CAPACITY)
+
+            #2. Check if the other bstn can take up the call
+            if rslOther > rxThreshold and otherBstn.isFreeChanAvailable():
+                otherBstn.stats.incrStat(util.StatName.CALL_ATTEMPTS)
+                bstn = otherBstn
+
+            else:
+                #increment the dropped call due to cap stat for ORIGINAL bstn
+                serverBstn.stats.incrStat(util.StatName.CALL_DROP_CAPACITY)
+    #} End of else
+
+    return bstn
+
+#------------------------------------------------------------------
+# Function to attempt handoff
+#------------------------------------------------------------------
+def attemptHandoff(user, bstnServer, bstnOther):
+    """ This function hands off the call of user from bstnServer to bstnOther 
+        if bstnOther has a free channel. Stats are updated on both base stations.
+
+        Input:
+            1. user - mobile object whose call is handed off
+            2. bstnServer - base station currently serving the user
+            3. bstnOther - base station to which the call is handed off
+
+        Output:
+            True - Handoff successful
+            False - Handoff failed"""
+
+    bstnServer.stats.incrStat(util.StatName.HANDOFF_ATTEMPTS_OUT)
+    bstnOther.stats.incrStat(util.StatName.INCOMING_HANDOFF_RQTS)
+
+    if bstnOther.isFreeChanAvailable():
+        user.setConnectedBstnID(bstnOther.getID())   #Changing serving bstn
+        bstnOther.decrFreeChanCount()
+        bstnServer.incrFreeChanCount()
+
+        #Increment successful handoff out stat for old bstn
+        bstnServer.stats.incrStat(util.StatName.SUCCESSFUL_HANDOFFS)
+        bstnOther.stats.incrStat(util.StatName.HANDOFF_RQTS_ACCEPTED)
+
+        return True
+
+    #Increment handoff failed stat for serving bstn
+    bstnServer.stats.incrStat(util.StatName.HANDOFF_FAILURE)
+    bstnOther.stats.incrStat(util.StatName.HANDOFF_RQTS_REJECTED)
+
+    return False
+
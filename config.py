@@ -16,12 +16,20 @@
 #------------------------------------------------------------------
 ROAD_LENGTH              = 6000  # In meters
 SIMULATION_STEP_SIZE     = 1     # seconds
+SIMULATION_ENGINE        = 'tick' # 'tick' (fixed time steps) or 'event' (discrete events)
+MEASUREMENT_INTERVAL     = 1     # seconds (time between signal checks in 'event' engine)
+KPI_RECORD_INTERVAL      = 3600  # seconds (time between snapshots of base station statistics)
+PRINT_HOURLY_STATS       = True  # print statistics table of base stations after every hour
+WARM_START               = False # start with calls in progress sampled in steady state (see warmStart.py, 'tick' engine)
 VERTICAL_PATTERN_FILEPATH = './vertical_pattern.txt'
 
 
 #------------------------------------------------------------------
 # ** BASE-STATION PARAMETERS **
 #------------------------------------------------------------------
+NUM_OF_BSTNS             = 2     # base stations placed evenly along the road (first at 0, last at ROAD_LENGTH)
+BSTN_MAX_RANGE           = 6000  # In meters (distance along the road up to which a bstn can be received)
+INTERFERENCE_NEIGHBOURS  = 1     # number of strongest neighbour bstns whose power is summed as interference
 BSTN_HEIGHT              = 50    # In meters
 BSTN_LOCATION            = 15    # In meters orthogonal to road
 TX_POWER                 = 43    # In dBm
@@ -29,6 +37,8 @@ CONNECTOR_LOSSES         = 1     # In dB
 ANTENNA_GAIN             = 14.8  # In dB
 CHANNELS_PER_SECTOR      = 15
 FREQUENCY                = 800   # In MHz
+RSL_TABLE_RESOLUTION     = 1     # In meters (resolution of precomputed RSL table, must divide SHADOWING_RESOLUTION)
+PATH_LOSS_MODEL          = 'okumura-hata' # see PATH_LOSS_MODELS in pathLoss.py
 
 #------------------------------------------------------------------
 # ** MOBILE/USER PARAMETERS **
@@ -49,5 +59,9 @@ MOBILE_SPEED_STD         = 3     # In meter/sec
 SHADOWING_RESOLUTION     = 20    # In meters
 SHADOWING_MEAN           = 2     # In dB
 SHADOWING_STD            = 2     # In dB
+SHADOWING_MODEL          = 'independent' # 'independent' samples or 'correlated' (see shadowMap.py)
+SHADOWING_DECORR_DISTANCE = 50   # In meters (correlation falls to 1/e, used by 'correlated' model)
+SHADOW_MAP_CACHE_DIR     = './shadow_cache' # Directory of cached shadowing maps (None to turn off)
+RSL_PROFILE_CACHE_DIR    = './rsl_profile_cache' # Directory of cached RSL profiles (None to turn off, see rslProfile.py)
 
 
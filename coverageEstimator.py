@@ -0,0 +1,262 @@
+###################################################################
+# coverageEstimator.py
+#
+# This python module estimates the coverage of the road without
+# simulating any call traffic. The RSL from a base station is its
+# median RSL (see rslProfile.py) plus a fading value with the closed
+# form CDF util.fadeCDF, so the probability of coverage, of the
+# choice of base station and of each S/I class at every position is
+# computed from CDFs, in a few milliseconds per tilt.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import rslProfile
+import config as cfg
+import numpy as np
+import argparse
+import time
+
+
+FADE_GRID_STEP = 0.02                  # In dB, resolution of fading distribution used for the difference
+FADE_GRID_RANGE = (-80, 20)            # In dB, fading values outside have negligible probability
+
+SGNL_IX_CLASSES = ['lt5dB', '5to10dB', 'gt10dB']    # Same classes as util.SgnlIxAccumulator
+
+_fadeDifferenceTable = None  # Built on first use
+
+
+#------------------------------------------------------------------
+# Distribution of difference of two fading values
+#------------------------------------------------------------------
+def fadeDifferenceCDF(difference):
+    """ Returns P(F1 - F2 <= difference), where F1 and F2 are independent fading values
+        of util.rayleighFading (scalar or numpy array of differences in dB).
+
+        The probabilities of fading values on a grid of FADE_GRID_STEP dB are computed
+        from util.fadeCDF and convolved once, then the CDF is interpolated """
+
+    global _fadeDifferenceTable
+
+    if _fadeDifferenceTable is None:
+        edges = np.arange(FADE_GRID_RANGE[0], FADE_GRID_RANGE[1] + FADE_GRID_STEP, FADE_GRID_STEP)
+
+        probability = np.diff(util.fadeCDF(edges))
+        probability /= np.sum(probability)
+
+        #Distribution of F1 - F2 on the grid of differences of the bin indices
+        differenceProbability = np.convolve(probability, probability[::-1])
+        differences = (np.arange(len(differenceProbability)) - (len(probability) - 1)) * FADE_GRID_STEP
+
+        #CDF at the upper end of each bin
+        _fadeDifferenceTable = (differences + FADE_GRID_STEP/2, np.minimum(np.cumsum(differenceProbability), 1))
+
+    differences, cdf = _fadeDifferenceTable
+
+    return np.interp(difference, differences, cdf, left=0.0, right=1.0)
+
+
+#------------------------------------------------------------------
+# Class to hold the coverage estimate of one tilt
+#------------------------------------------------------------------
+class CoverageEstimate:
+
+    def __init__(self, tilt, bstnIDs, positions, probCovered, probServer, servingIndex, probSgnlIx, probSgnlIxByServer):
+
+        self.tilt = tilt                      # Antenna tilt (in degrees)
+        self.bstnIDs = bstnIDs                # IDs of base stations
+        self.positions = positions            # positions on the road (in meters)
+
+        #Probability that a call request at each position finds RSL above RX_THRESHOLD
+        self.probCovered = probCovered
+
+        #Probability that each base station is chosen as server of a call request (bstns x positions)
+        self.probServer = probServer
+
+        #Index of the base station with the highest median RSL, and probability of each S/I class
+        #(SGNL_IX_CLASSES x positions) of the serving base station, weighted by probServer
+        self.servingIndex = servingIndex
+        self.probSgnlIx = probSgnlIx
+
+        #Probability that each base station serves and its S/I is in each class (bstns x 3 x positions)
+        self.probSgnlIxByServer = probSgnlIxByServer
+
+    def getCoverage(self):
+        """ Returns the expected fraction of the road covered (above RX_THRESHOLD) """
+
+        return float(np.mean(self.probCovered))
+
+    def getSgnlIxShares(self):
+        """ Returns dictionary of the expected fraction of S/I samples in each class """
+
+        #Positions without a server have no S/I samples
+        total = max(float(np.sum(self.probSgnlIx)), 1e-300)
+
+        return {sgnlIxClass: float(np.sum(self.probSgnlIx[iClass]))/total for iClass, sgnlIxClass in enumerate(SGNL_IX_CLASSES)}
+
+    def getSgnlIxBySection(self, sectionSize = util.ROAD_SECTION_SIZE):
+        """ Returns the probability of each S/I class of the samples of each base station
+            in each road section (samples weighted by the probability that the base
+            station serves), as numpy array of shape (base stations, 3, road sections),
+            same layout as util.SgnlIxAccumulator.counts """
+
+        numOfSections = int(cfg.ROAD_LENGTH//sectionSize)
+        sectionIndex = np.minimum((self.positions//sectionSize).astype(int), numOfSections - 1)
+
+        sums = np.zeros((len(self.bstnIDs), 3, numOfSections))
+        weights = np.zeros((len(self.bstnIDs), numOfSections))
+
+        for iBstn in range(len(self.bstnIDs)):
+            weights[iBstn] = np.bincount(sectionIndex, self.probServer[iBstn], minlength=numOfSections)
+
+            for iClass in range(3):
+                sums[iBstn, iClass] = np.bincount(sectionIndex, self.probSgnlIxByServer[iBstn, iClass], \
+                                                  minlength=numOfSections)
+
+        return sums / np.where(weights > 0, weights, 1)[:, np.newaxis, :]
+
+
+#------------------------------------------------------------------
+# Function to estimate coverage from median RSL
+#------------------------------------------------------------------
+def estimateFromMedianRSL(tilt, bstnIDs, positions, medianRSL, rxThreshold = cfg.RX_THRESHOLD):
+    """ Computes the coverage estimate from the median RSL of the base stations
+
+        As in callManagement.attemptCall, a call request is offered to the two base
+        stations with the highest median RSL (a, b) and served by the one with higher
+        faded RSL:
+            P(covered)     = 1 - fadeCDF(threshold - Ma) * fadeCDF(threshold - Mb)
+            P(a is server) = P(Fa - Fb > Mb - Ma)
+        S/I of a over b is (Ma - Mb) + (Fa - Fb), so the probability of each S/I class is
+        a difference of fadeDifferenceCDF values, and the S/I of b is its negative. The
+        S/I classes are weighted by P(a is server) and P(b is server).
+
+        Approximations: the server is chosen with fading values independent of the ones
+        of the S/I sample (it was chosen at call setup), and handoff is not modelled. In
+        the simulation the server stays until a neighbour is better by HANDOFF_MARGIN,
+        so near cell borders the estimate of the S/I of each base station is biased.
+        Positions where no base station can be received have no server and no S/I.
+
+        Input:
+            1. tilt - Antenna tilt (in degrees)
+            2. bstnIDs - IDs of base stations
+            3. positions - positions on the road (in meters)
+            4. medianRSL - 2-D array of median RSL (in dBm) of base stations x positions
+            5. rxThreshold - minimum RSL of a call (in dBm)
+
+        Output:
+            CoverageEstimate object """
+
+    medianRSL = np.asarray(medianRSL, dtype=float)
+    numOfBstns, numOfPositions = medianRSL.shape
+    columns = np.arange(numOfPositions)
+
+    #1. Two strongest base stations at each position (a - strongest, b - second)
+    if numOfBstns > 1:
+        order = np.argsort(-medianRSL, axis=0, kind='stable')[:2]
+        indexA, indexB = order[0], order[1]
+        rslA, rslB = medianRSL[indexA, columns], medianRSL[indexB, columns]
+    else:
+        indexA = indexB = np.zeros(numOfPositions, dtype=int)
+        rslA, rslB = medianRSL[0], np.full(numOfPositions, -np.inf)
+
+    #2. Coverage (fading of the two base stations is independent)
+    with np.errstate(invalid='ignore'):
+        probCovered = 1 - util.fadeCDF(rxThreshold - rslA) * util.fadeCDF(rxThreshold - rslB)
+
+    #3. Choice of server. Where both are out of range (-inf), rslB - rslA is NaN and there is no server
+    bInRange = ~np.isneginf(rslA)
+    bOnlyA = bInRange & np.isneginf(rslB)
+
+    with np.errstate(invalid='ignore'):
+        meanDifference = np.where(bInRange & ~bOnlyA, rslA - rslB, 0)
+
+    probServerA = np.where(bOnlyA, 1.0, np.where(bInRange, 1 - fadeDifferenceCDF(-meanDifference), 0.0))
+    probServerB = np.where(bInRange, 1 - probServerA, 0.0)
+
+    probServer = np.zeros((numOfBstns, numOfPositions))
+    np.add.at(probServer, (indexA, columns), probServerA)
+
+    if numOfBstns > 1:
+        np.add.at(probServer, (indexB, columns), probServerB)
+
+    #4. S/I classes (S/I <= 5dB, 5dB < S/I <= 10dB, S/I > 10dB) of a (mean S/I is Ma - Mb, +inf if b
+    #is out of range) and of b (mean S/I is Mb - Ma)
+    def classProbabilities(meanSgnlIx):
+        below5 = fadeDifferenceCDF(5 - meanSgnlIx)
+        below10 = fadeDifferenceCDF(10 - meanSgnlIx)
+        return np.stack([below5, below10 - below5, 1 - below10])
+
+    sgnlIxOfA = classProbabilities(np.where(bOnlyA, np.inf, meanDifference)) * probServerA
+    sgnlIxOfB = classProbabilities(-meanDifference) * probServerB
+
+    probSgnlIxByServer = np.zeros((numOfBstns, 3, numOfPositions))
+    for iClass in range(3):
+        np.add.at(probSgnlIxByServer[:, iClass], (indexA, columns), sgnlIxOfA[iClass])
+
+        if numOfBstns > 1:
+            np.add.at(probSgnlIxByServer[:, iClass], (indexB, columns), sgnlIxOfB[iClass])
+
+    return CoverageEstimate(tilt, list(bstnIDs), np.asarray(positions, dtype=float), probCovered, probServer, \
+                            indexA, sgnlIxOfA + sgnlIxOfB, probSgnlIxByServer)
+
+
+#------------------------------------------------------------------
+# Functions to estimate coverage of tilts
+#------------------------------------------------------------------
+def estimateCoverage(tilts, numOfBstns = cfg.NUM_OF_BSTNS, resolution = cfg.RSL_TABLE_RESOLUTION, \
+                     rxThreshold = cfg.RX_THRESHOLD, cacheDir = cfg.RSL_PROFILE_CACHE_DIR):
+    """ Estimates the coverage of the road for every tilt in 'tilts'. Median RSL of all
+        the tilts is computed in one pass (or loaded from cache, see rslProfile.py)
+
+        Output:
+            List of CoverageEstimate objects (same order as tilts) """
+
+    profiles = rslProfile.getRSLProfiles(tilts, numOfBstns, resolution = resolution, cacheDir = cacheDir)
+
+    estimates = []
+
+    for tilt in profiles.getTilts():
+        medianRSL = np.stack([profiles.getProfile(bstnID, tilt) for bstnID in profiles.getBstnIDs()])
+
+        estimates.append(estimateFromMedianRSL(tilt, profiles.getBstnIDs(), profiles.getPositions(), \
+                                               medianRSL, rxThreshold))
+    return estimates
+
+
+#------------------------------------------------------------------
+# Command line interface
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Estimate the coverage and S/I of the road for a list of tilts ' \
+                                                 'without simulating call traffic')
+
+    parser.add_argument('--tilts', type=float, nargs='+', default=list(range(0, 11)), help='Antenna tilts (in degrees)')
+    parser.add_argument('--bstns', dest='numOfBstns', type=int, default=cfg.NUM_OF_BSTNS, \
+                        help='Number of base stations spaced evenly along the road (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=cfg.RX_THRESHOLD, \
+                        help='Minimum RSL of a call in dBm (default: %(default)s)')
+    parser.add_argument('--no-cache', dest='cacheDir', action='store_const', const=None, \
+                        default=cfg.RSL_PROFILE_CACHE_DIR, help='Do not read or write the RSL profile cache')
+
+    args = parser.parse_args()
+
+    tStart = time.perf_counter()
+    estimates = estimateCoverage(args.tilts, args.numOfBstns, rxThreshold = args.threshold, cacheDir = args.cacheDir)
+    elapsedTime = time.perf_counter() - tStart
+
+    print('{0:>6}{1:>12}{2:>12}{3:>12}{4:>12}'.format('tilt', 'coverage', 'S/I<=5dB', '5-10dB', 'S/I>10dB'))
+
+    for estimate in estimates:
+        shares = estimate.getSgnlIxShares()
+
+        print('{0:>6g}{1:>11.2f}%{2:>11.2f}%{3:>11.2f}%{4:>11.2f}%'.format(estimate.tilt, 100*estimate.getCoverage(), \
+              100*shares['lt5dB'], 100*shares['5to10dB'], 100*shares['gt10dB']))
+
+    print('{0} tilts estimated in {1:.3f} seconds'.format(len(estimates), elapsedTime))
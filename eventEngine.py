@@ -0,0 +1,301 @@
+###################################################################
+# eventEngine.py
+#
+# This python module contains the discrete event simulation engine.
+# Instead of advancing the time in fixed steps, the engine jumps
+# from one event (call arrival, call end, signal measurement) to
+# the next using a priority queue.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import mobile as mobile
+import population as pop
+import callManagement as callMngt
+import stationIndex as sidx
+import statRecord as stat
+import config as cfg
+import numpy as np
+import heapq
+import enum
+
+
+#-------------------------------------------------------------------
+# Enums class for event types
+#-------------------------------------------------------------------
+class EventType(enum.IntEnum):
+    # Value gives the order of processing for events at the same time
+    CALL_END      = 0
+    MEASUREMENT   = 1
+    CALL_ARRIVAL  = 2
+    PRINT_STATS   = 3
+    KPI_SNAPSHOT  = 4
+
+
+#-------------------------------------------------------------------
+# Event scheduler (priority queue of events ordered by time)
+#-------------------------------------------------------------------
+class EventScheduler:
+
+    def __init__(self):
+        self._queue = []        # heap of (time, event type, sequence number, data)
+        self._sequence = 0      # keeps the events of same time and type in FIFO order
+
+    def schedule(self, time, eventType, data = None):
+        heapq.heappush(self._queue, (time, eventType, self._sequence, data))
+        self._sequence += 1
+        return
+
+    def popNext(self):
+        """ Removes and returns the next event as (time, event type, data) """
+
+        time, eventType, sequence, data = heapq.heappop(self._queue)
+        return time, eventType, data
+
+    def peekTime(self):
+        return self._queue[0][0]
+
+    def isEmpty(self):
+        return len(self._queue) == 0
+
+    def __len__(self):
+        return len(self._queue)
+
+
+#------------------------------------------------------------------
+# Function to compute time left before the mobile leaves the road
+#------------------------------------------------------------------
+def timeToRoadEdge(position, direction, speed):
+    """ Returns the time (in seconds) after which the mobile moving with 'speed'
+        in 'direction' from 'position' reaches either end of the road """
+
+    velocity = direction * speed
+
+    if velocity > 0:
+        return (cfg.ROAD_LENGTH - position)/velocity
+    elif velocity < 0:
+        return position/(-velocity)
+
+    return np.inf
+
+
+#------------------------------------------------------------------
+# Function to run the discrete event simulation
+#------------------------------------------------------------------
+def runEventSimulation(numOfUsers, bstnDataBase, tTotal, sgnlIxAccumulator, \
+                       measurementInterval = cfg.MEASUREMENT_INTERVAL, sgnlIxTrace = None, \
+                       kpiRecorder = None, printStats = cfg.PRINT_HOURLY_STATS, \
+                       numOfNeighbours = cfg.INTERFERENCE_NEIGHBOURS):
+    """ This function runs the simulation as a sequence of events.
+
+        1. CALL_ARRIVAL - Inactive users make call requests with rate CALL_RATE per hour.
+                          Arrivals of all the users are generated as one poisson process
+                          with rate (numOfUsers * CALL_RATE), each arrival is accepted
+                          with probability (inactive users / numOfUsers).
+        2. CALL_END     - Call is successfully completed, either the call duration is
+                          over or mobile reached the end of the road.
+        3. MEASUREMENT  - Every 'measurementInterval' seconds the signal of all the active
+                          calls is checked (call drop, S/I and handoff).
+        4. PRINT_STATS  - Stats are printed after every hour (if printStats is True).
+        5. KPI_SNAPSHOT - Statistics are recorded by kpiRecorder at its interval.
+
+        State is allocated only for the active calls, so the time taken depends
+        on the number of events and not on the number of users. The cost is set by
+        the measurement interval: every MEASUREMENT event checks all the active calls,
+        so a run costs about (active calls x tTotal/measurementInterval) checks, the
+        same as the tick engine when measurementInterval equals SIMULATION_STEP_SIZE.
+        The event engine is faster only at low load (few active calls, the time
+        between events is then spent without work) or with a longer interval.
+
+        KPIs match the tick engine within their confidence intervals (see
+        test_eventEngine.py). At heavy load, handoff failures are a few percent more
+        frequent than with the tick engine, whose steps handle handoffs before the
+        call requests of the same step (arrivals here take free channels as they come).
+
+        Input:
+            1. numOfUsers - Total number of users
+            2. bstnDataBase - dictionary of base station objects with key as ID
+            3. tTotal - Total simulation time (in seconds)
+            4. sgnlIxAccumulator - SgnlIxAccumulator object to which S/I values
+                                   are added
+            5. measurementInterval - time between signal measurements (in seconds)
+            6. sgnlIxTrace - optional SgnlIxTraceWriter object to which every S/I
+                             sample is written (default value = None, no trace)
+            7. kpiRecorder - optional KpiRecorder object which takes snapshots of the
+                             statistics of base stations at its interval
+            8. printStats - boolean flag to say whether to print the statistics table of
+                            base stations after every hour
+            9. numOfNeighbours - number of strongest neighbour stations whose power is
+                                 summed as interference in S/I
+
+        Output:
+            Stats are updated on the base station objects """
+
+    #Index of a station in the spatial index is also the index stored in population.connectedBstn
+    stationIdx = sidx.StationIndex(bstnDataBase)
+    bstnIDs = stationIdx.getBstnIDs()
+
+    population = pop.Population(cfg.CHANNELS_PER_SECTOR * len(bstnDataBase), bstnIDs)
+
+    activeCalls = {}                            # slot -> (user object, call id) of active calls
+    lastUpdate = np.zeros(population.getCapacity()) # time when position of slot was last updated
+    callId = 0                                  # increments for every call
+
+    arrivalRate = numOfUsers * cfg.CALL_RATE/3600
+
+    scheduler = EventScheduler()
+
+    if arrivalRate > 0:
+        scheduler.schedule(np.random.exponential(1/arrivalRate), EventType.CALL_ARRIVAL)
+
+    scheduler.schedule(0, EventType.MEASUREMENT)
+
+    if printStats:
+        for hour in range(1, int(tTotal//3600) + 1):
+            scheduler.schedule(hour * 3600, EventType.PRINT_STATS, hour)
+
+    if kpiRecorder is not None:
+        scheduler.schedule(kpiRecorder.getInterval(), EventType.KPI_SNAPSHOT)
+
+
+    #---------------------------------------------------
+    # ** START SIMULATION **
+    #---------------------------------------------------
+    while not scheduler.isEmpty() and scheduler.peekTime() <= tTotal:
+    #{ Start of while loop
+        time, eventType, data = scheduler.popNext()
+
+        if eventType == EventType.CALL_ARRIVAL:
+        #{ Start of if
+            #Schedule next arrival
+            scheduler.schedule(time + np.random.exponential(1/arrivalRate), EventType.CALL_ARRIVAL)
+
+            #Accept the arrival only if it belongs to an inactive user
+            if np.random.uniform() * numOfUsers >= numOfUsers - len(activeCalls):
+                continue
+
+            slot = population.allocate()
+
+            if population.getCapacity() > len(lastUpdate):
+                lastUpdate = np.resize(lastUpdate, population.getCapacity())
+
+            user = mobile.Mobile(callId, cfg.MOBILE_HEIGHT, cfg.HANDOFF_MARGIN, cfg.RX_THRESHOLD, population, slot)
+
+            #1. Determine user's location and direction (-1 means right to left, +1 means left to right)
+            location = np.random.uniform(0, cfg.ROAD_LENGTH)
+            user.setPosition(location)
+            user.setDirection(-1 if location > cfg.ROAD_LENGTH/2 else 1)
+
+            #2. Find RSL at mobile from the two strongest Bstns near it and try to establish the call
+            candidateIndex, rslCandidates = callMngt.findCallCandidatesBatch(stationIdx, [location])
+            bstnCandidates = [stationIdx.getBstn(iBstn) for iBstn in candidateIndex[0]]
+
+            if callMngt.attemptCall(user, rslCandidates[0], bstnCandidates):
+                activeCalls[slot] = (user, callId)
+                lastUpdate[slot] = time
+
+                #Call ends when duration is over or mobile reaches the end of the road
+                duration = min(user.getCallDurationLeft(), \
+                               timeToRoadEdge(location, user.getDirection(), user.getSpeed()))
+
+                scheduler.schedule(time + duration, EventType.CALL_END, (slot, callId))
+                callId += 1
+            else:
+                population.release(slot)
+        #} End of if
+
+        elif eventType == EventType.CALL_END:
+        #{ Start of elif
+            slot, endCallId = data
+
+            #Ignore the event if the call was dropped before it ended
+            if slot not in activeCalls or activeCalls[slot][1] != endCallId:
+                continue
+
+            user = activeCalls.pop(slot)[0]
+            bstnConnected = bstnDataBase[user.getConnectedBstnID()]
+
+            bstnConnected.stats.incrStat(util.StatName.SUCCESSFUL_CALLS)
+            bstnConnected.incrFreeChanCount()
+            population.release(slot)
+        #} End of elif
+
+        elif eventType == EventType.MEASUREMENT:
+        #{ Start of elif
+            scheduler.schedule(time + measurementInterval, EventType.MEASUREMENT)
+
+            if not activeCalls:
+                continue
+
+            #1. Move all the active users to their position at this time
+            activeSlots = np.fromiter(activeCalls.keys(), dtype=int, count=len(activeCalls))
+            elapsed = time - lastUpdate[activeSlots]
+
+            population.position[activeSlots] += population.direction[activeSlots] * population.speed[activeSlots] * elapsed
+            population.callDurationLeft[activeSlots] -= elapsed
+            lastUpdate[activeSlots] = time
+
+            #2. Calculate the RSL from serving base stations and drop the calls below threshold
+            serverIndex = population.connectedBstn[activeSlots]
+            serverIds = bstnIDs[serverIndex]
+            rslServer = callMngt.findRSLByIndex(stationIdx, serverIndex, population.position[activeSlots])
+
+            bDropped = rslServer < cfg.RX_THRESHOLD
+
+            droppedCalls = stat.addStatEvents(bstnDataBase, util.StatName.CALL_DROP_SIG_STRENGTH, serverIds[bDropped])
+
+            for bstnID, numOfCalls in droppedCalls.items():
+                bstnDataBase[bstnID].incrFreeChanCount(numOfCalls)
+
+            for slot in activeSlots[bDropped]:
+                del activeCalls[slot]
+                population.release(slot)
+
+            #3. Calculate the RSL from the strongest neighbour stations, record S/I and handoff if required
+            activeSlots = activeSlots[~bDropped]
+            serverIndex = serverIndex[~bDropped]
+            serverIds = serverIds[~bDropped]
+            rslServer = rslServer[~bDropped]
+
+            neighbourIndex, rslNeighbours = callMngt.findNeighbourRSLBatch(stationIdx, population.position[activeSlots], \
+                                                                           serverIndex, numOfNeighbours)
+
+            sgnlIx = callMngt.calculateSgnlIx(rslServer, rslNeighbours)
+
+            sgnlIxAccumulator.add(population.position[activeSlots], serverIds, sgnlIx)
+
+            if sgnlIxTrace is not None:
+                sgnlIxTrace.add(time, population.userId[activeSlots], population.position[activeSlots], \
+                                serverIds, sgnlIx)
+
+            targetIndex, rslTarget = callMngt.findHandoffTargets(neighbourIndex, rslNeighbours)
+
+            bHandoff = rslTarget > rslServer + cfg.HANDOFF_MARGIN
+
+            for slot, iTarget in zip(activeSlots[bHandoff], targetIndex[bHandoff]):
+                user = activeCalls[slot][0]
+                callMngt.attemptHandoff(user, bstnDataBase[user.getConnectedBstnID()], stationIdx.getBstn(iTarget))
+        #} End of elif
+
+        elif eventType == EventType.PRINT_STATS:
+        #{ Start of elif
+            for bstnID in bstnIDs:
+                bstnDataBase[bstnID].printStats(data)
+                print('\n\n')
+            print('-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-\n')
+        #} End of elif
+
+        elif eventType == EventType.KPI_SNAPSHOT:
+        #{ Start of elif
+            scheduler.schedule(time + kpiRecorder.getInterval(), EventType.KPI_SNAPSHOT)
+            kpiRecorder.record(time, bstnDataBase)
+        #} End of elif
+
+    #} End of while loop
+
+    return
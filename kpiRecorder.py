@@ -0,0 +1,288 @@
+###################################################################
+# kpiRecorder.py
+#
+# This python module contains the declaration and definition of
+# KpiRecorder class, which takes snapshots of the statistics and
+# channel occupancy of every base station at a fixed interval, so
+# that the evolution of KPIs over time can be saved and plotted
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import statRecord as stat
+import config as cfg
+import numpy as np
+import json
+import csv
+import os
+
+
+#Columns of KPI files (one row per snapshot and base station)
+KPI_COLUMNS = ['time', 'bstn', 'channelsInUse'] + [attrName for attrName, statName in stat.STAT_ATTRIBUTES]
+
+
+class KpiRecorder:
+
+    def __init__(self, bstnIDs, tTotal, interval = cfg.KPI_RECORD_INTERVAL, streamPath = None, batchSize = 1024):
+        """ Constructor is called when instantiating the object
+
+            Snapshots are kept in preallocated arrays of shape (snapshots, base stations, ...).
+
+            Input:
+                1. bstnIDs - IDs of the base stations
+                2. tTotal - Total simulation time (in seconds), used to size the arrays
+                3. interval - time between snapshots (in seconds)
+                4. streamPath - optional CSV (.csv) or JSON Lines (.jsonl) file. If given,
+                                snapshots are written to the file in batches of 'batchSize'
+                                and only the current batch is kept in memory
+                5. batchSize - number of snapshots written at a time when streaming """
+
+        self._bstnIDs = list(bstnIDs)
+        self._interval = interval
+        self._numOfDueSnapshots = 0          # snapshots due so far, next one is due at (this + 1) x interval
+
+        #StatName value of each column of the counts array (same order as KPI_COLUMNS)
+        self._statValues = np.array([statName.value for attrName, statName in stat.STAT_ATTRIBUTES])
+
+        self._streamPath = streamPath
+        self._bStreamHeaderWritten = False
+
+        if streamPath is not None:
+            capacity = batchSize
+            _getFileFormat(streamPath)  #check the extension before running the simulation
+        else:
+            capacity = int(tTotal//interval) + 1
+
+        self._numOfSnapshots = 0                              # snapshots in the arrays
+        self._times = np.zeros(capacity)                      # time of each snapshot (in seconds)
+        self._counts = np.zeros((capacity, len(self._bstnIDs), len(stat.STAT_ATTRIBUTES)), dtype=np.int64)
+        self._channelsInUse = np.zeros((capacity, len(self._bstnIDs)), dtype=np.int64)
+
+    def getInterval(self):
+        return self._interval
+
+    def getBstnIDs(self):
+        return self._bstnIDs
+
+    def getNumOfSnapshots(self):
+        """ Returns number of snapshots in memory (when streaming, the ones written to the
+            file are not counted, read them with readKpiFile) """
+
+        return self._numOfSnapshots
+
+    def getStreamPath(self):
+        return self._streamPath
+
+    def isDue(self, time):
+        """ Returns True if a snapshot is due at 'time' (in seconds): the next multiple of
+            the interval is reached. With an interval which is not a multiple of the time
+            step, the snapshot is taken at the first step after the due time (the event
+            engine schedules the exact times) """
+
+        return time > 0 and time >= (self._numOfDueSnapshots + 1) * self._interval - 1e-9
+
+    def record(self, time, bstnDataBase):
+        """ Takes a snapshot of statistics and channels in use of all the base stations
+
+            Input:
+                1. time - simulation time (in seconds)
+                2. bstnDataBase - dictionary of base station objects with key as ID """
+
+        if self._numOfSnapshots == len(self._times):
+            if self._streamPath is not None:
+                self.flush()
+            else:
+                self._grow(max(1, len(self._times)))
+
+        index = self._numOfSnapshots
+
+        self._times[index] = time
+
+        #Snapshots due up to this time are covered by this one
+        self._numOfDueSnapshots = max(self._numOfDueSnapshots + 1, int((time + 1e-9)//self._interval))
+
+        for iBstn, bstnID in enumerate(self._bstnIDs):
+            bstnObj = bstnDataBase[bstnID]
+
+            self._counts[index, iBstn] = bstnObj.stats.asArray()[self._statValues]
+            self._channelsInUse[index, iBstn] = cfg.CHANNELS_PER_SECTOR - bstnObj.getFreeChanCount()
+
+        self._numOfSnapshots += 1
+        return
+
+    def getTimes(self):
+        return self._times[:self._numOfSnapshots]
+
+    def getChannelsInUse(self, bstnID):
+        """ Returns array of channels in use of bstnID at each snapshot """
+
+        return self._channelsInUse[:self._numOfSnapshots, self._bstnIDs.index(bstnID)]
+
+    def getStat(self, bstnID, attrName):
+        """ Returns array of the cumulative count of statistic 'attrName' (e.g. 'successCalls')
+            of bstnID at each snapshot """
+
+        return self._counts[:self._numOfSnapshots, self._bstnIDs.index(bstnID), KPI_COLUMNS.index(attrName) - 3]
+
+    def getIntervalStat(self, bstnID, attrName):
+        """ Same as getStat, but the count within each interval (since the previous snapshot) """
+
+        return np.diff(self.getStat(bstnID, attrName), prepend=0)
+
+    def getBlockingRate(self, bstnID):
+        """ Returns array of the fraction of call attempts blocked due to capacity in each interval """
+
+        blocks = self.getIntervalStat(bstnID, 'blockDueCapacity')
+        attempts = self.getIntervalStat(bstnID, 'callAttempts')
+
+        return np.divide(blocks, attempts, out=np.zeros(len(blocks)), where=attempts > 0)
+
+    def getDropRate(self, bstnID):
+        """ Returns array of the number of calls dropped due to signal strength per call
+            established on bstnID in each interval (CALL_DROP_CAPACITY is not included, it
+            counts call requests that found no free channel on either base station) """
+
+        drops = self.getIntervalStat(bstnID, 'callDropDueSgnlStrength')
+        established = self.getIntervalStat(bstnID, 'successCallEstablishment')
+
+        return np.divide(drops, established, out=np.zeros(len(drops)), where=established > 0)
+
+    def iterRows(self):
+        """ Yields one row (dictionary with KPI_COLUMNS as keys) per snapshot and base station """
+
+        for index in range(self._numOfSnapshots):
+            for iBstn, bstnID in enumerate(self._bstnIDs):
+                row = {'time': float(self._times[index]), 'bstn': bstnID, \
+                       'channelsInUse': int(self._channelsInUse[index, iBstn])}
+
+                row.update(zip(KPI_COLUMNS[3:], self._counts[index, iBstn].tolist()))
+                yield row
+
+    def write(self, filepath):
+        """ Writes all the snapshots to a CSV (.csv) or JSON Lines (.jsonl) file """
+
+        _writeRows(filepath, self.iterRows(), 'w')
+        return
+
+    def flush(self):
+        """ Appends the snapshots in memory to the stream file and empties the arrays """
+
+        if self._streamPath is None:
+            return
+
+        _writeRows(self._streamPath, self.iterRows(), 'a' if self._bStreamHeaderWritten else 'w')
+
+        self._bStreamHeaderWritten = True
+        self._numOfSnapshots = 0
+        return
+
+    def close(self):
+        """ Writes the remaining snapshots to the stream file (if streaming) """
+
+        self.flush()
+        return
+
+    @classmethod
+    def fromSnapshots(cls, bstnIDs, interval, times, channelsInUse, counts):
+        """ Returns a KpiRecorder object holding the given snapshots (e.g. read from a file)
+
+            Input:
+                1. bstnIDs - IDs of the base stations
+                2. interval - time between snapshots (in seconds)
+                3. times - array of times of the snapshots (in seconds)
+                4. channelsInUse - array of channels in use (snapshots x base stations)
+                5. counts - array of statistics (snapshots x base stations x stats, in the
+                            order of KPI_COLUMNS[3:]) """
+
+        recorder = cls(bstnIDs, 0, interval)
+
+        recorder._times = np.array(times, dtype=float)
+        recorder._channelsInUse = np.array(channelsInUse, dtype=np.int64).reshape(len(recorder._times), len(recorder._bstnIDs))
+        recorder._counts = np.array(counts, dtype=np.int64).reshape(len(recorder._times), len(recorder._bstnIDs), -1)
+        recorder._numOfSnapshots = len(recorder._times)
+
+        return recorder
+
+    def _grow(self, count):
+        """ Adds space for 'count' snapshots to the arrays """
+
+        self._times = np.concatenate((self._times, np.zeros(count)))
+        self._counts = np.concatenate((self._counts, \
+                                       np.zeros((count,) + self._counts.shape[1:], dtype=np.int64)))
+        self._channelsInUse = np.concatenate((self._channelsInUse, \
+                                              np.zeros((count,) + self._channelsInUse.shape[1:], dtype=np.int64)))
+        return
+
+
+#------------------------------------------------------------------
+# Function to read KPI file
+#------------------------------------------------------------------
+def readKpiFile(filepath):
+    """ Reads a CSV or JSON Lines file written by KpiRecorder back into a KpiRecorder
+        object (to compute rates or plot the KPIs of a finished run)
+
+        Input:
+            1. filepath - path of the KPI file
+
+        Output:
+            KpiRecorder object """
+
+    if _getFileFormat(filepath) == 'csv':
+        with open(filepath, newline='') as fp:
+            rows = list(csv.DictReader(fp))
+    else:
+        with open(filepath) as fp:
+            rows = [json.loads(line) for line in fp if line.strip()]
+
+    bstnIDs = list(dict.fromkeys(row['bstn'] for row in rows))
+    times = sorted({float(row['time']) for row in rows})
+
+    interval = times[1] - times[0] if len(times) > 1 else (times[0] if times else cfg.KPI_RECORD_INTERVAL)
+
+    channelsInUse = np.zeros((len(times), len(bstnIDs)), dtype=np.int64)
+    counts = np.zeros((len(times), len(bstnIDs), len(KPI_COLUMNS) - 3), dtype=np.int64)
+
+    timeIndex = {time: index for index, time in enumerate(times)}
+
+    for row in rows:
+        index = timeIndex[float(row['time'])]
+        iBstn = bstnIDs.index(row['bstn'])
+
+        channelsInUse[index, iBstn] = int(row['channelsInUse'])
+        counts[index, iBstn] = [int(row[column]) for column in KPI_COLUMNS[3:]]
+
+    return KpiRecorder.fromSnapshots(bstnIDs, interval, times, channelsInUse, counts)
+
+
+def _getFileFormat(filepath):
+    """ Returns 'csv' or 'jsonl' from the extension of filepath """
+
+    extension = os.path.splitext(filepath)[1].lower()
+
+    if extension == '.csv':
+        return 'csv'
+    elif extension in ('.jsonl', '.json'):
+        return 'jsonl'
+
+    raise ValueError('KPI file must be .csv or .jsonl, got {0!r}'.format(filepath))
+
+
+def _writeRows(filepath, rows, mode):
+    """ Writes the rows to a CSV or JSON Lines file ('w' - new file, 'a' - append) """
+
+    if _getFileFormat(filepath) == 'csv':
+        with open(filepath, mode, newline='') as fp:
+            writer = csv.DictWriter(fp, fieldnames=KPI_COLUMNS)
+            if mode == 'w':
+                writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(filepath, mode) as fp:
+            for row in rows:
+                fp.write(json.dumps(row) + '\n')
+
+    return
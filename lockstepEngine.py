@@ -0,0 +1,315 @@
+###################################################################
+# lockstepEngine.py
+#
+# This python module contains the lockstep simulation engine, which
+# runs one simulated population against K configurations of the base
+# stations (e.g. K tilts) at once. Arrivals, positions, mobility,
+# call durations and fading values are generated once and shared by
+# all the configurations (common random numbers), while RSL, drop,
+# handoff and S/I decisions are evaluated for all the configurations
+# as one more dimension of the arrays. Every configuration keeps its
+# own channels, statistics and pool of inactive users, so its call
+# requests follow the same process as in an independent run.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import population as pop
+import userRegistry as reg
+import callManagement as callMngt
+import stationIndex as sidx
+import statRecord as stat
+import config as cfg
+import numpy as np
+
+
+#------------------------------------------------------------------
+# Class to hand off the call of one mobile in one configuration
+#------------------------------------------------------------------
+class _ConfigCallView:
+
+    def __init__(self, connectedBstn, bstnIndex, configIndex, slot):
+        """ Stands for the mobile in callMngt.attemptHandoff, the serving base station is
+            written to row 'configIndex' of the connectedBstn array of the engine
+
+            Input:
+                1. connectedBstn - array (configs x slots) of indices of serving stations
+                2. bstnIndex - dictionary of station index with key as base station ID
+                3. configIndex - index of the configuration
+                4. slot - slot of the mobile in the population """
+
+        self._connectedBstn = connectedBstn
+        self._bstnIndex = bstnIndex
+        self._configIndex = configIndex
+        self._slot = slot
+
+    def setConnectedBstnID(self, bstnID):
+        self._connectedBstn[self._configIndex, self._slot] = self._bstnIndex[bstnID]
+        return
+
+
+#------------------------------------------------------------------
+# Function to end calls in every configuration
+#------------------------------------------------------------------
+def _endCalls(bstnDataBases, bstnIDs, connectedBstn, bInCall, statName, slots, bEnded):
+    """ Ends the calls of mobiles in 'slots' in the configurations where bEnded is True
+        (array of configs x slots). statName is incremented on the serving base station
+        and its channel is freed """
+
+    for configIndex, bstnDataBase in enumerate(bstnDataBases):
+    #{ Start of for loop
+        endedSlots = slots[bEnded[configIndex]]
+
+        if len(endedSlots) == 0:
+            continue
+
+        endedCalls = stat.addStatEvents(bstnDataBase, statName, bstnIDs[connectedBstn[configIndex, endedSlots]])
+
+        for bstnID, numOfCalls in endedCalls.items():
+            bstnDataBase[bstnID].incrFreeChanCount(numOfCalls)
+
+        bInCall[configIndex, endedSlots] = False
+        connectedBstn[configIndex, endedSlots] = -1
+    #} End of for loop
+
+    return
+
+
+#------------------------------------------------------------------
+# Function to run the lockstep simulation
+#------------------------------------------------------------------
+def runLockstepSimulation(numOfUsers, bstnDataBases, tTotal, sgnlIxAccumulators, kpiRecorders = None, \
+                          numOfNeighbours = cfg.INTERFERENCE_NEIGHBOURS):
+    """ This function runs the simulation of K configurations in steps of
+        SIMULATION_STEP_SIZE (same steps and call handling as tickEngine).
+
+        A mobile stays in the population as long as its call is up in any configuration.
+        Every configuration has its own number of inactive users (users not in call in
+        that configuration). Callers are drawn once for the largest pool and each gets a
+        random rank among its inactive users; a call request is offered to the
+        configurations whose pool is larger than its rank. So the number of requests of
+        each configuration is binomial over its own inactive users (as in an independent
+        run), and the configurations share as many requests as possible. The RSL at a
+        mobile from a station is the median RSL of the configuration plus one fading
+        value shared by all the configurations, so the difference between
+        configurations is not hidden by the noise of independent runs.
+
+        Input:
+            1. numOfUsers - Total number of users
+            2. bstnDataBases - list of K dictionaries of base station objects with key as
+                               ID, one per configuration. All of them must have the same
+                               IDs and positions of stations
+            3. tTotal - Total simulation time (in seconds)
+            4. sgnlIxAccumulators - list of K SgnlIxAccumulator objects (same order)
+            5. kpiRecorders - optional list of K KpiRecorder objects
+            6. numOfNeighbours - number of strongest neighbour stations whose power is
+                                 summed as interference in S/I
+
+        Output:
+            Stats are updated on the base station objects of each configuration """
+
+    numOfConfigs = len(bstnDataBases)
+
+    #1. Stations of all the configurations are stacked, so that the median RSL of every
+    #configuration is one array lookup. Station index is the same in every configuration
+    stationStack = sidx.StationIndexStack([sidx.StationIndex(bstnDataBase) for bstnDataBase in bstnDataBases])
+    stationIdx = stationStack.getStationIndex(0)
+    bstnIDs = stationIdx.getBstnIDs()
+    numOfStations = len(bstnIDs)
+
+    bstnIndex = {bstnID: index for index, bstnID in enumerate(bstnIDs)}
+    bstnObjects = [[stationStack.getStationIndex(configIndex).getBstn(index) for index in range(numOfStations)] \
+                   for configIndex in range(numOfConfigs)]
+
+    #Index of each station in the station order of each accumulator
+    accumulatorIndex = [np.array([list(accumulator.getBstnIDs()).index(bstnID) for bstnID in bstnIDs], dtype=int) \
+                        for accumulator in sgnlIxAccumulators]
+
+    #2. Position, direction, speed and call duration of the mobiles are shared (population), the
+    #call state and serving station are kept per configuration (configs x slots)
+    population = pop.Population(cfg.CHANNELS_PER_SECTOR * numOfStations * numOfConfigs)
+    registry = reg.UserRegistry(population.getCapacity())
+
+    bInCall = np.zeros((numOfConfigs, population.getCapacity()), dtype=bool)
+    connectedBstn = np.full((numOfConfigs, population.getCapacity()), -1, dtype=np.int32)
+
+    callId = 0   #increments for every call request, used as ID of the user making the request
+
+
+    #---------------------------------------------------
+    # ** START SIMULATION **
+    #---------------------------------------------------
+    for count in range((tTotal//cfg.SIMULATION_STEP_SIZE)+1):
+    #{ Start of for loop
+
+        #Users in call in each configuration at the start of the step (calls which end in this
+        #step become inactive only at the end of the step, same as tickEngine)
+        numOfInactiveUsers = numOfUsers - np.count_nonzero(bInCall, axis=1)
+
+        #1. Move the mobiles which are in call in any configuration
+        activeSlots = registry.members(reg.UserState.ACTIVE)
+
+        bCompleted = callMngt.updateUserCallInfoBatch(population, activeSlots, cfg.SIMULATION_STEP_SIZE)
+
+        completedSlots = activeSlots[bCompleted]
+        _endCalls(bstnDataBases, bstnIDs, connectedBstn, bInCall, util.StatName.SUCCESSFUL_CALLS, \
+                  completedSlots, bInCall[:, completedSlots])
+
+        for slot in completedSlots:
+            registry.setState(slot, reg.UserState.ARCHIVED)
+
+        activeSlots = activeSlots[~bCompleted]
+        positions = population.position[activeSlots]
+        numOfActive = len(activeSlots)
+
+        #2. Fading values of the stations near each mobile are drawn once for all configurations
+        #(one more column for the server if it is outside the window). Neighbours are looked for
+        #among these stations only (the nearest ones, see StationIndex.getStrongest)
+        candidates = stationIdx.getCandidates(positions, numOfNeighbours + 1)
+        windowSize = candidates.shape[1]
+
+        fades = util.rayleighFadingInvCDF(numOfActive * (windowSize + 1)).reshape(numOfActive, windowSize + 1)
+
+        candidates = np.broadcast_to(candidates, (numOfConfigs, numOfActive, windowSize))
+        medianRSL = stationStack.getMedianRSL(candidates, positions[:, np.newaxis])
+        rsl = medianRSL + fades[:, :windowSize]
+
+        #RSL from serving stations (configs x mobiles), index 0 is used where there is no call
+        bActive = bInCall[:, activeSlots]
+        serverIndex = np.where(bActive, connectedBstn[:, activeSlots], 0)
+
+        bServerColumn = candidates == serverIndex[..., np.newaxis]
+        serverFade = np.where(np.any(bServerColumn, axis=-1), np.sum(np.where(bServerColumn, fades[:, :windowSize], 0), axis=-1), \
+                              fades[:, windowSize])
+
+        rslServer = stationStack.getMedianRSL(serverIndex, positions) + serverFade
+
+        #3. Drop the calls below the threshold
+        bDropped = bActive & (rslServer < cfg.RX_THRESHOLD)
+        _endCalls(bstnDataBases, bstnIDs, connectedBstn, bInCall, util.StatName.CALL_DROP_SIG_STRENGTH, \
+                  activeSlots, bDropped)
+
+        bActive &= ~bDropped
+
+        #4. Strongest neighbours by median RSL (server set to NaN, which is sorted last)
+        numOfColumns = min(numOfNeighbours, windowSize - 1)
+
+        if numOfColumns > 0:
+            sortKey = np.where(bServerColumn, np.nan, -medianRSL)
+            columns = np.argpartition(sortKey, numOfColumns - 1, axis=-1)[..., :numOfColumns]
+
+            neighbourIndex = np.take_along_axis(candidates, columns, axis=-1)
+            rslNeighbours = np.take_along_axis(rsl, columns, axis=-1)
+        else:
+            neighbourIndex = np.zeros((numOfConfigs, numOfActive, 0), dtype=int)
+            rslNeighbours = np.zeros((numOfConfigs, numOfActive, 0))
+
+        sgnlIx = callMngt.calculateSgnlIx(rslServer, rslNeighbours)
+
+        for configIndex, accumulator in enumerate(sgnlIxAccumulators):
+            bSample = bActive[configIndex]
+            accumulator.addByIndex(positions[bSample], accumulatorIndex[configIndex][serverIndex[configIndex, bSample]], \
+                                   sgnlIx[configIndex, bSample])
+
+        #5. Handoff to the strongest neighbour if it is better than server by the margin
+        if numOfColumns > 0:
+            best = np.argmax(rslNeighbours, axis=-1)[..., np.newaxis]
+            targetIndex = np.take_along_axis(neighbourIndex, best, axis=-1)[..., 0]
+            rslTarget = np.take_along_axis(rslNeighbours, best, axis=-1)[..., 0]
+
+            bHandoff = bActive & (rslTarget > rslServer + cfg.HANDOFF_MARGIN)
+
+            for configIndex, iActive in zip(*np.nonzero(bHandoff)):
+                user = _ConfigCallView(connectedBstn, bstnIndex, configIndex, activeSlots[iActive])
+                callMngt.attemptHandoff(user, bstnObjects[configIndex][serverIndex[configIndex, iActive]], \
+                                        bstnObjects[configIndex][targetIndex[configIndex, iActive]])
+
+        #Mobiles whose call is dropped in every configuration leave the population
+        for slot in activeSlots[~np.any(bInCall[:, activeSlots], axis=0)]:
+            registry.setState(slot, reg.UserState.ARCHIVED)
+
+        #6. Call requests of inactive users, drawn for the largest pool of inactive users. A request
+        #is offered to the configurations whose pool is larger than the rank of the caller
+        probability = (cfg.CALL_RATE/3600) * cfg.SIMULATION_STEP_SIZE
+        maxInactiveUsers = int(np.max(numOfInactiveUsers))
+
+        numOfCallers = np.random.binomial(maxInactiveUsers, probability)
+
+        ranks = np.random.choice(maxInactiveUsers, numOfCallers, replace=False) if numOfCallers > 0 else np.zeros(0, dtype=int)
+        bOffered = ranks[np.newaxis, :] < numOfInactiveUsers[:, np.newaxis]     # configs x callers
+
+        #Location, call duration and speed are drawn for every request (used by all configurations)
+        locations = np.random.uniform(0, cfg.ROAD_LENGTH, numOfCallers)
+        durations = np.random.exponential(cfg.AVG_CALL_DURATION, numOfCallers)
+        speeds = np.random.normal(cfg.MOBILE_SPEED_MEAN, cfg.MOBILE_SPEED_STD, numOfCallers)
+
+        #Two strongest stations of each configuration (same choice as the tick engine)
+        candidateIndex = stationStack.getStrongest(locations, 2)
+
+        #One fading value per (caller, station), shared by the configurations which chose the same station
+        numOfColumns = numOfConfigs * candidateIndex.shape[2]
+        stationsOfCaller = np.moveaxis(candidateIndex, 0, 1).reshape(numOfCallers, numOfColumns)
+
+        callFades = util.rayleighFadingInvCDF(numOfCallers * numOfColumns).reshape(numOfCallers, numOfColumns)
+        firstColumn = np.argmax(stationsOfCaller[:, :, np.newaxis] == stationsOfCaller[:, np.newaxis, :], axis=-1)
+        callFades = np.take_along_axis(callFades, firstColumn, axis=-1)
+
+        callFades = np.moveaxis(callFades.reshape(numOfCallers, numOfConfigs, candidateIndex.shape[2]), 1, 0)
+        rslCandidates = stationStack.getMedianRSL(candidateIndex, locations[:, np.newaxis]) + callFades
+
+        for iCount in range(numOfCallers):
+        #{ start of for loop
+            slot = population.allocate()
+
+            if population.getCapacity() > bInCall.shape[1]:
+                growth = population.getCapacity() - bInCall.shape[1]
+                bInCall = np.concatenate((bInCall, np.zeros((numOfConfigs, growth), dtype=bool)), axis=1)
+                connectedBstn = np.concatenate((connectedBstn, np.full((numOfConfigs, growth), -1, dtype=np.int32)), axis=1)
+
+            for configIndex in np.flatnonzero(bOffered[:, iCount]):
+                bstnCandidates = [bstnObjects[configIndex][index] for index in candidateIndex[configIndex, iCount]]
+
+                bstn = callMngt.chooseCallServer(cfg.RX_THRESHOLD, rslCandidates[configIndex, iCount], bstnCandidates)
+
+                if bstn is not None:
+                    bstn.decrFreeChanCount()
+                    bstn.stats.incrStat(util.StatName.SUCCESSFUL_CALL_ESTBL)
+
+                    connectedBstn[configIndex, slot] = bstnIndex[bstn.getID()]
+                    bInCall[configIndex, slot] = True
+
+            if np.any(bInCall[:, slot]):
+                population.userId[slot] = callId
+                population.position[slot] = locations[iCount]
+                population.direction[slot] = -1 if locations[iCount] > cfg.ROAD_LENGTH/2 else 1
+                population.speed[slot] = speeds[iCount]
+                population.callDurationLeft[slot] = durations[iCount]
+                population.bIsCallActive[slot] = True
+
+                registry.setState(slot, reg.UserState.ACTIVE)
+            else:
+                population.release(slot)        #User stays inactive
+
+            callId += 1
+        #} End of for loop
+
+        #7. Move the archived users to inactive pool and release their slots
+        for slot in registry.members(reg.UserState.ARCHIVED):
+            population.release(slot)
+
+        registry.moveAll(reg.UserState.ARCHIVED, reg.UserState.INACTIVE)
+
+        #8. Take KPI snapshots of every configuration
+        if kpiRecorders is not None:
+            for kpiRecorder, bstnDataBase in zip(kpiRecorders, bstnDataBases):
+                if kpiRecorder.isDue(count*cfg.SIMULATION_STEP_SIZE):
+                    kpiRecorder.record(count*cfg.SIMULATION_STEP_SIZE, bstnDataBase)
+
+    #} End of simulation timer For loop
+
+    return
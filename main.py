@@ -16,268 +16,196 @@
 # Import statements
 #------------------------------------------------------------------
 import utilities as util
-import basestation as bstn
-import mobile as mobile
-import callManagement as callMngt
+import simulation as sim
 import config as cfg
-import numpy as np
+import argparse
+import sys
 
 
 #------------------------------------------------------------------
-# Simulation execution starts from here!!
+# Function to take user inputs interactively
 #------------------------------------------------------------------
+def getUserInputs():
+    """ Asks the user for number of users, antenna tilt and total simulation time
+        until valid values are entered
 
-#------------------------------
-# ** TAKE USER INPUTS **
-#------------------------------
+        Output: (number of users, tilt in degrees, total simulation time in Hrs) """
 
-numOfUsers  = 0   # Total number of users
-tilt        = 0   # Antenna tilt
-tTotal      = 0   # Total simulation time
+    numOfUsers  = 0   # Total number of users
+    tilt        = 0   # Antenna tilt
+    tTotal      = 0   # Total simulation time
 
-# Get Number of users
-while True:
-    temp  = input('Enter number of users: ')
+    # Get Number of users
+    while True:
+        temp  = input('Enter number of users: ')
 
-    if util.validateInt(temp, 'positive'):
-        numOfUsers = int(temp)
-        break
-    else:
-        print('Invalid value.. Please enter positive integer values!')
+        if util.validateInt(temp, 'positive'):
+            numOfUsers = int(temp)
+            break
+        else:
+            print('Invalid value.. Please enter positive integer values!')
 
-# Get Antenna tilt angle
-while True:
-    temp  = input('Enter Antenna tilt (in degrees): ')
+    # Get Antenna tilt angle
+    while True:
+        temp  = input('Enter Antenna tilt (in degrees): ')
 
-    if util.validateFloat(temp, 'non-negative'):
-        tilt = float(temp)
-        break
-    else:
-        print('Invalid value.. Please enter non negative float values!')
+        if util.validateFloat(temp, 'non-negative'):
+            tilt = float(temp)
+            break
+        else:
+            print('Invalid value.. Please enter non negative float values!')
+
+    # Get Total simulation time
+    while True:
+        temp  = input('Enter Total simulation time (in Hrs): ')
+
+        if util.validateFloat(temp, 'positive'):
+            tTotal = float(temp)
+            break
+        else:
+            print('Invalid value.. Please enter positive float values!')
+
+    return numOfUsers, tilt, tTotal
+
+
+#------------------------------------------------------------------
+# Function to parse command line arguments
+#------------------------------------------------------------------
+def parseArguments(argv):
+    """ Parses the command line arguments for non interactive (batch) runs """
+
+    parser = argparse.ArgumentParser(description='Simulate the downlink of base stations serving a road. ' \
+                                                 'Without arguments, inputs are asked interactively.')
+
+    parser.add_argument('--users', type=int, required=True, help='Total number of users')
+    parser.add_argument('--tilt', type=float, default=None, help='Antenna tilt (in degrees)')
+    parser.add_argument('--compare-tilts', dest='compareTilts', type=float, nargs='+', default=None, \
+                        help='Simulate these tilts in lockstep on the same traffic (instead of --tilt) ' \
+                             'and print a table of their statistics. --kpi-file and --save-plots are ' \
+                             'written per tilt (e.g. kpi_tilt3.csv)')
+    parser.add_argument('--hours', type=float, required=True, help='Total simulation time (in Hrs)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the random numbers')
+    parser.add_argument('--engine', choices=['tick', 'event'], default=None, \
+                        help='Simulation engine (default: {0})'.format(cfg.SIMULATION_ENGINE))
+    parser.add_argument('--no-plot', dest='plot', action='store_false', help='Do not plot S/I bar graph')
+    parser.add_argument('--trace', dest='tracePath', default=None, help='Write every S/I sample to this binary trace file')
+    parser.add_argument('--quiet', dest='printStats', action='store_false', help='Do not print hourly statistics tables')
+    parser.add_argument('--kpi-file', dest='kpiPath', default=None, \
+                        help='Write snapshots of base station statistics to this CSV (.csv) or JSON Lines (.jsonl) file')
+    parser.add_argument('--kpi-interval', dest='kpiInterval', type=float, default=cfg.KPI_RECORD_INTERVAL, \
+                        help='Time between snapshots in seconds (default: %(default)s)')
+    parser.add_argument('--kpi-stream', dest='kpiStream', action='store_true', \
+                        help='Write the snapshots to --kpi-file in batches while simulating')
+    parser.add_argument('--bstns', dest='numOfBstns', type=int, default=cfg.NUM_OF_BSTNS, \
+                        help='Number of base stations spaced evenly along the road (default: %(default)s)')
+    parser.add_argument('--neighbours', dest='numOfNeighbours', type=int, default=cfg.INTERFERENCE_NEIGHBOURS, \
+                        help='Number of strongest neighbour stations summed as interference in S/I (default: %(default)s)')
+    parser.add_argument('--record-traffic', dest='recordTrafficPath', default=None, \
+                        help='Write the call requests (and seed of the fading values) of the run to this traffic trace file')
+    parser.add_argument('--replay-traffic', dest='replayTrafficPath', default=None, \
+                        help='Take the call requests and fading values from this traffic trace file')
+    parser.add_argument('--no-record-fades', dest='recordFades', action='store_false', \
+                        help='Record only the call requests with --record-traffic')
+    parser.add_argument('--warm-start', dest='bWarmStart', action='store_true', default=None, \
+                        help='Start with calls in progress sampled in steady state instead of an empty network ' \
+                             '(default: WARM_START of config.py, tick engine runs without traffic traces only)')
+    parser.add_argument('--save-plots', dest='plotPrefix', default=None, \
+                        help='Write S/I bar graphs to <PLOTPREFIX>_<bstn ID>.<format> (works without a display)')
+    parser.add_argument('--plot-format', dest='plotFormat', choices=['png', 'svg'], default='png', \
+                        help='Image format of --save-plots (default: %(default)s)')
+
+    args = parser.parse_args(argv)
+
+    if args.users <= 0:
+        parser.error('--users must be a positive integer')
+    if (args.tilt is None) == (args.compareTilts is None):
+        parser.error('one of --tilt and --compare-tilts is needed')
+    if args.tilt is not None and args.tilt < 0:
+        parser.error('--tilt must be a non negative value')
+    if args.compareTilts is not None and min(args.compareTilts) < 0:
+        parser.error('--compare-tilts must be non negative values')
+    if args.hours <= 0:
+        parser.error('--hours must be a positive value')
+    if args.kpiInterval <= 0:
+        parser.error('--kpi-interval must be a positive value')
+    if args.numOfBstns <= 0:
+        parser.error('--bstns must be a positive integer')
+    if args.numOfNeighbours < 0:
+        parser.error('--neighbours must be a non negative integer')
+    if args.kpiStream and args.kpiPath is None:
+        parser.error('--kpi-stream needs --kpi-file')
+    if args.compareTilts is not None:
+        #Options of the single tilt engines, the lockstep engine has no use for them
+        unsupported = [('--engine', args.engine is not None), ('--trace', args.tracePath is not None), \
+                       ('--kpi-stream', args.kpiStream), ('--warm-start', args.bWarmStart), \
+                       ('--record-traffic', args.recordTrafficPath is not None), \
+                       ('--replay-traffic', args.replayTrafficPath is not None), ('--no-record-fades', not args.recordFades)]
+
+        for option, bGiven in unsupported:
+            if bGiven:
+                parser.error('{0} can not be used with --compare-tilts'.format(option))
+
+    if args.engine is None:
+        args.engine = cfg.SIMULATION_ENGINE
+    if args.recordTrafficPath is not None and args.replayTrafficPath is not None:
+        parser.error('--record-traffic and --replay-traffic can not be used together')
+    if (args.recordTrafficPath is not None or args.replayTrafficPath is not None) and args.engine != 'tick':
+        parser.error('traffic traces are recorded and replayed by the tick engine only')
+    if args.bWarmStart and args.engine != 'tick':
+        parser.error('--warm-start is supported by the tick engine only')
+    if args.bWarmStart and (args.recordTrafficPath is not None or args.replayTrafficPath is not None):
+        parser.error('--warm-start can not be used with --record-traffic or --replay-traffic')
+
+    return args
+
+
+#------------------------------------------------------------------
+# Function to print the statistics of tilts simulated in lockstep
+#------------------------------------------------------------------
+def printTiltComparison(results):
+    """ Prints one row per tilt with the statistics summed over all the base stations """
+
+    columns = [('callAttempts', 'attempts'), ('successCalls', 'completed'), ('callDropDueSgnlStrength', 'drop(sig)'), \
+               ('blockDueCapacity', 'blocked'), ('callEstblFailDueSignlStrnt', 'fail(sig)'), ('successHandoffs', 'handoffs')]
+
+    print('{0:>8}'.format('tilt') + ''.join('{0:>12}'.format(title) for attrName, title in columns))
 
-# Get Total simulation time
-while True:
-    temp  = input('Enter Total simulation time (in Hrs): ')
+    for result in results:
+        totals = [sum(getattr(stats, attrName) for stats in result.stats.values()) for attrName, title in columns]
+        print('{0:>8g}'.format(result.tilt) + ''.join('{0:>12}'.format(total) for total in totals))
 
-    if util.validateFloat(temp, 'positive'):
-        tTotal = float(temp)
+    return
 
-        #Convert Hrs to sec
-        tTotal = int(tTotal*3600)
 
-        break
+#------------------------------------------------------------------
+# Simulation execution starts from here!!
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1:
+        #Batch mode, inputs from command line
+        args = parseArguments(sys.argv[1:])
+
+        if args.compareTilts is not None:
+            results = sim.runLockstepSimulation(args.users, args.compareTilts, args.hours, args.seed, args.kpiInterval, \
+                                                args.numOfBstns, args.numOfNeighbours, args.kpiPath, args.plotPrefix, \
+                                                args.plotFormat)
+
+            printTiltComparison(results)
+            print('Simulation of {0} tilts for {1:g} Hrs completed in {2:.2f} seconds'.format(len(results), args.hours, \
+                                                                                            results[0].elapsedTime))
+            sys.exit(0)
+
+        result = sim.runSimulation(args.users, args.tilt, args.hours, args.seed, args.engine, args.plot, \
+                                   args.tracePath, args.plotPrefix, args.plotFormat, args.printStats, \
+                                   args.kpiInterval, args.kpiPath, args.kpiStream, args.numOfBstns, \
+                                   args.numOfNeighbours, args.recordTrafficPath, args.replayTrafficPath, \
+                                   args.recordFades, args.bWarmStart)
+
+        print('Simulation of {0:g} Hrs completed in {1:.2f} seconds'.format(args.hours, result.elapsedTime))
+
     else:
-        print('Invalid value.. Please enter positive float values!')
-
-#------------------------------
-# ** Intialize settings ** 
-#------------------------------
-
-#1. Read vertical_pattern.txt file and store the discrimination values.
-vertDiscrmnData = util.readVertDiscrmData(cfg.VERTICAL_PATTERN_FILEPATH)
-
-#2. Compute Shadowing values
-shadowBstnA = util.shadowing(cfg.ROAD_LENGTH//cfg.SHADOWING_RESOLUTION, cfg.SHADOWING_MEAN, cfg.SHADOWING_STD, 0, True)
-shadowBstnB = util.shadowing(cfg.ROAD_LENGTH//cfg.SHADOWING_RESOLUTION, cfg.SHADOWING_MEAN, cfg.SHADOWING_STD, 4, True)
-
-#3. Instatiate the base station objects (EIRP bore sight calculation is done inside constructor) 
-bstnDataBase = {}
-bstnDataBase['A'] = bstn.BaseStation('A', cfg.BSTN_HEIGHT, cfg.BSTN_LOCATION, cfg.TX_POWER, \
-                                     cfg.CONNECTOR_LOSSES, cfg.ANTENNA_GAIN, \
-                                     cfg.CHANNELS_PER_SECTOR, cfg.FREQUENCY, tilt, vertDiscrmnData, shadowBstnA)
-
-bstnDataBase['B'] = bstn.BaseStation('B', cfg.BSTN_HEIGHT, cfg.BSTN_LOCATION, cfg.TX_POWER, \
-                                     cfg.CONNECTOR_LOSSES, cfg.ANTENNA_GAIN, \
-                                     cfg.CHANNELS_PER_SECTOR, cfg.FREQUENCY, tilt, vertDiscrmnData, shadowBstnB)
-
-#4. Instatiate user object
-#Maintain a dictionary of user objects with key as ID and value as object
-userDataBase = {}  
-
-#5. Now similarly maintain a dictionary of active, archive and inactive user id for tracking purpose
-userIdDataBase = {'Active':[], 'Archived':[], 'Inactive':[]}
-
-#6. Create mobile objects
-for iCount in range(numOfUsers):
-    temp = mobile.Mobile(iCount+1, cfg.MOBILE_HEIGHT, cfg.HANDOFF_MARGIN, cfg.RX_THRESHOLD)
-    userDataBase[iCount+1] = temp
-    userIdDataBase['Inactive'].append(iCount+1)  #Add the mobile id to inactive list
-
-#7. Maintain a list to store the S/I values
-#This list will hold tuples (location, serving bstn, S/I value)
-sgnlToIxList = []
-
-
-#---------------------------------------------------
-# ** START SIMULATION **
-#---------------------------------------------------
-for count in range((tTotal//cfg.SIMULATION_STEP_SIZE)+1):
-#{ Start of for loop
-    
-    #1. Loop through active users
-    for userId in userIdDataBase['Active']:
-    #{ Start of for loop
-        user = userDataBase[userId]
-
-        #Update the info of user (updates new location and checks if call is complete)
-        bRet = callMngt.updateUserCallInfo(user, cfg.SIMULATION_STEP_SIZE)
-        
-        if bRet:
-            #This means call is sucessfully completed, increment stat 
-            bstnConnected = bstnDataBase[user.getConnectedBstnID()]
-            
-            bstnConnected.stats.incrStat(util.StatName.SUCCESSFUL_CALLS)
-            bstnConnected.incrFreeChanCount()
-            user.reset()
-
-            #move the user from active list to archive list
-            #Note: Here only adding the id to archived list but not removing it from active list, 
-            #My Thumb rule: Never directly remove an element from the data structure we are looping through. 
-            #If we do then it will lead to crash. (but not sure about python!!)
-            userIdDataBase['Archived'].append(userId)
-        else:
-        #{ Start of else
-            
-            #1. Calculate the RSL at new location from both base stations
-            bstnServer = bstnDataBase[user.getConnectedBstnID()]
-            rslServer = callMngt.findRSL(user, bstnServer)
-
-            if rslServer < user.getRxThreshold():
-                #Drop the call
-                bstnServer.stats.incrStat(util.StatName.CALL_DROP_SIG_STRENGTH)
-                bstnServer.incrFreeChanCount()
-                user.reset()
-
-                #move the user to archive list
-                userIdDataBase['Archived'].append(userId)
-
-            else:
-            #{ Start of else
-                otherBstnId = 'B'
-                if user.getConnectedBstnID() == 'B':
-                    otherBstnId = 'A'
-
-                bstnOther = bstnDataBase[otherBstnId]
-                rslOther = callMngt.findRSL(user, bstnOther)
-
-                #Push S/I tuple to global list.....
-                sgnlIxTuple = (user.getPosition(), user.getConnectedBstnID(), rslServer - rslOther)
-                sgnlToIxList.append(sgnlIxTuple)
-
-                if rslOther > rslServer + user.getHandOffMargin():
-                    bstnServer.stats.incrStat(util.StatName.HANDOFF_ATTEMPTS_OUT)
-                    bstnOther.stats.incrStat(util.StatName.INCOMING_HANDOFF_RQTS)
-
-                    if bstnOther.isFreeChanAvailable():
-                        user.setConnectedBstnID(otherBstnId)   #Changing serving bstn
-                        bstnOther.decrFreeChanCount()
-                        bstnServer.incrFreeChanCount()
-
-                        #Increment successful handoff out stat for old bstn
-                        bstnServer.stats.incrStat(util.StatName.SUCCESSFUL_HANDOFFS)
-                        bstnOther.stats.incrStat(util.StatName.HANDOFF_RQTS_ACCEPTED)
-
-                    else:
-                        #Increment handoff failed stat for serving bstn
-                        bstnServer.stats.incrStat(util.StatName.HANDOFF_FAILURE)
-                        bstnOther.stats.incrStat(util.StatName.HANDOFF_RQTS_REJECTED)
-         
-            #}End of else
-         #}End of else
-    #}End of for loop..
-
-    #remove the archived users from active list before going to address inactive users
-    userIdDataBase['Active'] = [elem for elem in userIdDataBase['Active'] if elem not in userIdDataBase['Archived']]
-
-    #2. We are done dealing with active users. Now, loop through inactive users
-    tempActiveList = []
-
-    for userId in userIdDataBase['Inactive']:
-    #{ Start of for loop    
-        user = userDataBase[userId]
-
-        #Determine if the user makes a call
-        probability = (cfg.CALL_RATE/3600) * cfg.SIMULATION_STEP_SIZE
-
-        #If user is making a call request
-        if np.random.uniform() < probability:
-        #{ start of if
-            #1. Determine user's location
-            location = np.random.uniform(0, cfg.ROAD_LENGTH)
-            user.setPosition(location)
-
-            #2. Set Direction
-            if location > cfg.ROAD_LENGTH/2:
-                user.setDirection(-1) #-1 means right to left
-            else:
-                user.setDirection(1)  #+1 means left to right
-
-            #3. Find RSL at mobile from both Bstns
-            rslA = callMngt.findRSL(user, bstnDataBase['A'])
-            rslB = callMngt.findRSL(user, bstnDataBase['B'])
-
-            rslServer = rslA   #Initialize higher value as A
-            rslOther = rslB
-            serverBstn = bstnDataBase['A']
-            otherBstn = bstnDataBase['B']
-
-            if rslB > rslA:
-                rslServer = rslB
-                rslOther = rslA
-                serverBstn = bstnDataBase['B']
-                otherBstn = bstnDataBase['A']
-
-            #4. Check if the RSL server is greater than mobile threshold
-            if rslServer < user.getRxThreshold():
-                #Increment call drop stat for server bstn
-                serverBstn.stats.incrStat(util.StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH)
-            
-            else:
-            #{ start of else
-                #Attempt to establish a call, increment stat
-                serverBstn.stats.incrStat(util.StatName.CALL_ATTEMPTS)
-
-                if serverBstn.isFreeChanAvailable():
-                    callMngt.establishCall(user, serverBstn)   #establish the call
-                    tempActiveList.append(userId)     #Add user to active call list
-
-                else:
-                    #1.Increment the call blocked due to capacity stat for serving base station
-                    serverBstn.stats.incrStat(util.StatName.CALL_BLOCK_CAPACITY)
-
-                    #2. Check if the other bstn can take up the call
-                    if rslOther > user.getRxThreshold() and otherBstn.isFreeChanAvailable():
-                        otherBstn.stats.incrStat(util.StatName.CALL_ATTEMPTS)
-                        callMngt.establishCall(user, otherBstn)    #establish the call
-                        tempActiveList.append(userId)  #Add user to active call list
-
-                    else:
-                        #increment the dropped call due to cap stat for ORIGINAL bstn
-                        serverBstn.stats.incrStat(util.StatName.CALL_DROP_CAPACITY)
-
-            #} End of else
-        #} End of if
-    #} End of for loop..    
-    
-    #3. Adding the temp active user ids to Active list
-    userIdDataBase['Active'].extend(tempActiveList)
-
-    #removing the new active users from inactive list
-    userIdDataBase['Inactive'] = [elem for elem in userIdDataBase['Inactive'] if elem not in tempActiveList]
-
-    #4. we are done dealing with both active and inactive user at this time stamp
-    #Move the archived users to inactive pool
-    userIdDataBase['Inactive'].extend(userIdDataBase['Archived'])
-    userIdDataBase['Archived'] = []  #Empty the list
-
-    #5. Check the timer and print stats after every hour
-    if count > 0 and count%3600 == 0:
-        bstnDataBase['A'].printStats(count//3600)
-        print('\n\n')
-        bstnDataBase['B'].printStats(count//3600)
-        print('\n-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-\n')
-
-#} End of simulation timer For loop
-
-# Now plot S/I bar graph
-util.plotSgnlIxInfo(sgnlToIxList, cfg.ROAD_LENGTH)
+        #Interactive mode
+        numOfUsers, tilt, hours = getUserInputs()
+
+        sim.runSimulation(numOfUsers, tilt, hours, plot = True)
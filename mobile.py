@@ -11,34 +11,92 @@
 #
 ###################################################################
 
+import population as pop
+
 class Mobile:
 
-    def __init__(self, ID, height, HOm, rxThreshold):
-        """ Constructor is called when instantiating the object """
+    def __init__(self, ID, height, HOm, rxThreshold, population = None, slot = None):
+        """ Constructor is called when instantiating the object 
+
+            The call state of the mobile (position, speed etc..) is stored in a 
+            population object, mobile object is only a view on its slot.
+            If population is not given, a population of one mobile is created. """
 
         self._ID = ID                  # mobile id
         self._height = height          # height of the mobile 
         self._handOffMargin = HOm      # Handoff margin
         self._rxThreshold = rxThreshold # Rx threshold
 
-        self.position = 0              # position on the road from left to right
-        self.direction = 0             # +1 if moving from left to right, else -1
-        self.speed = 0                 # in meter per sec
-        self.bIsCallActive = False     # boolean variable to indicates the call status 
-        self.callDurationLeft = 0      # time left in seconds
-        self.connectedBstn = None      # ID of the base station it is connected with
+        if population is None:
+            population = pop.Population(1)
+            slot = population.allocate()
+
+        self._population = population  # population holding the state of the mobile
+        self._slot = slot              # index of the mobile in population arrays
+
+        self.reset()
 
 
     def reset(self):
         """ This function resets the values to factory defaults """
 
-        self.position = 0
-        self.direction = 0
-        self.speed = 0
-        self.bIsCallActive = False
-        self.callDurationLeft = 0
-        self.connectedBstn = None
+        self._population.reset(self._slot)
+        self._population.userId[self._slot] = self._ID
         return
+
+    # position on the road from left to right
+    @property
+    def position(self):
+        return self._population.position[self._slot]
+
+    @position.setter
+    def position(self, value):
+        self._population.position[self._slot] = value
+
+    # +1 if moving from left to right, else -1
+    @property
+    def direction(self):
+        return self._population.direction[self._slot]
+
+    @direction.setter
+    def direction(self, value):
+        self._population.direction[self._slot] = value
+
+    # in meter per sec
+    @property
+    def speed(self):
+        return self._population.speed[self._slot]
+
+    @speed.setter
+    def speed(self, value):
+        self._population.speed[self._slot] = value
+
+    # boolean variable to indicates the call status 
+    @property
+    def bIsCallActive(self):
+        return self._population.bIsCallActive[self._slot]
+
+    @bIsCallActive.setter
+    def bIsCallActive(self, value):
+        self._population.bIsCallActive[self._slot] = value
+
+    # time left in seconds
+    @property
+    def callDurationLeft(self):
+        return self._population.callDurationLeft[self._slot]
+
+    @callDurationLeft.setter
+    def callDurationLeft(self, value):
+        self._population.callDurationLeft[self._slot] = value
+
+    # ID of the base station it is connected with
+    @property
+    def connectedBstn(self):
+        return self._population.getBstnID(self._population.connectedBstn[self._slot])
+
+    @connectedBstn.setter
+    def connectedBstn(self, value):
+        self._population.connectedBstn[self._slot] = self._population.getBstnIndex(value)
     
     def dump(self):
         print("ID = ", self._ID)
@@ -52,6 +110,9 @@ class Mobile:
     def getID(self):
         return self._ID
 
+    def getSlot(self):
+        return self._slot
+
     def getHeight(self):
         return self._height
 
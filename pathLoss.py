@@ -0,0 +1,183 @@
+###################################################################
+# pathLoss.py
+#
+# This python module contains the path loss models. Every model
+# computes its constant terms (which depend only on frequency and
+# antenna heights) once when it is created, so computing the loss
+# is one log10 and one multiply-add over the array of distances
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import config as cfg
+import numpy as np
+import timeit
+
+
+#------------------------------------------------------------------
+# Base class of path loss models
+#------------------------------------------------------------------
+class PathLossModel:
+    """ Every model gives loss(d) = intercept + slope * log10(d), with d in KM """
+
+    def __init__(self, intercept, slope):
+        self._intercept = intercept       # loss at 1 KM (in dB)
+        self._slope = slope               # increase of loss per decade of distance (in dB)
+
+    def getName(self):
+        return type(self).__name__
+
+    def getIntercept(self):
+        return self._intercept
+
+    def getSlope(self):
+        return self._slope
+
+    def getPathLoss(self, d):
+        """ Returns the path loss (in dB) for distance d (in KM, scalar or numpy array) """
+
+        return self._intercept + self._slope * np.log10(d)
+
+
+#------------------------------------------------------------------
+# Okumura-Hata Model
+#------------------------------------------------------------------
+def _hataMobileCorrection(f, Hm):
+    """ Mobile antenna height correction a(Hm) of small or medium city (in dB) """
+
+    return (1.1*np.log10(f) - 0.7)*Hm - (1.56*np.log10(f) - 0.8)
+
+
+class OkumuraHataModel(PathLossModel):
+
+    def __init__(self, f, Hb, Hm, areaType = util.AreaType.URBAN):
+        """ Okumura-Hata model (same values as util.okamuraHata)
+
+            Input:
+                1. f - frequency in MHz (150 to 1500 MHz)
+                2. Hb - height of base station from the ground (in meters)
+                3. Hm - height of the mobile from the ground (in meters)
+                4. areaType - util.AreaType (URBAN, SUBURBAN or RURAL) """
+
+        self._areaType = util.AreaType(areaType)
+
+        intercept = 69.55 + 26.16*np.log10(f) - 13.82*np.log10(Hb) - _hataMobileCorrection(f, Hm)
+
+        #Correction Factor computation:
+        if self._areaType == util.AreaType.SUBURBAN:
+            intercept = intercept - 2*((np.log10(f/28))**2) - 5.4
+
+        elif self._areaType == util.AreaType.RURAL:
+            intercept = intercept - 4.78*((np.log10(f))**2) + 18.33*np.log10(f) - 40.95
+
+        PathLossModel.__init__(self, intercept, 44.9 - 6.55*np.log10(Hb))
+
+    def getAreaType(self):
+        return self._areaType
+
+
+#------------------------------------------------------------------
+# COST-231 Hata Model
+#------------------------------------------------------------------
+class Cost231HataModel(PathLossModel):
+
+    def __init__(self, f, Hb, Hm, bMetropolitan = False):
+        """ COST-231 extension of Hata model
+
+            Input:
+                1. f - frequency in MHz (1500 to 2000 MHz)
+                2. Hb - height of base station from the ground (in meters)
+                3. Hm - height of the mobile from the ground (in meters)
+                4. bMetropolitan - boolean flag, True adds 3 dB for metropolitan centres """
+
+        intercept = 46.3 + 33.9*np.log10(f) - 13.82*np.log10(Hb) - _hataMobileCorrection(f, Hm)
+
+        if bMetropolitan:
+            intercept += 3
+
+        PathLossModel.__init__(self, intercept, 44.9 - 6.55*np.log10(Hb))
+
+
+#------------------------------------------------------------------
+# Free space Model
+#------------------------------------------------------------------
+class FreeSpaceModel(PathLossModel):
+
+    def __init__(self, f, Hb = None, Hm = None):
+        """ Free space path loss (heights are not used, accepted so that all the
+            models are created the same way)
+
+            Input:
+                1. f - frequency in MHz """
+
+        PathLossModel.__init__(self, 32.44 + 20*np.log10(f), 20)
+
+
+#------------------------------------------------------------------
+# Function to create path loss model from its name
+#------------------------------------------------------------------
+PATH_LOSS_MODELS = {'okumura-hata'              : (OkumuraHataModel, {'areaType': util.AreaType.URBAN}),
+                    'okumura-hata-suburban'     : (OkumuraHataModel, {'areaType': util.AreaType.SUBURBAN}),
+                    'okumura-hata-rural'        : (OkumuraHataModel, {'areaType': util.AreaType.RURAL}),
+                    'cost231-hata'              : (Cost231HataModel, {'bMetropolitan': False}),
+                    'cost231-hata-metropolitan' : (Cost231HataModel, {'bMetropolitan': True}),
+                    'free-space'                : (FreeSpaceModel, {})}
+
+
+def createPathLossModel(name, f, Hb, Hm):
+    """ Returns the path loss model object for one of the names in PATH_LOSS_MODELS
+
+        Input:
+            1. name - name of the model (e.g. 'okumura-hata-suburban')
+            2. f - frequency in MHz
+            3. Hb - height of base station from the ground (in meters)
+            4. Hm - height of the mobile from the ground (in meters) """
+
+    if name not in PATH_LOSS_MODELS:
+        raise ValueError('Unknown path loss model {0!r}, must be one of {1}'.format(name, sorted(PATH_LOSS_MODELS)))
+
+    modelClass, kwargs = PATH_LOSS_MODELS[name]
+
+    return modelClass(f, Hb, Hm, **kwargs)
+
+
+#------------------------------------------------------------------
+# Micro benchmark of the models against util.okamuraHata
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    f, Hb, Hm = cfg.FREQUENCY, cfg.BSTN_HEIGHT, cfg.MOBILE_HEIGHT
+
+    distances = np.sqrt(cfg.BSTN_LOCATION**2 + np.linspace(0, cfg.ROAD_LENGTH, 1000000)**2)/1000
+
+    print('{0:<28}{1:>20}{2:>20}{3:>16}'.format('model', 'array (1e6 dst)', 'scalar (per call)', 'max diff (dB)'))
+
+    for areaType in util.AreaType:
+        reference = util.okamuraHata(distances, f, Hb, Hm, areaType)
+
+        tArray = min(timeit.repeat(lambda: util.okamuraHata(distances, f, Hb, Hm, areaType), number=5, repeat=3))/5
+        tScalar = min(timeit.repeat(lambda: util.okamuraHata(1.5, f, Hb, Hm, areaType), number=20000, repeat=3))/20000
+
+        print('{0:<28}{1:>17.2f} ms{2:>17.2f} us{3:>16}'.format('util.okamuraHata ' + areaType.name.lower(), \
+                                                                 tArray*1e3, tScalar*1e6, '-'))
+
+        model = OkumuraHataModel(f, Hb, Hm, areaType)
+
+        tArray = min(timeit.repeat(lambda: model.getPathLoss(distances), number=5, repeat=3))/5
+        tScalar = min(timeit.repeat(lambda: model.getPathLoss(1.5), number=20000, repeat=3))/20000
+
+        print('{0:<28}{1:>17.2f} ms{2:>17.2f} us{3:>16.2e}'.format('OkumuraHataModel ' + areaType.name.lower(), \
+              tArray*1e3, tScalar*1e6, np.max(np.abs(model.getPathLoss(distances) - reference))))
+
+    for name in ('cost231-hata', 'free-space'):
+        model = createPathLossModel(name, f, Hb, Hm)
+
+        tArray = min(timeit.repeat(lambda: model.getPathLoss(distances), number=5, repeat=3))/5
+        tScalar = min(timeit.repeat(lambda: model.getPathLoss(1.5), number=20000, repeat=3))/20000
+
+        print('{0:<28}{1:>17.2f} ms{2:>17.2f} us{3:>16}'.format(name, tArray*1e3, tScalar*1e6, '-'))
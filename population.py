@@ -0,0 +1,113 @@
+###################################################################
+# population.py
+#
+# This python module contains the declaration and definition of
+# Population class, which stores the state of all the mobiles in
+# numpy arrays (one array per attribute)
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import numpy as np
+
+class Population:
+
+    def __init__(self, capacity, bstnIDs = ()):
+        """ Constructor is called when instantiating the object
+
+            Input:
+                1. capacity - number of mobiles (slots) to allocate arrays for
+                2. bstnIDs - IDs of base stations mobiles can connect with
+                             (IDs seen later are added automatically) """
+
+        self._bstnIDs = []                    # list of bstn IDs, index is stored in connectedBstn
+        self._bstnIndex = {}                  # bstn ID -> index in _bstnIDs
+
+        for bstnID in bstnIDs:
+            self.getBstnIndex(bstnID)
+
+        self.userId = np.full(capacity, -1, dtype=np.int64) # ID of the mobile using the slot (-1 if none)
+        self.position = np.zeros(capacity)                  # position on the road from left to right
+        self.direction = np.zeros(capacity, dtype=np.int8)  # +1 if moving from left to right, else -1
+        self.speed = np.zeros(capacity)                     # in meter per sec
+        self.bIsCallActive = np.zeros(capacity, dtype=bool) # call status of the mobile
+        self.callDurationLeft = np.zeros(capacity)          # time left in seconds
+        self.connectedBstn = np.full(capacity, -1, dtype=np.int32) # index of connected bstn (-1 if none)
+
+        self._freeSlots = list(range(capacity - 1, -1, -1)) # slots not yet allocated (stack)
+
+    def getCapacity(self):
+        return len(self.position)
+
+    def getBstnIndex(self, bstnID):
+        """ Returns the index used in connectedBstn array for bstnID (None -> -1) """
+
+        if bstnID is None:
+            return -1
+
+        if bstnID not in self._bstnIndex:
+            self._bstnIndex[bstnID] = len(self._bstnIDs)
+            self._bstnIDs.append(bstnID)
+
+        return self._bstnIndex[bstnID]
+
+    def getBstnID(self, bstnIndex):
+        """ Returns the bstn ID for an index of connectedBstn array (-1 -> None) """
+
+        if bstnIndex < 0:
+            return None
+
+        return self._bstnIDs[bstnIndex]
+
+    def getConnectedBstnIDs(self, slots):
+        """ Returns numpy array of bstn IDs the mobiles in 'slots' are connected with """
+
+        return np.array(self._bstnIDs, dtype=object)[self.connectedBstn[slots]]
+
+    def allocate(self):
+        """ Returns a free slot, grows the arrays if all the slots are in use """
+
+        if not self._freeSlots:
+            self._grow(max(1, self.getCapacity()))
+
+        return self._freeSlots.pop()
+
+    def release(self, slot):
+        """ Resets the slot and returns it to the pool of free slots """
+
+        self.reset(slot)
+        self._freeSlots.append(slot)
+        return
+
+    def reset(self, slots):
+        """ This function resets the values of mobiles in 'slots' to factory defaults
+            (slots can be a single slot or array of slots) """
+
+        self.userId[slots] = -1
+        self.position[slots] = 0
+        self.direction[slots] = 0
+        self.speed[slots] = 0
+        self.bIsCallActive[slots] = False
+        self.callDurationLeft[slots] = 0
+        self.connectedBstn[slots] = -1
+        return
+
+    def _grow(self, count):
+        """ Adds 'count' slots to all the arrays """
+
+        oldCapacity = self.getCapacity()
+
+        self.userId = np.concatenate((self.userId, np.full(count, -1, dtype=np.int64)))
+        self.position = np.concatenate((self.position, np.zeros(count)))
+        self.direction = np.concatenate((self.direction, np.zeros(count, dtype=np.int8)))
+        self.speed = np.concatenate((self.speed, np.zeros(count)))
+        self.bIsCallActive = np.concatenate((self.bIsCallActive, np.zeros(count, dtype=bool)))
+        self.callDurationLeft = np.concatenate((self.callDurationLeft, np.zeros(count)))
+        self.connectedBstn = np.concatenate((self.connectedBstn, np.full(count, -1, dtype=np.int32)))
+
+        self._freeSlots[:0] = range(oldCapacity + count - 1, oldCapacity - 1, -1)
+        return
@@ -0,0 +1,391 @@
+###################################################################
+# replication.py
+#
+# This python module runs independent seeded replications of one
+# configuration (tilt, users, simulation time) in parallel, until
+# the confidence interval of every target KPI (blocking probability,
+# drop rate, handoff failure rate) is narrower than the requested
+# half width, or the budget of replications or time is used up.
+# Means and variances are kept with Welford's running update, and
+# the half width uses the quantile of Student's t distribution.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import sweep
+import config as cfg
+import concurrent.futures
+import argparse
+import math
+import time
+import os
+
+
+#KPIs as name -> (numerator stat, denominator stat), stats are summed over all base stations
+KPI_DEFINITIONS = {'blocking'       : ('blockDueCapacity', 'callAttempts'),
+                   'drop'           : ('callDropDueSgnlStrength', 'successCallEstablishment'),
+                   'handoffFailure' : ('handoffsFailed', 'handoffsOut')}
+
+DEFAULT_HALF_WIDTH = 0.01       # half width of confidence interval of every KPI (absolute, KPIs are fractions)
+DEFAULT_CONFIDENCE = 0.95       # confidence level of the interval
+MIN_REPLICATIONS = 3            # replications before the stopping rule is checked
+
+
+#------------------------------------------------------------------
+# Quantile of Student's t distribution
+#------------------------------------------------------------------
+def studentTCDF(t, dof):
+    """ Returns P(T <= t) of Student's t distribution with integer 'dof' degrees of
+        freedom, from the closed form finite series in theta = atan(t/sqrt(dof)) """
+
+    theta = math.atan(abs(t)/math.sqrt(dof))
+    cosSquare = math.cos(theta)**2
+
+    #P(|T| <= |t|), the series has (dof - 1)//2 terms
+    if dof % 2 == 1:
+        term, total = 1.0, 1.0
+        for k in range(1, (dof - 1)//2):
+            term *= cosSquare * (2*k)/(2*k + 1)
+            total += term
+
+        probInside = 2/math.pi * (theta + (math.sin(theta)*math.cos(theta)*total if dof > 1 else 0))
+    else:
+        term, total = 1.0, 1.0
+        for k in range(1, dof//2):
+            term *= cosSquare * (2*k - 1)/(2*k)
+            total += term
+
+        probInside = math.sin(theta) * total
+
+    return 0.5 + math.copysign(probInside/2, t)
+
+
+def studentTQuantile(probability, dof):
+    """ Returns t such that studentTCDF(t, dof) = probability (0.5 < probability < 1),
+        found with bisection """
+
+    low, high = 0.0, 1.0
+
+    while studentTCDF(high, dof) < probability:
+        high *= 2
+
+    for iCount in range(100):
+        mid = (low + high)/2
+
+        if studentTCDF(mid, dof) < probability:
+            low = mid
+        else:
+            high = mid
+
+    return (low + high)/2
+
+
+#------------------------------------------------------------------
+# Class to keep running mean and variance
+#------------------------------------------------------------------
+class RunningStatistic:
+
+    def __init__(self):
+        """ Running mean and variance of samples, updated with Welford's method (no
+            samples are kept, and there is no loss of precision from sum of squares) """
+
+        self._count = 0
+        self._mean = 0.0
+        self._sumSquares = 0.0          # sum of squared differences from the mean
+
+    def add(self, value):
+        self._count += 1
+
+        delta = value - self._mean
+        self._mean += delta/self._count
+        self._sumSquares += delta * (value - self._mean)
+        return
+
+    def getCount(self):
+        return self._count
+
+    def getMean(self):
+        return self._mean if self._count > 0 else float('nan')
+
+    def getVariance(self):
+        """ Returns the sample variance (nan with fewer than two samples) """
+
+        return self._sumSquares/(self._count - 1) if self._count > 1 else float('nan')
+
+    def getHalfWidth(self, confidence = DEFAULT_CONFIDENCE):
+        """ Returns half width of the confidence interval of the mean (inf with fewer
+            than two samples) """
+
+        if self._count < 2:
+            return float('inf')
+
+        quantile = studentTQuantile(0.5 + confidence/2, self._count - 1)
+
+        return quantile * math.sqrt(self.getVariance()/self._count)
+
+
+#------------------------------------------------------------------
+# Functions of the stopping rule
+#------------------------------------------------------------------
+def getKpiHalfWidth(statistic, numOfEvents, confidence = DEFAULT_CONFIDENCE):
+    """ Returns half width of the confidence interval of a KPI from its RunningStatistic
+        object, with 'numOfEvents' the denominator of the KPI summed over the replications.
+        When every replication gave the same value (e.g. no call blocked) the sample
+        variance is zero, and so would be the t interval. The half width is then taken from
+        the events instead: a rate which did not deviate in numOfEvents events is within
+        -ln(1 - confidence)/numOfEvents of the value (rule of three at 95% confidence) """
+
+    if statistic.getCount() < 2 or statistic.getVariance() > 0:
+        return statistic.getHalfWidth(confidence)
+
+    return -math.log(1 - confidence)/numOfEvents if numOfEvents > 0 else float('inf')
+
+
+def isConverged(statistics, eventCounts, halfWidths, confidence, numOfReplications, minReplications = MIN_REPLICATIONS):
+    """ Returns True if the confidence interval of every KPI in halfWidths is narrower
+        than its half width, after at least minReplications (and two) replications. A KPI
+        which had no observation in any replication (e.g. handoff failure rate when no
+        handoff happens) can not be estimated, so it does not hold the run until the budget
+        is used up (ReplicationResult.isUndefined tells which KPIs these are)
+
+        Input:
+            1. statistics - RunningStatistic object of each KPI with key as KPI name
+            2. eventCounts - denominator of each KPI summed over the replications
+            3. halfWidths - dictionary of target half width with KPI name as key
+            4. confidence - confidence level of the intervals
+            5. numOfReplications - replications added to the statistics
+            6. minReplications - replications before the stopping rule is checked """
+
+    if numOfReplications < max(minReplications, 2):
+        return False
+
+    for name, halfWidth in halfWidths.items():
+        if statistics[name].getCount() == 0:
+            continue
+
+        if getKpiHalfWidth(statistics[name], eventCounts[name], confidence) > halfWidth:
+            return False
+
+    return True
+
+
+#------------------------------------------------------------------
+# Functions to compute the KPIs and run one replication (in worker process)
+#------------------------------------------------------------------
+def computeKpiCounts(stats):
+    """ Returns dictionary of (numerator, denominator) of KPI_DEFINITIONS, summed over
+        the Statistics objects 'stats' (dictionary with base station ID as key) """
+
+    return {name: (sum(getattr(bstnStats, numerator) for bstnStats in stats.values()), \
+                   sum(getattr(bstnStats, denominator) for bstnStats in stats.values())) \
+            for name, (numerator, denominator) in KPI_DEFINITIONS.items()}
+
+
+def computeKpis(stats):
+    """ Returns dictionary of KPI values of KPI_DEFINITIONS from the Statistics objects
+        'stats' (dictionary with base station ID as key). A KPI is nan if its
+        denominator is zero """
+
+    return {name: numerator/denominator if denominator > 0 else float('nan') \
+            for name, (numerator, denominator) in computeKpiCounts(stats).items()}
+
+
+def runReplication(point, engine = cfg.SIMULATION_ENGINE, numOfBstns = cfg.NUM_OF_BSTNS):
+    """ Runs the simulation of one replication (sweep point, see sweep.buildSweepGrid)
+        and returns (replication number, dictionary of KPI values, dictionary of KPI
+        denominators, elapsed time) """
+
+    result = sim.runSimulation(point['users'], point['tilt'], point['hours'], point['seed'], engine, \
+                               printStats = False, numOfBstns = numOfBstns)
+
+    kpiCounts = computeKpiCounts(result.stats)
+
+    return point['replication'], computeKpis(result.stats), \
+           {name: denominator for name, (numerator, denominator) in kpiCounts.items()}, result.elapsedTime
+
+
+#------------------------------------------------------------------
+# Class to hold the result of the replications
+#------------------------------------------------------------------
+class ReplicationResult:
+
+    def __init__(self, statistics, eventCounts, kpiValues, bConverged, numOfReplications, confidence, elapsedTime):
+
+        self.statistics = statistics                # RunningStatistic object of each KPI with key as KPI name
+        self.eventCounts = eventCounts              # denominator of each KPI summed over the replications
+        self.kpiValues = kpiValues                  # list of KPI dictionaries, one per replication (in order)
+        self.bConverged = bConverged                # True if all target KPIs reached their half width
+        self.numOfReplications = numOfReplications  # replications run (KPIs with nan values have fewer samples, see getCount)
+        self.confidence = confidence                # confidence level of the intervals
+        self.elapsedTime = elapsedTime              # wall clock time (in seconds)
+
+    def getInterval(self, name):
+        """ Returns (mean, half width) of KPI 'name' (see getKpiHalfWidth) """
+
+        return self.statistics[name].getMean(), getKpiHalfWidth(self.statistics[name], self.eventCounts[name], \
+                                                                self.confidence)
+
+    def isUndefined(self, name):
+        """ Returns True if KPI 'name' had no observation in any replication (its
+            denominator was zero in all of them) """
+
+        return self.statistics[name].getCount() == 0
+
+
+#------------------------------------------------------------------
+# Function to run replications until the KPIs are precise enough
+#------------------------------------------------------------------
+def runReplications(users, tilt, hours, halfWidths = None, confidence = DEFAULT_CONFIDENCE, \
+                    minReplications = MIN_REPLICATIONS, maxReplications = 100, maxSeconds = None, \
+                    workers = None, seed = 0, engine = cfg.SIMULATION_ENGINE, numOfBstns = cfg.NUM_OF_BSTNS, \
+                    progress = True):
+    """ Runs replications of one configuration on a process pool until the confidence
+        interval of every KPI in halfWidths is narrower than its half width, or the budget
+        is used up. Results are added to the statistics in the order of the replications
+        (not in the order they complete), so the result does not depend on the number of
+        workers. Seeds are the ones of sweep.buildSweepGrid, so replication i is the same
+        run as replication i of a sweep with the same root seed.
+
+        Input:
+            1. users - Total number of users
+            2. tilt - Antenna tilt (in degrees)
+            3. hours - simulation time of each replication (in Hrs)
+            4. halfWidths - dictionary of target half width with KPI name as key
+                            (default: DEFAULT_HALF_WIDTH for all KPI_DEFINITIONS)
+            5. confidence - confidence level of the intervals
+            6. minReplications - replications before the stopping rule is checked
+            7. maxReplications - budget of replications
+            8. maxSeconds - optional budget of wall clock time, no new replication is
+                            started after it (running ones are completed)
+            9. workers - number of worker processes (default value = None, all the cores)
+            10. seed - root seed of the replications
+            11. engine - 'tick' or 'event'
+            12. numOfBstns - number of base stations along the road
+            13. progress - boolean flag to say whether to print the progress
+
+        Output:
+            ReplicationResult object """
+
+    if halfWidths is None:
+        halfWidths = {name: DEFAULT_HALF_WIDTH for name in KPI_DEFINITIONS}
+
+    for name in halfWidths:
+        if name not in KPI_DEFINITIONS:
+            raise ValueError('Unknown KPI {0!r}, expected one of {1}'.format(name, list(KPI_DEFINITIONS)))
+
+    tStart = time.perf_counter()
+
+    points = sweep.buildSweepGrid([tilt], [users], [hours], maxReplications, seed)
+
+    statistics = {name: RunningStatistic() for name in KPI_DEFINITIONS}
+    eventCounts = {name: 0 for name in KPI_DEFINITIONS}
+    kpiValues = []
+    completed = {}              # results which completed before the ones of earlier replications
+    bConverged = False
+
+    numOfWorkers = workers or os.cpu_count() or 1
+
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=numOfWorkers)
+
+    try:
+        pending = set()
+        nextPoint = 0
+
+        while not bConverged and (pending or nextPoint < len(points)):
+        #{ Start of while loop
+            #1. Keep every worker busy until the budget is used up
+            while len(pending) < numOfWorkers and nextPoint < len(points) and \
+                  (maxSeconds is None or time.perf_counter() - tStart < maxSeconds):
+                pending.add(executor.submit(runReplication, points[nextPoint], engine, numOfBstns))
+                nextPoint += 1
+
+            if not pending:
+                break
+
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                replication, kpis, denominators, elapsedTime = future.result()
+                completed[replication] = (kpis, denominators)
+
+            #2. Add the results in order of replication and check the stopping rule after each
+            while not bConverged and len(kpiValues) in completed:
+                kpis, denominators = completed.pop(len(kpiValues))
+                kpiValues.append(kpis)
+
+                for name, value in kpis.items():
+                    eventCounts[name] += denominators[name]
+
+                    if not math.isnan(value):
+                        statistics[name].add(value)
+
+                bConverged = isConverged(statistics, eventCounts, halfWidths, confidence, len(kpiValues), minReplications)
+
+                if progress:
+                    print('[{0}] '.format(len(kpiValues)) + ', '.join('{0} = {1:.4f} +/- {2:.4f}'.format(name, \
+                          statistics[name].getMean(), getKpiHalfWidth(statistics[name], eventCounts[name], confidence)) \
+                          for name in halfWidths))
+        #} End of while loop
+    finally:
+        #Replications still running are not needed, do not wait for them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return ReplicationResult(statistics, eventCounts, kpiValues, bConverged, len(kpiValues), confidence, time.perf_counter() - tStart)
+
+
+#------------------------------------------------------------------
+# Replication execution starts from here!!
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Run replications of a configuration until the confidence intervals ' \
+                                                 'of the KPIs are narrow enough')
+
+    parser.add_argument('--users', type=int, required=True, help='Total number of users')
+    parser.add_argument('--tilt', type=float, required=True, help='Antenna tilt (in degrees)')
+    parser.add_argument('--hours', type=float, required=True, help='Simulation time of each replication (in Hrs)')
+    parser.add_argument('--kpis', nargs='+', choices=list(KPI_DEFINITIONS), default=list(KPI_DEFINITIONS), \
+                        help='KPIs whose confidence interval must be narrow enough (default: all)')
+    parser.add_argument('--half-width', dest='halfWidth', type=float, default=DEFAULT_HALF_WIDTH, \
+                        help='Half width of the confidence interval of the KPIs (default: %(default)s)')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE, help='Confidence level (default: %(default)s)')
+    parser.add_argument('--min-replications', dest='minReplications', type=int, default=MIN_REPLICATIONS)
+    parser.add_argument('--max-replications', dest='maxReplications', type=int, default=100, \
+                        help='Budget of replications (default: %(default)s)')
+    parser.add_argument('--max-seconds', dest='maxSeconds', type=float, default=None, help='Budget of wall clock time')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0, help='Root seed of the replications (default: %(default)s)')
+    parser.add_argument('--engine', choices=['tick', 'event'], default=cfg.SIMULATION_ENGINE, \
+                        help='Simulation engine (default: %(default)s)')
+    parser.add_argument('--bstns', dest='numOfBstns', type=int, default=cfg.NUM_OF_BSTNS, \
+                        help='Number of base stations spaced evenly along the road (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    if args.halfWidth <= 0:
+        parser.error('--half-width must be a positive value')
+    if not 0 < args.confidence < 1:
+        parser.error('--confidence must be between 0 and 1')
+    if args.maxReplications < 2:
+        parser.error('--max-replications must be at least 2')
+
+    result = runReplications(args.users, args.tilt, args.hours, {name: args.halfWidth for name in args.kpis}, \
+                             args.confidence, args.minReplications, args.maxReplications, args.maxSeconds, \
+                             args.workers, args.seed, args.engine, args.numOfBstns)
+
+    for name in KPI_DEFINITIONS:
+        if result.isUndefined(name):
+            print('{0:>16}: undefined, no {1} in any replication'.format(name, KPI_DEFINITIONS[name][1]))
+            continue
+
+        mean, halfWidth = result.getInterval(name)
+        print('{0:>16}: {1:.4f} +/- {2:.4f} ({3:g}% confidence, n = {4})'.format(name, mean, halfWidth, \
+              100*result.confidence, result.statistics[name].getCount()))
+
+    print('{0} after {1} replications in {2:.2f} seconds'.format('Converged' if result.bConverged else 'Budget used up', \
+          result.numOfReplications, result.elapsedTime))
@@ -0,0 +1,236 @@
+###################################################################
+# report.py
+#
+# This python module renders the plots of many simulation runs to
+# image files (PNG/SVG) without a display. All the plots of a report
+# are drawn on one reused figure, so matplotlib is set up only once
+# per process.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import kpiRecorder as kpi
+import config as cfg
+import numpy as np
+import argparse
+import csv
+import os
+
+
+#Call statistics plotted against tilt, as (column suffix in sweep results, label)
+REPORT_CALL_STATS = [('callDropDueSgnlStrength', 'Drops (signal strength)'),
+                     ('callDropDueCapacity',     'Drops (capacity)'),
+                     ('blockDueCapacity',        'Blocks (capacity)'),
+                     ('callEstblFailDueSignlStrnt', 'Establishment failures (signal strength)')]
+
+REPORT_SGNL_IX_CLASSES = [('lt5dB', '< 5dB', 'r'), ('5to10dB', '> 5dB and < 10dB', 'm'), ('gt10dB', '> 10dB', 'g')]
+
+
+#------------------------------------------------------------------
+# Function to render S/I bar graphs of simulation results
+#------------------------------------------------------------------
+def renderRunReport(results, outputDir, fileFormat = 'png'):
+    """ Writes the S/I bar graphs of every simulation result to outputDir
+
+        Input:
+            1. results - list of SimulationResult objects (see simulation.py)
+            2. outputDir - directory of the image files (created if it does not exist)
+            3. fileFormat - 'png' or 'svg'
+
+        Output:
+            List of paths of the image files written """
+
+    os.makedirs(outputDir, exist_ok=True)
+
+    renderer = util.SgnlIxFigureRenderer(cfg.ROAD_LENGTH, fileFormat)
+
+    filePaths = []
+
+    for result in results:
+        filePrefix = os.path.join(outputDir, 'sgnlIx_users{0}_tilt{1:g}_hours{2:g}_seed{3}'.format( \
+                                  result.users, result.tilt, result.hours, result.seed))
+
+        filePaths += renderer.render(result.sgnlIxAccumulator, filePrefix)
+
+    return filePaths
+
+
+#------------------------------------------------------------------
+# Function to read sweep results file
+#------------------------------------------------------------------
+def readSweepResults(filepath):
+    """ Reads the CSV file written by sweep.py and returns list of rows (dictionaries) """
+
+    with open(filepath, newline='') as fp:
+        return list(csv.DictReader(fp))
+
+
+#------------------------------------------------------------------
+# Function to render the summary plots of a sweep
+#------------------------------------------------------------------
+def renderSweepReport(rows, outputDir, fileFormat = 'png'):
+    """ Writes the summary plots of a sweep to outputDir. For every combination of
+        users and hours two plots are made for each base station:
+            1. call statistics against tilt
+            2. share of S/I samples in each class against tilt
+        Values of the replications of a point are averaged.
+
+        Input:
+            1. rows - list of result rows of sweep.py (values can be strings, as read
+                      from the CSV file)
+            2. outputDir - directory of the image files (created if it does not exist)
+            3. fileFormat - 'png' or 'svg'
+
+        Output:
+            List of paths of the image files written """
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    os.makedirs(outputDir, exist_ok=True)
+
+    figure = Figure(figsize=(12, 7))
+    FigureCanvasAgg(figure)
+
+    #1. Group the rows by (users, hours), and then by tilt
+    groups = {}
+
+    for row in rows:
+        key = (int(row['users']), float(row['hours']))
+        groups.setdefault(key, {}).setdefault(float(row['tilt']), []).append(row)
+
+    bstnIDs = sorted({column.split('_')[0] for column in rows[0] if column.endswith('_callAttempts')}) if rows else []
+
+    filePaths = []
+
+    #2. Plot each group
+    for (numOfUsers, hours), rowsOfTilt in sorted(groups.items()):
+    #{ Start of for loop
+        tilts = np.array(sorted(rowsOfTilt))
+
+        for bstnID in bstnIDs:
+            filePrefix = os.path.join(outputDir, 'sweep_users{0}_hours{1:g}_{2}'.format(numOfUsers, hours, bstnID))
+
+            #Call statistics against tilt
+            figure.clear()
+            axes = figure.add_subplot()
+
+            for column, label in REPORT_CALL_STATS:
+                values = _meanOverReplications(rowsOfTilt, tilts, '{0}_{1}'.format(bstnID, column))
+                axes.plot(tilts, values, marker='o', label=label)
+
+            axes.set_xlabel('Antenna tilt (in degrees)')
+            axes.set_ylabel('Count')
+            axes.set_title('Call statistics of BASE STATION-{0} ({1} users, {2:g} Hrs)'.format(bstnID, numOfUsers, hours))
+            axes.legend(loc='best')
+
+            filePaths.append('{0}_calls.{1}'.format(filePrefix, fileFormat))
+            figure.savefig(filePaths[-1], format=fileFormat)
+
+            #Share of S/I classes against tilt
+            figure.clear()
+            axes = figure.add_subplot()
+
+            classCounts = [_meanOverReplications(rowsOfTilt, tilts, '{0}_sgnlIx_{1}'.format(bstnID, sgnlIxClass)) \
+                           for sgnlIxClass, label, color in REPORT_SGNL_IX_CLASSES]
+            totalCounts = np.maximum(np.sum(classCounts, axis=0), 1)
+
+            for counts, (sgnlIxClass, label, color) in zip(classCounts, REPORT_SGNL_IX_CLASSES):
+                axes.plot(tilts, 100*counts/totalCounts, marker='o', label=label, color=color)
+
+            axes.set_xlabel('Antenna tilt (in degrees)')
+            axes.set_ylabel('Share of S/I samples (%)')
+            axes.set_title('S/I classes of BASE STATION-{0} ({1} users, {2:g} Hrs)'.format(bstnID, numOfUsers, hours))
+            axes.legend(loc='best')
+
+            filePaths.append('{0}_sgnlIx.{1}'.format(filePrefix, fileFormat))
+            figure.savefig(filePaths[-1], format=fileFormat)
+    #} End of for loop
+
+    return filePaths
+
+
+#------------------------------------------------------------------
+# Function to render the KPIs of a run over time
+#------------------------------------------------------------------
+def renderKpiReport(kpiRecorder, filePath, fileFormat = 'png'):
+    """ Plots the blocking rate, drop rate and channels in use of every base station
+        against time (one panel each) and writes the plot to filePath
+
+        Input:
+            1. kpiRecorder - KpiRecorder object (see kpiRecorder.py, or readKpiFile)
+            2. filePath - path of the image file
+            3. fileFormat - 'png' or 'svg'
+
+        Output:
+            Path of the image file written """
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(12, 10))
+    FigureCanvasAgg(figure)
+
+    axesBlock, axesDrop, axesChannels = figure.subplots(3, 1, sharex=True)
+
+    hours = kpiRecorder.getTimes()/3600
+
+    for bstnID in kpiRecorder.getBstnIDs():
+        axesBlock.plot(hours, 100*kpiRecorder.getBlockingRate(bstnID), marker='o', label='BASE STATION-' + bstnID)
+        axesDrop.plot(hours, 100*kpiRecorder.getDropRate(bstnID), marker='o', label='BASE STATION-' + bstnID)
+        axesChannels.plot(hours, kpiRecorder.getChannelsInUse(bstnID), marker='o', label='BASE STATION-' + bstnID)
+
+    axesBlock.set_ylabel('Blocking rate (%)')
+    axesDrop.set_ylabel('Drop rate (%)')
+    axesChannels.set_ylabel('Channels in use')
+    axesChannels.set_xlabel('Time (in Hrs)')
+    axesBlock.set_title('KPIs per interval of {0:g} seconds'.format(kpiRecorder.getInterval()))
+
+    for axes in (axesBlock, axesDrop, axesChannels):
+        axes.legend(loc='best')
+
+    figure.savefig(filePath, format=fileFormat)
+
+    return filePath
+
+
+def _meanOverReplications(rowsOfTilt, tilts, column):
+    """ Returns array of mean value of 'column' over the replications of each tilt """
+
+    return np.array([np.mean([float(row[column]) for row in rowsOfTilt[tilt]]) for tilt in tilts])
+
+
+#------------------------------------------------------------------
+# Report execution starts from here!!
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Render the summary plots of a sweep results file, ' \
+                                                 'or the KPIs over time of a run (--kpi)')
+
+    parser.add_argument('results', nargs='?', default=None, help='CSV file written by sweep.py')
+    parser.add_argument('--kpi', dest='kpiPath', default=None, help='KPI file written by main.py --kpi-file')
+    parser.add_argument('--output-dir', dest='outputDir', default='report', help='Directory of the plots (default: %(default)s)')
+    parser.add_argument('--format', dest='fileFormat', choices=['png', 'svg'], default='png', \
+                        help='Image format (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    if args.results is None and args.kpiPath is None:
+        parser.error('give a sweep results file and/or --kpi')
+
+    if args.results is not None:
+        for filePath in renderSweepReport(readSweepResults(args.results), args.outputDir, args.fileFormat):
+            print(filePath)
+
+    if args.kpiPath is not None:
+        os.makedirs(args.outputDir, exist_ok=True)
+        kpiFileName = os.path.splitext(os.path.basename(args.kpiPath))[0]
+
+        print(renderKpiReport(kpi.readKpiFile(args.kpiPath), \
+                              os.path.join(args.outputDir, '{0}.{1}'.format(kpiFileName, args.fileFormat)), args.fileFormat))
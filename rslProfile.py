@@ -0,0 +1,317 @@
+###################################################################
+# rslProfile.py
+#
+# This python module computes the median RSL curves (EIRP - path
+# loss + shadowing, no fading) of many base stations and tilts along
+# the road in one vectorized pass. Profiles are cached on disk as
+# .npz files keyed by a hash of the configuration, so coverage
+# studies over many tilts are returned from the cache when repeated.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import antennaPattern as antenna
+import pathLoss
+import basestation as bstn
+import config as cfg
+import numpy as np
+import hashlib
+import argparse
+import time
+import os
+
+
+RSL_PROFILE_VERSION = 1     # Changes when the computed values change, old cache files are not used
+
+
+#------------------------------------------------------------------
+# Class to hold the RSL profiles
+#------------------------------------------------------------------
+class RSLProfiles:
+
+    def __init__(self, tilts, bstnIDs, bstnPositions, positions, rsl):
+        """ Constructor is called when instantiating the object
+
+            Input:
+                1. tilts - list of antenna tilts (in degrees)
+                2. bstnIDs - list of base station IDs
+                3. bstnPositions - positions of the base stations along the road (in meters)
+                4. positions - positions of the mobile along the road (in meters)
+                5. rsl - 2-D array of RSL values (in dBm), one row per (base station, tilt)
+                         pair (row = iBstn * len(tilts) + iTilt) and one column per position """
+
+        self._tilts = [float(tilt) for tilt in tilts]
+        self._bstnIDs = [str(bstnID) for bstnID in bstnIDs]
+        self._bstnPositions = np.asarray(bstnPositions, dtype=float)
+        self._positions = np.asarray(positions, dtype=float)
+        self._rsl = np.asarray(rsl, dtype=float)
+
+    def getTilts(self):
+        return self._tilts
+
+    def getBstnIDs(self):
+        return self._bstnIDs
+
+    def getBstnPositions(self):
+        return self._bstnPositions
+
+    def getPositions(self):
+        return self._positions
+
+    def getRSL(self):
+        """ Returns the 2-D array of RSL values (rows of (base station, tilt) pairs x positions) """
+
+        return self._rsl
+
+    def getRowIndex(self, bstnID, tilt):
+        """ Returns the row of the RSL array of bstnID and tilt """
+
+        return self._bstnIDs.index(bstnID) * len(self._tilts) + self._tilts.index(float(tilt))
+
+    def getProfile(self, bstnID, tilt):
+        """ Returns array of RSL values of bstnID with antenna tilt 'tilt' at every position """
+
+        return self._rsl[self.getRowIndex(bstnID, tilt)]
+
+    def save(self, filepath):
+        """ Writes the profiles to a .npz file (read back with loadRSLProfiles) """
+
+        with open(filepath, 'wb') as fp:
+            np.savez(fp, tilts=np.array(self._tilts), bstnIDs=np.array(self._bstnIDs), \
+                     bstnPositions=self._bstnPositions, positions=self._positions, rsl=self._rsl)
+        return
+
+
+def loadRSLProfiles(filepath):
+    """ Reads the profiles written by RSLProfiles.save """
+
+    with np.load(filepath) as data:
+        return RSLProfiles(data['tilts'].tolist(), data['bstnIDs'].tolist(), data['bstnPositions'], \
+                           data['positions'], data['rsl'])
+
+
+#------------------------------------------------------------------
+# Function to compute the RSL profiles
+#------------------------------------------------------------------
+def computeRSLProfiles(tilts, numOfBstns = cfg.NUM_OF_BSTNS, bstnPositions = None, \
+                       resolution = cfg.RSL_TABLE_RESOLUTION, bShadowing = True):
+    """ Computes the median RSL of every base station and tilt at every position of the
+        road, with the parameters from config.py (same values as the RSL tables of the
+        base stations created by simulation.createBaseStations)
+
+        EIRP of all the tilts is one np.interp call over an array of
+        (tilts x base stations x positions), path loss and shadowing are computed once
+        per (base station, position) and shared by all the tilts.
+
+        Input:
+            1. tilts - list of antenna tilts (in degrees)
+            2. numOfBstns - number of base stations, spaced evenly along the road
+            3. bstnPositions - optional list of positions of base stations (in meters),
+                               used instead of numOfBstns
+            4. resolution - distance between positions (in meters)
+            5. bShadowing - boolean flag to say whether to add the shadowing values
+
+        Output:
+            RSLProfiles object """
+
+    if bstnPositions is None:
+        bstnPositions = np.linspace(0, cfg.ROAD_LENGTH, numOfBstns)
+
+    bstnPositions = np.asarray(bstnPositions, dtype=float)
+    positions = getProfilePositions(resolution)
+
+    rsl = _computeMedianRSL(tilts, bstnPositions, np.arange(len(bstnPositions)), positions, bShadowing)
+
+    #Rows of (base station, tilt) pairs
+    rsl = rsl.transpose(1, 0, 2).reshape(len(bstnPositions) * len(tilts), len(positions))
+
+    bstnIDs = [bstn.getBstnID(iBstn, len(bstnPositions)) for iBstn in range(len(bstnPositions))]
+
+    return RSLProfiles(tilts, bstnIDs, bstnPositions, positions, rsl)
+
+
+def computeBstnRSL(iBstn, bstnPosition, tilt, height = cfg.BSTN_HEIGHT, txPower = cfg.TX_POWER, \
+                   resolution = cfg.RSL_TABLE_RESOLUTION, bShadowing = True):
+    """ Computes the median RSL of one base station (the iBstn-th from the left, which
+        decides its shadowing values) with its own tilt, height and transmit power
+
+        Output:
+            numpy array of RSL values (in dBm) at getProfilePositions(resolution) """
+
+    return _computeMedianRSL([tilt], np.array([bstnPosition], dtype=float), np.array([iBstn]), \
+                             getProfilePositions(resolution), bShadowing, height, txPower)[0, 0]
+
+
+def getProfilePositions(resolution = cfg.RSL_TABLE_RESOLUTION):
+    """ Returns array of positions on the road (in meters) at which profiles are computed """
+
+    return np.linspace(0, cfg.ROAD_LENGTH, int(round(cfg.ROAD_LENGTH/resolution)) + 1)
+
+
+def _computeMedianRSL(tilts, bstnPositions, bstnIndices, positions, bShadowing, \
+                      height = None, txPower = None):
+    """ Returns array of median RSL of shape (tilts, base stations, positions). bstnIndices
+        are the indices of the base stations from the left (seeds of shadowing values).
+        Height and transmit power are taken from config.py if not given """
+
+    height = cfg.BSTN_HEIGHT if height is None else height
+    txPower = cfg.TX_POWER if txPower is None else txPower
+
+    tilts = np.asarray(tilts, dtype=float)
+
+    #1. Distances of positions from every base station (base stations x positions)
+    dstAlongRoad = np.abs(positions[np.newaxis] - bstnPositions[:, np.newaxis])
+    actualDistances = np.sqrt( (cfg.BSTN_LOCATION ** 2) + (dstAlongRoad ** 2) )
+
+    #2. EIRP in the direction of mobile for all the tilts (tilts x base stations x positions)
+    pattern = antenna.loadAntennaPattern(cfg.VERTICAL_PATTERN_FILEPATH)
+
+    gamma = np.rad2deg( np.arctan2((height - cfg.MOBILE_HEIGHT), actualDistances) )
+    boreEIRP = txPower - cfg.CONNECTOR_LOSSES + cfg.ANTENNA_GAIN
+
+    rsl = boreEIRP - pattern.getDiscriminationGrid(tilts, gamma)
+
+    #3. Path loss and shadowing do not depend on tilt
+    model = pathLoss.createPathLossModel(cfg.PATH_LOSS_MODEL, cfg.FREQUENCY, height, cfg.MOBILE_HEIGHT)
+
+    loss = model.getPathLoss(actualDistances/1000)
+
+    if bShadowing:
+        shadowValues = np.stack([bstn.createShadowValues(iBstn) for iBstn in bstnIndices])
+
+        shadowIndex = np.minimum(dstAlongRoad//cfg.SHADOWING_RESOLUTION, shadowValues.shape[1] - 1).astype(int)
+        loss = loss - np.take_along_axis(shadowValues, shadowIndex, axis=1)
+
+    rsl -= loss[np.newaxis]
+
+    #Base stations can not be received beyond their range
+    rsl[:, dstAlongRoad > cfg.BSTN_MAX_RANGE] = -np.inf
+
+    return rsl
+
+
+#------------------------------------------------------------------
+# Function to get RSL profiles from cache (or compute them)
+#------------------------------------------------------------------
+def getRSLProfilePath(cacheDir, tilts, bstnPositions, resolution, bShadowing):
+    """ Returns the path of cache file of the profiles. The file name is a hash of all
+        the parameters the profiles depend on (config.py values and antenna pattern) """
+
+    pattern = antenna.loadAntennaPattern(cfg.VERTICAL_PATTERN_FILEPATH)
+
+    key = repr((RSL_PROFILE_VERSION, [float(tilt) for tilt in tilts], [float(pos) for pos in bstnPositions], \
+                float(resolution), bool(bShadowing), cfg.ROAD_LENGTH, cfg.BSTN_HEIGHT, cfg.BSTN_LOCATION, \
+                cfg.TX_POWER, cfg.CONNECTOR_LOSSES, cfg.ANTENNA_GAIN, cfg.FREQUENCY, cfg.MOBILE_HEIGHT, \
+                cfg.BSTN_MAX_RANGE, cfg.PATH_LOSS_MODEL, cfg.SHADOWING_MODEL, cfg.SHADOWING_RESOLUTION, \
+                cfg.SHADOWING_MEAN, cfg.SHADOWING_STD, cfg.SHADOWING_DECORR_DISTANCE))
+
+    digest = hashlib.sha1(key.encode())
+    digest.update(np.ascontiguousarray(pattern.getVertDiscrmnData()).tobytes())
+
+    return os.path.join(cacheDir, 'rsl_{0}.npz'.format(digest.hexdigest()[:16]))
+
+
+def getRSLProfiles(tilts, numOfBstns = cfg.NUM_OF_BSTNS, bstnPositions = None, \
+                   resolution = cfg.RSL_TABLE_RESOLUTION, bShadowing = True, cacheDir = cfg.RSL_PROFILE_CACHE_DIR):
+    """ Same as computeRSLProfiles, but the profiles are loaded from 'cacheDir' if they
+        were computed before with the same configuration (and saved there if not).
+        cacheDir = None turns off the cache """
+
+    if bstnPositions is None:
+        bstnPositions = np.linspace(0, cfg.ROAD_LENGTH, numOfBstns)
+
+    if cacheDir is None:
+        return computeRSLProfiles(tilts, bstnPositions = bstnPositions, resolution = resolution, bShadowing = bShadowing)
+
+    filepath = getRSLProfilePath(cacheDir, tilts, bstnPositions, resolution, bShadowing)
+
+    if os.path.exists(filepath):
+        return loadRSLProfiles(filepath)
+
+    profiles = computeRSLProfiles(tilts, bstnPositions = bstnPositions, resolution = resolution, bShadowing = bShadowing)
+
+    #Write to a temporary file first, so that parallel runs never read a partly written file
+    os.makedirs(cacheDir, exist_ok=True)
+    tempPath = '{0}.{1}.tmp'.format(filepath, os.getpid())
+
+    profiles.save(tempPath)
+    os.replace(tempPath, filepath)
+
+    return profiles
+
+
+#------------------------------------------------------------------
+# Function to plot the RSL profiles
+#------------------------------------------------------------------
+def renderRSLProfiles(profiles, filePath, fileFormat = 'png'):
+    """ Plots the RSL against position for every tilt (one panel per base station) and
+        writes the plot to filePath without a display
+
+        Output:
+            Path of the image file written """
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    bstnIDs = profiles.getBstnIDs()
+
+    figure = Figure(figsize=(12, 4*len(bstnIDs)))
+    FigureCanvasAgg(figure)
+
+    axesList = np.atleast_1d(figure.subplots(len(bstnIDs), 1, sharex=True))
+
+    for axes, bstnID in zip(axesList, bstnIDs):
+        for tilt in profiles.getTilts():
+            axes.plot(profiles.getPositions(), profiles.getProfile(bstnID, tilt), label='RSL with tilt = {0:g}'.format(tilt))
+
+        axes.set_ylabel('RSL in dBm')
+        axes.set_title('RSL values for bstn{0} with different tilt values'.format(bstnID))
+        axes.grid(linestyle='dotted')
+        axes.legend(loc='upper right')
+
+    axesList[-1].set_xlabel('Position of mobile on road (Left to right) in meters')
+
+    figure.savefig(filePath, format=fileFormat)
+
+    return filePath
+
+
+#------------------------------------------------------------------
+# Command line interface
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Compute the median RSL profiles of base stations along the road ' \
+                                                 'for a list of tilts (cached in RSL_PROFILE_CACHE_DIR)')
+
+    parser.add_argument('--tilts', type=float, nargs='+', default=[0, 2, 5, 10], help='Antenna tilts (in degrees)')
+    parser.add_argument('--bstns', dest='numOfBstns', type=int, default=cfg.NUM_OF_BSTNS, \
+                        help='Number of base stations spaced evenly along the road (default: %(default)s)')
+    parser.add_argument('--resolution', type=float, default=cfg.RSL_TABLE_RESOLUTION, \
+                        help='Distance between positions in meters (default: %(default)s)')
+    parser.add_argument('--no-shadowing', dest='bShadowing', action='store_false', help='Do not add shadowing values')
+    parser.add_argument('--no-cache', dest='cacheDir', action='store_const', const=None, \
+                        default=cfg.RSL_PROFILE_CACHE_DIR, help='Do not read or write the cache')
+    parser.add_argument('--output', default=None, help='Also write the profiles to this .npz file')
+    parser.add_argument('--plot', dest='plotPath', default=None, help='Write the plot of the profiles to this image file')
+    parser.add_argument('--plot-format', dest='plotFormat', choices=['png', 'svg'], default='png', \
+                        help='Image format of --plot (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    tStart = time.perf_counter()
+    profiles = getRSLProfiles(args.tilts, args.numOfBstns, resolution = args.resolution, \
+                              bShadowing = args.bShadowing, cacheDir = args.cacheDir)
+
+    print('{0} profiles of {1} positions in {2:.3f} seconds'.format(profiles.getRSL().shape[0], \
+          profiles.getRSL().shape[1], time.perf_counter() - tStart))
+
+    if args.output is not None:
+        profiles.save(args.output)
+
+    if args.plotPath is not None:
+        renderRSLProfiles(profiles, args.plotPath, args.plotFormat)
@@ -0,0 +1,204 @@
+###################################################################
+# sgnlIxTrace.py
+#
+# This python module contains the writer and reader of S/I trace
+# files. A trace file keeps every S/I sample (time, user ID,
+# position, serving base station, S/I value) in a compact binary
+# format, which is read back with np.memmap without loading the
+# whole file into memory
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import numpy as np
+import json
+
+
+#------------------------------------------------------------------
+# Trace file format
+#------------------------------------------------------------------
+# [8 bytes magic][4 bytes header length (little endian)][JSON header][padding]
+# [records of TRACE_DTYPE ...]
+# Records start at a multiple of TRACE_ALIGNMENT bytes.
+
+TRACE_MAGIC = b'SGNLIX01'
+TRACE_ALIGNMENT = 64
+
+TRACE_DTYPE = np.dtype([('time',     '<f8'),   # simulation time (in seconds)
+                        ('userId',   '<u4'),   # ID of the user
+                        ('position', '<f4'),   # position on the road (in meters)
+                        ('bstn',     '<u2'),   # index of serving bstn in header 'bstnIDs'
+                        ('sgnlIx',   '<f4')])  # S/I value (in dB)
+
+
+#------------------------------------------------------------------
+# Class to write S/I samples to trace file
+#------------------------------------------------------------------
+class SgnlIxTraceWriter:
+
+    def __init__(self, filepath, bstnIDs, chunkSize = 65536):
+        """ Opens the trace file for writing. Samples are kept in a buffer of
+            'chunkSize' records and written to the file when the buffer is full.
+
+            Input:
+                1. filepath - path of the trace file (overwritten if exists)
+                2. bstnIDs - IDs of the base stations (saved in the header)
+                3. chunkSize - number of records buffered before writing """
+
+        self._bstnIDs = list(bstnIDs)
+        self._bstnIndex = {bstnID: index for index, bstnID in enumerate(self._bstnIDs)}
+
+        self._buffer = np.empty(chunkSize, dtype=TRACE_DTYPE)
+        self._numBuffered = 0
+        self._numWritten = 0
+
+        header = json.dumps({'bstnIDs': self._bstnIDs, 'dtype': TRACE_DTYPE.descr}).encode()
+        headerLen = len(TRACE_MAGIC) + 4 + len(header)
+        padding = (-headerLen) % TRACE_ALIGNMENT
+
+        self._fp = open(filepath, 'wb')
+        self._fp.write(TRACE_MAGIC)
+        self._fp.write(np.uint32(len(header) + padding).astype('<u4').tobytes())
+        self._fp.write(header + b' ' * padding)
+
+    def add(self, time, userIds, positions, bstnIDs, sgnlIx):
+        """ Adds a batch of S/I samples of the same time
+
+            Input:
+                1. time - simulation time (in seconds)
+                2. userIds - array of user IDs
+                3. positions - array of locations of the mobiles on road
+                4. bstnIDs - array of serving base station IDs
+                5. sgnlIx - array of S/I values (in dB) """
+
+        uniqueIDs, inverse = np.unique(np.asarray(bstnIDs), return_inverse=True)
+        bstnIndex = np.array([self._bstnIndex[bstnID] for bstnID in uniqueIDs], dtype=np.uint16)[inverse]
+
+        numOfSamples = len(bstnIndex)
+        start = 0
+
+        while start < numOfSamples:
+            count = min(numOfSamples - start, len(self._buffer) - self._numBuffered)
+            chunk = self._buffer[self._numBuffered:self._numBuffered + count]
+
+            chunk['time'] = time
+            chunk['userId'] = userIds[start:start + count]
+            chunk['position'] = positions[start:start + count]
+            chunk['bstn'] = bstnIndex[start:start + count]
+            chunk['sgnlIx'] = sgnlIx[start:start + count]
+
+            self._numBuffered += count
+            start += count
+
+            if self._numBuffered == len(self._buffer):
+                self.flush()
+
+        return
+
+    def flush(self):
+        """ Writes the buffered records to the file """
+
+        self._buffer[:self._numBuffered].tofile(self._fp)
+        self._numWritten += self._numBuffered
+        self._numBuffered = 0
+        self._fp.flush()
+        return
+
+    def getNumOfSamples(self):
+        return self._numWritten + self._numBuffered
+
+    def close(self):
+        if not self._fp.closed:
+            self.flush()
+            self._fp.close()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+
+#------------------------------------------------------------------
+# Function to read trace file
+#------------------------------------------------------------------
+def readSgnlIxTrace(filepath):
+    """ Opens the trace file as a memory mapped array (records are read from
+        disk only when accessed)
+
+        Input:
+            1. filepath - path of the trace file
+
+        Output:
+            (numpy memmap of TRACE_DTYPE records, list of base station IDs) """
+
+    with open(filepath, 'rb') as fp:
+        magic = fp.read(len(TRACE_MAGIC))
+
+        if magic != TRACE_MAGIC:
+            raise ValueError('{0} is not a S/I trace file'.format(filepath))
+
+        headerLen = int(np.frombuffer(fp.read(4), dtype='<u4')[0])
+        header = json.loads(fp.read(headerLen).decode())
+
+    offset = len(TRACE_MAGIC) + 4 + headerLen
+    records = np.memmap(filepath, dtype=TRACE_DTYPE, mode='r', offset=offset)
+
+    return records, header['bstnIDs']
+
+
+#------------------------------------------------------------------
+# Function to iterate over trace records in chunks
+#------------------------------------------------------------------
+def iterSgnlIxTrace(records, chunkSize = 1 << 20):
+    """ Yields the trace records in chunks of 'chunkSize' records, so that only
+        one chunk is in memory at a time """
+
+    for start in range(0, len(records), chunkSize):
+        yield records[start:start + chunkSize]
+
+
+#------------------------------------------------------------------
+# Function to count S/I values of trace file
+#------------------------------------------------------------------
+def accumulateSgnlIxTrace(filepath, roadLen, chunkSize = 1 << 20):
+    """ Streams over the trace file and counts the S/I values in each class and
+        road section (same as the counts made while simulating)
+
+        Input:
+            1. filepath - path of the trace file
+            2. roadLen - length of road in meters
+            3. chunkSize - number of records processed at a time
+
+        Output:
+            util.SgnlIxAccumulator object with the counts """
+
+    records, bstnIDs = readSgnlIxTrace(filepath)
+
+    #Accumulator has the bstns in the same order as the trace header, so the
+    #bstn indices of the records are used as they are
+    accumulator = util.SgnlIxAccumulator(bstnIDs, roadLen)
+
+    for chunk in iterSgnlIxTrace(records, chunkSize):
+        accumulator.addByIndex(chunk['position'], chunk['bstn'], chunk['sgnlIx'])
+
+    return accumulator
+
+
+#------------------------------------------------------------------
+# Function to plot S/I values of trace file as bar graph
+#------------------------------------------------------------------
+def plotSgnlIxTrace(filepath, roadLen, chunkSize = 1 << 20):
+    """ Same as util.plotSgnlIxInfo for the S/I values saved in a trace file.
+        The file is streamed in chunks, so it can be larger than the memory """
+
+    util.plotSgnlIxInfo(accumulateSgnlIxTrace(filepath, roadLen, chunkSize), roadLen)
+
+    return
@@ -0,0 +1,196 @@
+###################################################################
+# shadowMap.py
+#
+# This python module contains the generator of spatially correlated
+# shadowing maps (Gudmundson model). Shadowing values at distance d
+# apart have correlation exp(-d/decorrelation distance), which is an
+# AR(1) process along the road. The filter is run in blocks with
+# numpy array operations, so maps of 100 KM roads at 1 meter
+# resolution are generated in a fraction of a second. Maps use a
+# random generator of their own (global random state is not touched)
+# and are cached on disk as .npy files keyed by their parameters.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import config as cfg
+import numpy as np
+import hashlib
+import argparse
+import time
+import os
+
+
+SHADOW_MAP_VERSION = 1      # Changes when the generated values change, old cache files are not used
+
+
+#------------------------------------------------------------------
+# AR(1) filter
+#------------------------------------------------------------------
+def filterAR1(innovations, rho, initialValue = 0.0, blockSize = 4096):
+    """ Runs the AR(1) filter x[i] = rho * x[i-1] + innovations[i] with x[-1] = initialValue
+
+        The samples are reshaped into blocks. Inside each block the filter is a
+        cumulative sum of innovations scaled by powers of rho (all blocks at once),
+        then the last value of each block is carried to the next one (one loop step
+        per block) and added to the block scaled by powers of rho.
+
+        Input:
+            1. innovations - numpy array of input samples
+            2. rho - coefficient of the filter (0 <= rho < 1)
+            3. initialValue - value of the filter before the first sample
+            4. blockSize - number of samples per block (reduced if rho**-blockSize would overflow)
+
+        Output:
+            numpy array of filtered samples (same size as innovations) """
+
+    innovations = np.asarray(innovations, dtype=float)
+    numOfSamples = len(innovations)
+
+    if numOfSamples == 0 or rho == 0:
+        output = innovations.copy()
+        if numOfSamples > 0:
+            output[0] += rho * initialValue
+        return output
+
+    #rho**-j is used inside a block, keep it below e**50 so that no precision is lost
+    blockSize = int(max(1, min(blockSize, numOfSamples, 50/(-np.log(rho)))))
+
+    numOfBlocks = -(-numOfSamples//blockSize)
+    blocks = np.zeros(numOfBlocks * blockSize)
+    blocks[:numOfSamples] = innovations
+    blocks = blocks.reshape(numOfBlocks, blockSize)
+
+    powers = rho ** np.arange(blockSize)                       # rho**j, j = 0 .. blockSize-1
+
+    #1. Filter of each block starting from zero: x[j] = rho**j * sum(rho**-i * e[i], i <= j)
+    blocks = np.cumsum(blocks / powers, axis=1) * powers
+
+    #2. Carry the last value of each block to the next one
+    carry = np.empty(numOfBlocks)
+    value = initialValue
+    rhoBlock = rho ** blockSize
+
+    for iBlock in range(numOfBlocks):
+    #{ Start of for loop
+        carry[iBlock] = value
+        value = rhoBlock * value + blocks[iBlock, -1]
+    #} End of for loop
+
+    blocks += carry[:, np.newaxis] * (rho * powers)
+
+    return blocks.reshape(-1)[:numOfSamples]
+
+
+#------------------------------------------------------------------
+# Function to generate shadowing map
+#------------------------------------------------------------------
+def generateShadowMap(numOfSamples, resolution = cfg.SHADOWING_RESOLUTION, mean = cfg.SHADOWING_MEAN, \
+                      std = cfg.SHADOWING_STD, decorrDistance = cfg.SHADOWING_DECORR_DISTANCE, seed = 0):
+    """ Generates shadowing values (gaussian with 'mean' and 'std') every 'resolution'
+        meters, with correlation exp(-d/decorrDistance) between values d meters apart
+
+        Input:
+            1. numOfSamples - Number of samples to be generated
+            2. resolution - distance between samples (in meters)
+            3. mean - mean of shadowing (in dB)
+            4. std - standard deviation of shadowing (in dB)
+            5. decorrDistance - distance at which correlation falls to 1/e (in meters),
+                                0 gives independent samples
+            6. seed - seed of the random generator used for the map
+
+        Output:
+            numpy array of shadowing values in dB """
+
+    rng = np.random.default_rng(seed)
+
+    rho = np.exp(-resolution/decorrDistance) if decorrDistance > 0 else 0.0
+
+    #Innovations scaled so that every sample has unit variance (first sample starts stationary)
+    innovations = rng.standard_normal(numOfSamples)
+    innovations[1:] *= np.sqrt(1 - rho**2)
+
+    samples = filterAR1(innovations, rho)
+
+    return mean + std * samples
+
+
+#------------------------------------------------------------------
+# Function to get shadowing map from cache (or generate it)
+#------------------------------------------------------------------
+def getShadowMapPath(cacheDir, numOfSamples, resolution, mean, std, decorrDistance, seed):
+    """ Returns the path of cache file of the map with these parameters """
+
+    key = repr((SHADOW_MAP_VERSION, int(numOfSamples), float(resolution), float(mean), float(std), \
+                float(decorrDistance), int(seed)))
+
+    return os.path.join(cacheDir, 'shadow_{0}.npy'.format(hashlib.sha1(key.encode()).hexdigest()[:16]))
+
+
+def getShadowMap(numOfSamples, resolution = cfg.SHADOWING_RESOLUTION, mean = cfg.SHADOWING_MEAN, \
+                 std = cfg.SHADOWING_STD, decorrDistance = cfg.SHADOWING_DECORR_DISTANCE, seed = 0, \
+                 cacheDir = cfg.SHADOW_MAP_CACHE_DIR):
+    """ Same as generateShadowMap, but the map is loaded from 'cacheDir' if it was generated
+        before with the same parameters and seed (and saved there if not).
+        cacheDir = None turns off the cache """
+
+    if cacheDir is None:
+        return generateShadowMap(numOfSamples, resolution, mean, std, decorrDistance, seed)
+
+    filepath = getShadowMapPath(cacheDir, numOfSamples, resolution, mean, std, decorrDistance, seed)
+
+    if os.path.exists(filepath):
+        return np.load(filepath)
+
+    samples = generateShadowMap(numOfSamples, resolution, mean, std, decorrDistance, seed)
+
+    #Write to a temporary file first, so that parallel runs never read a partly written map
+    os.makedirs(cacheDir, exist_ok=True)
+    tempPath = '{0}.{1}.tmp.npy'.format(filepath[:-4], os.getpid())
+
+    np.save(tempPath, samples)
+    os.replace(tempPath, filepath)
+
+    return samples
+
+
+#------------------------------------------------------------------
+# Benchmark and check of correlation
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Generate a shadowing map and check its correlation')
+    parser.add_argument('--length', type=float, default=100000, help='Length of the road in meters (default: %(default)s)')
+    parser.add_argument('--resolution', type=float, default=1, help='Distance between samples in meters (default: %(default)s)')
+    parser.add_argument('--decorr', type=float, default=cfg.SHADOWING_DECORR_DISTANCE, \
+                        help='Decorrelation distance in meters (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-dir', dest='cacheDir', default=cfg.SHADOW_MAP_CACHE_DIR)
+
+    args = parser.parse_args()
+
+    numOfSamples = int(args.length//args.resolution)
+
+    tStart = time.perf_counter()
+    samples = generateShadowMap(numOfSamples, args.resolution, decorrDistance = args.decorr, seed = args.seed)
+    print('Generated {0} samples in {1:.3f} seconds'.format(numOfSamples, time.perf_counter() - tStart))
+
+    getShadowMap(numOfSamples, args.resolution, decorrDistance = args.decorr, seed = args.seed, cacheDir = args.cacheDir)
+
+    tStart = time.perf_counter()
+    getShadowMap(numOfSamples, args.resolution, decorrDistance = args.decorr, seed = args.seed, cacheDir = args.cacheDir)
+    print('Loaded from cache in {0:.3f} seconds'.format(time.perf_counter() - tStart))
+
+    print('mean = {0:.3f} dB, std = {1:.3f} dB'.format(np.mean(samples), np.std(samples)))
+
+    centered = (samples - np.mean(samples))/np.std(samples)
+
+    for distance in (args.decorr/2, args.decorr, 2*args.decorr):
+        lag = int(round(distance/args.resolution))
+        if 0 < lag < numOfSamples:
+            print('correlation at {0:g} m = {1:.3f} (expected {2:.3f})'.format(lag*args.resolution, \
+                  np.mean(centered[:-lag]*centered[lag:]), np.exp(-lag*args.resolution/args.decorr)))
@@ -0,0 +1,304 @@
+###################################################################
+# simulation.py
+#
+# This python module contains the functions to set up and run a
+# complete simulation without any user interaction, so that it can
+# be called from scripts and run many times in one process
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import basestation as bstn
+import antennaPattern as antenna
+import tickEngine
+import eventEngine
+import lockstepEngine
+import sgnlIxTrace as trace
+import kpiRecorder as kpi
+import trafficTrace
+import config as cfg
+import numpy as np
+import os
+import time
+import warnings
+
+
+#------------------------------------------------------------------
+# Class to hold the result of a simulation
+#------------------------------------------------------------------
+class SimulationResult:
+
+    def __init__(self, users, tilt, hours, seed, engine, bstnDataBase, sgnlIxAccumulator, kpiRecorder, elapsedTime):
+
+        self.users = users                    # Total number of users
+        self.tilt = tilt                      # Antenna tilt (in degrees)
+        self.hours = hours                    # Total simulation time (in Hrs)
+        self.seed = seed                      # seed of the random numbers (None if not seeded)
+        self.engine = engine                  # 'tick', 'event' or 'lockstep'
+        self.elapsedTime = elapsedTime        # wall clock time taken by simulation (in seconds)
+
+        #Statistics object of each base station with key as base station ID
+        self.stats = {bstnID: bstnDataBase[bstnID].stats for bstnID in bstnDataBase}
+
+        #Channels in use at the end of the simulation with key as base station ID
+        self.channelsInUse = {bstnID: cfg.CHANNELS_PER_SECTOR - bstnDataBase[bstnID].getFreeChanCount() \
+                              for bstnID in bstnDataBase}
+
+        #Count of S/I values in each class and road section (see util.SgnlIxAccumulator)
+        self.sgnlIxAccumulator = sgnlIxAccumulator
+        self.sgnlIxSummary = sgnlIxAccumulator.asDict()
+
+        #Snapshots of statistics and channels in use over time (see kpiRecorder.py). When the
+        #snapshots were streamed, they are in the file kpiRecorder.getStreamPath() (not in memory)
+        self.kpiRecorder = kpiRecorder
+
+
+#------------------------------------------------------------------
+# Function to create base stations
+#------------------------------------------------------------------
+def createBaseStations(tilt, numOfBstns = cfg.NUM_OF_BSTNS, bstnPositions = None):
+    """ This function creates the base station objects with the parameters from
+        config.py and the given tilt, placed along the road
+
+        Input:
+            1. tilt - Antenna tilt (in degrees)
+            2. numOfBstns - number of base stations, spaced evenly from one end of the
+                            road to the other (two stations are placed at the ends)
+            3. bstnPositions - optional list of positions of base stations along the road
+                               (in meters), used instead of numOfBstns
+
+        Output:
+            Dictionary of base station objects with key as ID ('A', 'B', ... or
+            'BS000', 'BS001', ... if there are more than 26 stations) """
+
+    if bstnPositions is None:
+        bstnPositions = np.linspace(0, cfg.ROAD_LENGTH, numOfBstns)
+
+    #1. Read vertical_pattern.txt file (once per process, curves of each tilt are cached)
+    vertDiscrmnData = antenna.loadAntennaPattern(cfg.VERTICAL_PATTERN_FILEPATH)
+
+    bstnDataBase = {}
+
+    for iBstn, position in enumerate(bstnPositions):
+    #{ Start of for loop
+        bstnID = bstn.getBstnID(iBstn, len(bstnPositions))
+
+        #2. Compute Shadowing values
+        shadowValues = bstn.createShadowValues(iBstn)
+
+        #3. Instatiate the base station object (EIRP bore sight calculation is done inside constructor)
+        bstnDataBase[bstnID] = bstn.BaseStation(bstnID, cfg.BSTN_HEIGHT, cfg.BSTN_LOCATION, cfg.TX_POWER, \
+                                                cfg.CONNECTOR_LOSSES, cfg.ANTENNA_GAIN, \
+                                                cfg.CHANNELS_PER_SECTOR, cfg.FREQUENCY, tilt, vertDiscrmnData, \
+                                                shadowValues, roadPosition = float(position))
+    #} End of for loop
+
+    return bstnDataBase
+
+
+#------------------------------------------------------------------
+# Function to run the simulation
+#------------------------------------------------------------------
+def runSimulation(users, tilt, hours, seed = None, engine = cfg.SIMULATION_ENGINE, plot = False, tracePath = None, \
+                  plotPrefix = None, plotFormat = 'png', printStats = cfg.PRINT_HOURLY_STATS, \
+                  kpiInterval = cfg.KPI_RECORD_INTERVAL, kpiPath = None, kpiStream = False, \
+                  numOfBstns = cfg.NUM_OF_BSTNS, numOfNeighbours = cfg.INTERFERENCE_NEIGHBOURS, \
+                  recordTrafficPath = None, replayTrafficPath = None, recordFades = True, bWarmStart = None):
+    """ This function runs a complete simulation and returns its result.
+
+        Input:
+            1. users - Total number of users
+            2. tilt - Antenna tilt (in degrees)
+            3. hours - Total simulation time (in Hrs)
+            4. seed - seed for the random numbers, runs with the same seed give the
+                      same result (default value = None, not seeded)
+            5. engine - 'tick' (fixed time steps) or 'event' (discrete events)
+            6. plot - boolean flag to say whether to plot S/I bar graph at the end
+            7. tracePath - optional path of binary trace file to which every S/I
+                           sample is written (see sgnlIxTrace.py)
+            8. plotPrefix - optional path prefix of image files to which S/I bar graphs
+                            are written without a display (<plotPrefix>_<bstn ID>.<plotFormat>)
+            9. plotFormat - 'png' or 'svg'
+            10. printStats - boolean flag to say whether to print the statistics table of
+                             base stations after every hour
+            11. kpiInterval - time between snapshots of statistics (in seconds)
+            12. kpiPath - optional CSV (.csv) or JSON Lines (.jsonl) file to which the
+                          snapshots are written
+            13. kpiStream - boolean flag to say whether to write the snapshots to kpiPath
+                            in batches while simulating (instead of at the end). Only the
+                            last batch is in memory, result.kpiRecorder then holds no
+                            snapshots (read the file with kpi.readKpiFile)
+            14. numOfBstns - number of base stations along the road
+            15. numOfNeighbours - number of strongest neighbour stations whose power is
+                                  summed as interference in S/I
+            16. recordTrafficPath - optional path of traffic trace file to which the call
+                                    requests (and fading values) are written (see trafficTrace.py)
+            17. replayTrafficPath - optional path of traffic trace file whose call requests
+                                    (and fading values) are used instead of random numbers
+            18. recordFades - boolean flag to say whether to record the fading values too
+            19. bWarmStart - boolean flag to say whether to start with calls in progress
+                             sampled in steady state (see warmStart.py, 'tick' engine only).
+                             None means WARM_START of config.py, which is ignored (with a
+                             warning) by runs that do not support warm start
+
+        Output:
+            SimulationResult object """
+
+    if engine not in ('tick', 'event'):
+        raise ValueError("engine must be 'tick' or 'event', got {0!r}".format(engine))
+
+    if recordTrafficPath is not None and replayTrafficPath is not None:
+        raise ValueError('traffic can not be recorded and replayed in the same run')
+
+    if engine == 'event' and (recordTrafficPath is not None or replayTrafficPath is not None):
+        raise ValueError("traffic traces are recorded and replayed by the 'tick' engine only")
+
+    bTrafficTrace = recordTrafficPath is not None or replayTrafficPath is not None
+
+    #Default of config.py applies only where warm start is supported, explicit True is checked below
+    if bWarmStart is None:
+        bWarmStart = cfg.WARM_START and engine == 'tick' and not bTrafficTrace
+
+        if cfg.WARM_START and not bWarmStart:
+            warnings.warn('WARM_START of config.py is ignored, warm start is supported by the tick engine ' \
+                          'without traffic traces only')
+
+    if engine == 'event' and bWarmStart:
+        raise ValueError("warm start is supported by the 'tick' engine only")
+
+    if bWarmStart and bTrafficTrace:
+        raise ValueError('warm start can not be used with traffic traces (call IDs would not match the trace)')
+
+    tStart = time.perf_counter()
+
+    bstnDataBase = createBaseStations(tilt, numOfBstns)
+
+    #Seed after creating base stations (shadowing values are generated with their own random generators)
+    if seed is not None:
+        np.random.seed(seed)
+
+    tTotal = int(hours*3600)  #Convert Hrs to sec
+
+    #Counts of S/I values for each bstn, class and road section
+    sgnlIxAccumulator = util.SgnlIxAccumulator(bstnDataBase.keys(), cfg.ROAD_LENGTH)
+
+    #Raw S/I samples are written to trace file only if asked for
+    sgnlIxTraceWriter = None
+    if tracePath is not None:
+        sgnlIxTraceWriter = trace.SgnlIxTraceWriter(tracePath, bstnDataBase.keys())
+
+    #Snapshots of statistics are kept in memory, or streamed to kpiPath
+    kpiRecorder = kpi.KpiRecorder(bstnDataBase.keys(), tTotal, kpiInterval, kpiPath if kpiStream else None)
+
+    #Call requests and fading values are drawn, recorded or replayed
+    traffic = None
+    if recordTrafficPath is not None:
+        traffic = trafficTrace.TrafficRecorder(recordTrafficPath, recordFades)
+    elif replayTrafficPath is not None:
+        traffic = trafficTrace.TrafficReplayer(replayTrafficPath)
+
+    try:
+        if engine == 'event':
+            eventEngine.runEventSimulation(users, bstnDataBase, tTotal, sgnlIxAccumulator, sgnlIxTrace = sgnlIxTraceWriter, \
+                                           kpiRecorder = kpiRecorder, printStats = printStats, \
+                                           numOfNeighbours = numOfNeighbours)
+        else:
+            tickEngine.runTickSimulation(users, bstnDataBase, tTotal, sgnlIxAccumulator, sgnlIxTraceWriter, \
+                                         kpiRecorder, printStats, numOfNeighbours, traffic, bWarmStart)
+    finally:
+        if traffic is not None:
+            traffic.close()
+
+        if sgnlIxTraceWriter is not None:
+            sgnlIxTraceWriter.close()
+
+        kpiRecorder.close()
+
+    #Streamed snapshots are already in kpiPath, they are not read back (memory stays bounded)
+    if kpiPath is not None and not kpiStream:
+        kpiRecorder.write(kpiPath)
+
+    result = SimulationResult(users, tilt, hours, seed, engine, bstnDataBase, sgnlIxAccumulator, kpiRecorder, \
+                              time.perf_counter() - tStart)
+
+    # Now plot S/I bar graph
+    if plotPrefix is not None:
+        util.saveSgnlIxInfo(sgnlIxAccumulator, cfg.ROAD_LENGTH, plotPrefix, plotFormat)
+
+    if plot:
+        util.plotSgnlIxInfo(sgnlIxAccumulator, cfg.ROAD_LENGTH)
+
+    return result
+
+
+#------------------------------------------------------------------
+# Function to run the simulation of many tilts on one traffic
+#------------------------------------------------------------------
+def runLockstepSimulation(users, tilts, hours, seed = None, kpiInterval = cfg.KPI_RECORD_INTERVAL, \
+                          numOfBstns = cfg.NUM_OF_BSTNS, numOfNeighbours = cfg.INTERFERENCE_NEIGHBOURS, \
+                          kpiPath = None, plotPrefix = None, plotFormat = 'png'):
+    """ This function runs the simulation of all the 'tilts' in lockstep (see lockstepEngine.py):
+        every tilt sees the same users, call requests, mobility and fading, so the
+        differences between the results are due to the tilt only.
+
+        Input:
+            1. users - Total number of users
+            2. tilts - list of antenna tilts (in degrees)
+            3. hours - Total simulation time (in Hrs)
+            4. seed - seed for the random numbers (default value = None, not seeded)
+            5. kpiInterval - time between snapshots of statistics (in seconds)
+            6. numOfBstns - number of base stations along the road
+            7. numOfNeighbours - number of strongest neighbour stations whose power is
+                                 summed as interference in S/I
+            8. kpiPath - optional path of KPI file, snapshots of each tilt are written
+                         to their own file (see getTiltPath)
+            9. plotPrefix - optional prefix of S/I bar graph files, the graphs of each
+                            tilt are saved with their own prefix (see getTiltPath)
+            10. plotFormat - image format of the saved graphs ('png' or 'svg')
+
+        Output:
+            List of SimulationResult objects (same order as tilts), elapsedTime is the
+            time of the whole run """
+
+    if cfg.WARM_START:
+        warnings.warn('WARM_START of config.py is ignored, the lockstep engine starts with an empty network')
+
+    tStart = time.perf_counter()
+
+    bstnDataBases = [createBaseStations(tilt, numOfBstns) for tilt in tilts]
+
+    if seed is not None:
+        np.random.seed(seed)
+
+    tTotal = int(hours*3600)  #Convert Hrs to sec
+
+    sgnlIxAccumulators = [util.SgnlIxAccumulator(bstnDataBase.keys(), cfg.ROAD_LENGTH) for bstnDataBase in bstnDataBases]
+    kpiRecorders = [kpi.KpiRecorder(bstnDataBase.keys(), tTotal, kpiInterval) for bstnDataBase in bstnDataBases]
+
+    lockstepEngine.runLockstepSimulation(users, bstnDataBases, tTotal, sgnlIxAccumulators, kpiRecorders, numOfNeighbours)
+
+    elapsedTime = time.perf_counter() - tStart
+
+    for tilt, sgnlIxAccumulator, kpiRecorder in zip(tilts, sgnlIxAccumulators, kpiRecorders):
+        if kpiPath is not None:
+            kpiRecorder.write(getTiltPath(kpiPath, tilt))
+
+        if plotPrefix is not None:
+            util.saveSgnlIxInfo(sgnlIxAccumulator, cfg.ROAD_LENGTH, getTiltPath(plotPrefix, tilt), plotFormat)
+
+    return [SimulationResult(users, tilt, hours, seed, 'lockstep', bstnDataBase, sgnlIxAccumulator, kpiRecorder, elapsedTime) \
+            for tilt, bstnDataBase, sgnlIxAccumulator, kpiRecorder in zip(tilts, bstnDataBases, sgnlIxAccumulators, kpiRecorders)]
+
+
+def getTiltPath(path, tilt):
+    """ Returns 'path' with the tilt added before the extension, e.g.
+        getTiltPath('kpi.csv', 3) = 'kpi_tilt3.csv' """
+
+    root, extension = os.path.splitext(path)
+
+    return '{0}_tilt{1:g}{2}'.format(root, tilt, extension)
@@ -11,91 +11,135 @@
 #
 ###################################################################
 from utilities import StatName
+import numpy as np
+
+
+def _statProperty(statName):
+    """ Read-only attribute giving the count of statName (keeps the old attribute names working) """
+
+    return property(lambda self: int(self._counts[statName.value]), \
+                    doc='Count of {0} (read-only)'.format(statName.name))
+
+
+#Attribute name of each statistic (order of asDict() and of the columns in result files)
+STAT_ATTRIBUTES = [('callAttempts',               StatName.CALL_ATTEMPTS),
+                   ('successCallEstablishment',   StatName.SUCCESSFUL_CALL_ESTBL),
+                   ('callEstblFailDueSignlStrnt', StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH),
+                   ('successCalls',               StatName.SUCCESSFUL_CALLS),
+                   ('successHandoffs',            StatName.SUCCESSFUL_HANDOFFS),
+                   ('handoffsFailed',             StatName.HANDOFF_FAILURE),
+                   ('handoffsIn',                 StatName.INCOMING_HANDOFF_RQTS),
+                   ('handoffsOut',                StatName.HANDOFF_ATTEMPTS_OUT),
+                   ('callDropDueSgnlStrength',    StatName.CALL_DROP_SIG_STRENGTH),
+                   ('callDropDueCapacity',        StatName.CALL_DROP_CAPACITY),
+                   ('blockDueCapacity',           StatName.CALL_BLOCK_CAPACITY),
+                   ('handoffInSuccess',           StatName.HANDOFF_RQTS_ACCEPTED),
+                   ('handoffInFail',              StatName.HANDOFF_RQTS_REJECTED)]
+
 
 class Statistics:
 
-    def __init__(self):
+    #Counts as read-only attributes, names are the same as in asDict()
+    callAttempts               = _statProperty(StatName.CALL_ATTEMPTS)
+    successCallEstablishment   = _statProperty(StatName.SUCCESSFUL_CALL_ESTBL)
+    callEstblFailDueSignlStrnt = _statProperty(StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH)
+    successCalls               = _statProperty(StatName.SUCCESSFUL_CALLS)
+    successHandoffs            = _statProperty(StatName.SUCCESSFUL_HANDOFFS)
+    handoffsFailed             = _statProperty(StatName.HANDOFF_FAILURE)
+    handoffsIn                 = _statProperty(StatName.INCOMING_HANDOFF_RQTS)
+    handoffsOut                = _statProperty(StatName.HANDOFF_ATTEMPTS_OUT)
+    callDropDueSgnlStrength    = _statProperty(StatName.CALL_DROP_SIG_STRENGTH)
+    callDropDueCapacity        = _statProperty(StatName.CALL_DROP_CAPACITY)
+    blockDueCapacity           = _statProperty(StatName.CALL_BLOCK_CAPACITY)
+    handoffInSuccess           = _statProperty(StatName.HANDOFF_RQTS_ACCEPTED)
+    handoffInFail              = _statProperty(StatName.HANDOFF_RQTS_REJECTED)
+
+    def __init__(self, counts = None):
+        """ All the statistics are kept in one integer array indexed by StatName.value
+
+            Input:
+                1. counts - initial counts (array of len(StatName) values),
+                            default value = None, all the statistics are zero """
+
+        self._counts = np.zeros(len(StatName), dtype=np.int64)
+
+        if counts is not None:
+            self._counts[:] = counts
+
+
+    def asDict(self):
+        """ Returns dictionary of all the statistics with attribute name as key """
 
-        #initialize all the statistics to zero
-        self.callAttempts               =  0
-        self.successCallEstablishment   =  0
-        self.callEstblFailDueSignlStrnt =  0
-        self.successCalls               =  0
-        self.successHandoffs            =  0
-        self.handoffsFailed             =  0
-        self.handoffsIn                 =  0
-        self.handoffsOut                =  0
-        self.callDropDueSgnlStrength    =  0
-        self.callDropDueCapacity        =  0
-        self.blockDueCapacity           =  0
-        self.handoffInSuccess           =  0
-        self.handoffInFail              =  0
+        return {attrName: int(self._counts[statName.value]) for attrName, statName in STAT_ATTRIBUTES}
+
+
+    def asArray(self):
+        """ Returns copy of the counts array (index is StatName.value) """
+
+        return self._counts.copy()
+
+
+    def getStat(self, statName):
+        return int(self._counts[statName.value])
 
 
     def incrStat(self, statName):
 
-        if statName == StatName.CALL_ATTEMPTS:
-            self.callAttempts += 1
-        elif statName == StatName.SUCCESSFUL_CALLS:
-            self.successCalls += 1
-        elif statName == StatName.SUCCESSFUL_CALL_ESTBL:
-            self.successCallEstablishment += 1
-        elif statName == StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH:
-            self.callEstblFailDueSignlStrnt += 1
-        elif statName == StatName.SUCCESSFUL_HANDOFFS:
-            self.successHandoffs += 1
-        elif statName == StatName.HANDOFF_FAILURE:
-            self.handoffsFailed += 1
-        elif statName == StatName.HANDOFF_ATTEMPTS_OUT:
-            self.handoffsOut += 1
-        elif statName == StatName.INCOMING_HANDOFF_RQTS:
-            self.handoffsIn += 1
-        elif statName == StatName.CALL_DROP_SIG_STRENGTH:
-            self.callDropDueSgnlStrength += 1  
-        elif statName == StatName.CALL_DROP_CAPACITY:
-            self.callDropDueCapacity += 1
-        elif statName == StatName.CALL_BLOCK_CAPACITY:
-            self.blockDueCapacity += 1
-        elif statName == StatName.HANDOFF_RQTS_ACCEPTED:
-            self.handoffInSuccess += 1
-        elif statName == StatName.HANDOFF_RQTS_REJECTED:
-            self.handoffInFail += 1
-        
+        self._counts[statName.value] += 1
         return
 
 
     def decrStat(self, statName):
 
-        if statName == StatName.CALL_ATTEMPTS:
-            self.callAttempts -= 1
-        elif statName == StatName.SUCCESSFUL_CALLS:
-            self.successCalls -= 1
-        elif statName == StatName.SUCCESSFUL_CALL_ESTBL:
-            self.successCallEstablishment -= 1
-        elif statName == StatName.CALL_ESTBL_FAIL_DUE_SIGNAL_STRENGTH:
-            self.callEstblFailDueSignlStrnt -= 1
-        elif statName == StatName.SUCCESSFUL_HANDOFFS:
-            self.successHandoffs -= 1
-        elif statName == StatName.HANDOFF_FAILURE:
-            self.handoffsFailed += 1
-        elif statName == StatName.HANDOFF_ATTEMPTS_OUT:
-            self.handoffsOut -= 1
-        elif statName == StatName.INCOMING_HANDOFF_RQTS:
-            self.handoffsIn -= 1
-        elif statName == StatName.CALL_DROP_SIG_STRENGTH:
-            self.callDropDueSgnlStrength -= 1  
-        elif statName == StatName.CALL_DROP_CAPACITY:
-            self.callDropDueCapacity -= 1
-        elif statName == StatName.CALL_BLOCK_CAPACITY:
-            self.blockDueCapacity -= 1
-        elif statName == StatName.HANDOFF_RQTS_ACCEPTED:
-            self.handoffInSuccess -= 1
-        elif statName == StatName.HANDOFF_RQTS_REJECTED:
-            self.handoffInFail -= 1
+        self._counts[statName.value] -= 1
+        return
+
+
+    def addStat(self, statName, count):
+        """ Adds 'count' to statName (count can be negative) """
+
+        self._counts[statName.value] += count
+        return
+
 
+    def addCounts(self, counts):
+        """ Adds the counts of many statistics at once
+
+            Input:
+                1. counts - array of len(StatName) values indexed by StatName.value,
+                            or dictionary with StatName as key and count as value """
+
+        if isinstance(counts, dict):
+            for statName, count in counts.items():
+                self._counts[statName.value] += count
+        else:
+            self._counts += np.asarray(counts, dtype=np.int64)
+
+        return
+
+
+    def addEvents(self, statValues):
+        """ Counts a batch of events, one event per element
+
+            Input:
+                1. statValues - array of StatName values (StatName.X.value) of the events """
+
+        np.add.at(self._counts, np.asarray(statValues, dtype=int), 1)
         return
 
 
+    def snapshot(self):
+        """ Returns a copy of the statistics at this time (Statistics object) """
+
+        return Statistics(self._counts)
+
+
+    def diff(self, earlier):
+        """ Returns the statistics counted since the 'earlier' snapshot (Statistics object) """
+
+        return Statistics(self._counts - earlier._counts)
+
+
     def printStats(self):
 
         print("|  CALL STATISTICS: ")
@@ -135,3 +179,33 @@ class Statistics:
 
         return
 
+
+
+#------------------------------------------------------------------
+# Function to count the events of many base stations at once
+#------------------------------------------------------------------
+def addStatEvents(bstnDataBase, statName, bstnIDs):
+    """ Increments statName once for every element of bstnIDs (one event per
+        element) on the base station with that ID. Events are counted per
+        base station with array operations and added in one step.
+
+        Input:
+            1. bstnDataBase - dictionary of base station objects with key as ID
+            2. statName - StatName of the events
+            3. bstnIDs - array of base station IDs of the events
+
+        Output:
+            Dictionary with base station ID as key and number of events as value """
+
+    if len(bstnIDs) == 0:
+        return {}
+
+    uniqueIDs, counts = np.unique(np.asarray(bstnIDs), return_counts=True)
+
+    eventCounts = {}
+
+    for bstnID, count in zip(uniqueIDs.tolist(), counts.tolist()):
+        bstnDataBase[bstnID].stats.addStat(statName, count)
+        eventCounts[bstnID] = count
+
+    return eventCounts
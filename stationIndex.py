@@ -0,0 +1,264 @@
+###################################################################
+# stationIndex.py
+#
+# This python module contains the declaration and definition of
+# StationIndex class, a spatial index of the base stations along
+# the road. Stations are sorted by their position, so the stations
+# near a mobile are found with a binary search (np.searchsorted)
+# instead of evaluating every station. The RSL tables of all the
+# stations are stacked in one array, so the RSL of any (mobile,
+# station) pairs is one array lookup. An upper envelope of the RSL
+# tables tells when a station outside the nearest ones could be
+# stronger, only those mobiles evaluate every station.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import numpy as np
+
+
+class StationIndex:
+
+    def __init__(self, bstnDataBase):
+        """ Constructor is called when instantiating the object. Stations must not be
+            changed (tilt, height etc..) after the index is built.
+
+            Input:
+                1. bstnDataBase - dictionary of base station objects with key as ID """
+
+        bstnList = sorted(bstnDataBase.values(), key=lambda bstnObj: bstnObj.getRoadPosition())
+
+        self._bstnList = bstnList                                           # stations sorted by position
+        self._bstnIDs = np.array([bstnObj.getID() for bstnObj in bstnList], dtype=object)
+        self._positions = np.array([bstnObj.getRoadPosition() for bstnObj in bstnList], dtype=float)
+        self._maxRanges = np.array([bstnObj.getMaxRange() for bstnObj in bstnList], dtype=float)
+
+        resolutions = {bstnObj.getTableResolution() for bstnObj in bstnList}
+        numOfCells = {len(bstnObj.getRSLTable()) for bstnObj in bstnList}
+
+        if len(resolutions) != 1 or len(numOfCells) != 1:
+            raise ValueError('All the base stations must have the same RSL table resolution and range')
+
+        self._tableResolution = resolutions.pop()
+        self._rslTables = np.stack([bstnObj.getRSLTable() for bstnObj in bstnList])   # (stations, cells, 2)
+
+        #Highest RSL of any station at any distance from the start of each cell onwards
+        cellMax = np.maximum(self._rslTables[..., 0], self._rslTables[..., 0] + self._rslTables[..., 1])
+        self._rslEnvelope = np.max(np.maximum.accumulate(cellMax[:, ::-1], axis=1)[:, ::-1], axis=0)  # (cells,)
+
+    def __len__(self):
+        return len(self._bstnList)
+
+    def getBstnIDs(self):
+        """ Returns numpy (object) array of station IDs in the order of the index """
+
+        return self._bstnIDs
+
+    def getBstn(self, index):
+        return self._bstnList[index]
+
+    def getPositions(self):
+        return self._positions
+
+    def getMaxRanges(self):
+        return self._maxRanges
+
+    def getTableResolution(self):
+        return self._tableResolution
+
+    def getRSLTables(self):
+        """ Returns the stacked RSL tables, array of shape (stations, cells, 2) """
+
+        return self._rslTables
+
+    def getMedianRSL(self, bstnIndex, positions):
+        """ Returns the RSL without fading at 'positions' from the stations 'bstnIndex'
+            (arrays of the same shape, or broadcastable). Same values as
+            BaseStation.getMedianRSL of each station """
+
+        bstnIndex = np.asarray(bstnIndex)
+        dstFromBstn = np.abs(np.asarray(positions) - self._positions[bstnIndex])
+
+        numOfCells = self._rslTables.shape[1]
+
+        cellIndex = np.minimum(dstFromBstn//self._tableResolution, numOfCells - 1).astype(int)
+        fraction = dstFromBstn/self._tableResolution - cellIndex
+
+        table = self._rslTables[bstnIndex, cellIndex]
+        medianRSL = table[..., 0] + fraction * table[..., 1]
+
+        return np.where(dstFromBstn > self._maxRanges[bstnIndex], -np.inf, medianRSL)
+
+    def getCandidates(self, positions, numOfCandidates):
+        """ Returns the stations near each position: the 'numOfCandidates' nearest
+            stations on each side of the mobile (fewer if there are not enough stations).
+            Cost is O(log(stations)) per mobile.
+
+            Input:
+                1. positions - array of mobile positions on the road
+                2. numOfCandidates - number of stations taken on each side
+
+            Output:
+                2-D array (mobiles x candidates) of station indices, each row sorted by
+                position of the station """
+
+        positions = np.asarray(positions, dtype=float)
+
+        windowSize = min(2*numOfCandidates, len(self._positions))
+
+        #Index of first station to the right of each mobile, window starts numOfCandidates before it
+        right = np.searchsorted(self._positions, positions)
+        start = np.clip(right - numOfCandidates, 0, len(self._positions) - windowSize)
+
+        return start[:, np.newaxis] + np.arange(windowSize)
+
+    def getRSLUpperBound(self, dstFromBstn):
+        """ Returns the highest RSL without fading which any station can give at
+            'dstFromBstn' meters or farther (-inf beyond the range of every station) """
+
+        dstFromBstn = np.asarray(dstFromBstn, dtype=float)
+
+        cellIndex = np.minimum(dstFromBstn//self._tableResolution, len(self._rslEnvelope) - 1).astype(int)
+
+        return np.where(dstFromBstn > np.max(self._maxRanges), -np.inf, self._rslEnvelope[cellIndex])
+
+    def getStrongest(self, positions, count, excludeIndex = None):
+        """ Returns the 'count' stations with the highest RSL without fading at each
+            position. They are looked for among the count+1 nearest stations on each
+            side (candidates from getCandidates). Nearest stations are not always the
+            strongest (shadowing, different heights or tx powers, antenna pattern), so
+            mobiles where a station outside the candidates could be stronger (see
+            getRSLUpperBound) evaluate every station
+
+            Input:
+                1. positions - array of mobile positions on the road
+                2. count - number of stations to return for each mobile
+                3. excludeIndex - optional array of one station index per mobile which is
+                                  not returned (e.g. the serving station)
+
+            Output:
+                2-D array (mobiles x count) of station indices, each row sorted by position
+                of the station (count is reduced if there are not enough stations) """
+
+        positions = np.asarray(positions, dtype=float)
+
+        if count <= 0:
+            return np.zeros((len(positions), 0), dtype=int)
+
+        #Usually the k strongest are among the k+1 nearest on each side (one may be excluded)
+        candidates = self.getCandidates(positions, count + 1)
+        medianRSL = self.getMedianRSL(candidates, positions[:, np.newaxis])
+
+        #Excluded station is set to NaN, which is sorted after every RSL (even -inf, out of range)
+        if excludeIndex is not None:
+            excludeIndex = np.asarray(excludeIndex)
+            medianRSL[candidates == excludeIndex[:, np.newaxis]] = np.nan
+            count = min(count, candidates.shape[1] - 1)
+        else:
+            count = min(count, candidates.shape[1])
+
+        if count <= 0:
+            return np.zeros((len(positions), 0), dtype=int)
+
+        if count == candidates.shape[1]:
+            return candidates
+
+        #Columns of the strongest stations, kept in the order of the candidates (by position)
+        columns = np.sort(np.argpartition(-medianRSL, count - 1, axis=1)[:, :count], axis=1)
+        strongest = np.take_along_axis(candidates, columns, axis=1)
+
+        if candidates.shape[1] == len(self._positions):
+            return strongest        #candidates are all the stations
+
+        #Stations outside the candidates are at least as far as the nearest one outside on each side
+        weakest = np.min(np.take_along_axis(medianRSL, columns, axis=1), axis=1)
+
+        left, right = candidates[:, 0] - 1, candidates[:, -1] + 1
+        dstOutside = np.minimum(np.where(left >= 0, positions - self._positions[np.maximum(left, 0)], np.inf), \
+                                np.where(right < len(self._positions), \
+                                         self._positions[np.minimum(right, len(self._positions) - 1)] - positions, np.inf))
+
+        bUnsure = self.getRSLUpperBound(dstOutside) > weakest
+
+        if np.any(bUnsure):
+            #Evaluate every station for these mobiles
+            allIndex = np.arange(len(self._positions))
+            allRSL = self.getMedianRSL(allIndex[np.newaxis, :], positions[bUnsure, np.newaxis])
+
+            if excludeIndex is not None:
+                allRSL[allIndex[np.newaxis, :] == excludeIndex[bUnsure, np.newaxis]] = np.nan
+
+            strongest[bUnsure] = np.sort(np.argpartition(-allRSL, count - 1, axis=1)[:, :count], axis=1)
+
+        return strongest
+
+
+class StationIndexStack:
+
+    def __init__(self, stationIndices):
+        """ Stacks the RSL tables of K configurations of the same stations (same IDs and
+            positions, different tilt, height etc..), so that the RSL of all the
+            configurations is one array lookup
+
+            Input:
+                1. stationIndices - list of StationIndex objects, one per configuration """
+
+        self._stationIndices = list(stationIndices)
+
+        first = self._stationIndices[0]
+
+        for stationIdx in self._stationIndices[1:]:
+            if list(stationIdx.getBstnIDs()) != list(first.getBstnIDs()) or \
+               not np.array_equal(stationIdx.getPositions(), first.getPositions()) or \
+               stationIdx.getTableResolution() != first.getTableResolution() or \
+               stationIdx.getRSLTables().shape != first.getRSLTables().shape:
+                raise ValueError('All the configurations must have the same stations, positions and RSL table size')
+
+        self._positions = first.getPositions()
+        self._tableResolution = first.getTableResolution()
+        self._rslTables = np.stack([stationIdx.getRSLTables() for stationIdx in self._stationIndices])  # (configs, stations, cells, 2)
+        self._maxRanges = np.stack([stationIdx.getMaxRanges() for stationIdx in self._stationIndices])  # (configs, stations)
+
+    def __len__(self):
+        return len(self._stationIndices)
+
+    def getStationIndex(self, configIndex):
+        return self._stationIndices[configIndex]
+
+    def getStrongest(self, positions, count):
+        """ Returns the 'count' strongest stations of every configuration at each position
+            (StationIndex.getStrongest of each configuration)
+
+            Output:
+                3-D array (configs x mobiles x count) of station indices """
+
+        return np.stack([stationIdx.getStrongest(positions, count) for stationIdx in self._stationIndices])
+
+    def getMedianRSL(self, bstnIndex, positions):
+        """ Returns the RSL without fading of every configuration
+
+            Input:
+                1. bstnIndex - array of station indices of shape (configs, ...)
+                2. positions - array of positions broadcastable to bstnIndex.shape[1:]
+
+            Output:
+                array of RSL values of the same shape as bstnIndex """
+
+        bstnIndex = np.asarray(bstnIndex)
+        configIndex = np.arange(len(self)).reshape((-1,) + (1,)*(bstnIndex.ndim - 1))
+
+        dstFromBstn = np.abs(np.asarray(positions) - self._positions[bstnIndex])
+
+        numOfCells = self._rslTables.shape[2]
+
+        cellIndex = np.minimum(dstFromBstn//self._tableResolution, numOfCells - 1).astype(int)
+        fraction = dstFromBstn/self._tableResolution - cellIndex
+
+        table = self._rslTables[configIndex, bstnIndex, cellIndex]
+        medianRSL = table[..., 0] + fraction * table[..., 1]
+
+        return np.where(dstFromBstn > self._maxRanges[configIndex, bstnIndex], -np.inf, medianRSL)
@@ -0,0 +1,201 @@
+###################################################################
+# sweep.py
+#
+# This python module runs a parameter sweep (grid of tilts, number
+# of users, simulation times and replications) on all the cores
+# using a process pool and collects the results in one table
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import report
+import config as cfg
+import numpy as np
+import concurrent.futures
+import itertools
+import argparse
+import csv
+import os
+
+
+SGNL_IX_CLASSES = ['lt5dB', '5to10dB', 'gt10dB']  # Names of S/I classes (same order as binSgnlIxInfo)
+
+
+#------------------------------------------------------------------
+# Function to build the grid of sweep points
+#------------------------------------------------------------------
+def buildSweepGrid(tilts, users, hours, replications = 1, seed = 0):
+    """ This function builds the list of sweep points for all the combinations
+        of tilts, users, hours and replications. Every point gets its own seed
+        spawned from 'seed', so that random numbers of the runs are independent
+        and the whole sweep is reproducible.
+
+        Input:
+            1. tilts - list of antenna tilts (in degrees)
+            2. users - list of number of users
+            3. hours - list of simulation times (in Hrs)
+            4. replications - number of runs for each combination
+            5. seed - root seed of the sweep
+
+        Output:
+            List of dictionaries with keys tilt, users, hours, replication and seed """
+
+    sweepGrid = []
+
+    for tilt, numOfUsers, tTotal, replication in itertools.product(tilts, users, hours, range(replications)):
+        #Seed depends only on root seed and parameters of the point (not on the position in grid),
+        #so the points keep their seeds when the grid is extended
+        seedSeq = np.random.SeedSequence(seed, spawn_key=(int(round(tilt*1e6)), numOfUsers, \
+                                                          int(round(tTotal*1e6)), replication))
+
+        sweepGrid.append({'tilt': tilt, 'users': numOfUsers, 'hours': tTotal, \
+                          'replication': replication, 'seed': int(seedSeq.generate_state(1)[0])})
+
+    return sweepGrid
+
+
+#------------------------------------------------------------------
+# Function to run one sweep point (executed in worker process)
+#------------------------------------------------------------------
+def runSweepPoint(point, engine = cfg.SIMULATION_ENGINE):
+    """ Runs the simulation for one sweep point and returns one row of the
+        result table (dictionary) with the sweep parameters, stats of every
+        base station and the total count of each S/I class per base station """
+
+    #Hourly stats tables are not needed in a sweep
+    result = sim.runSimulation(point['users'], point['tilt'], point['hours'], point['seed'], engine, printStats = False)
+
+    row = dict(point)
+    row['engine'] = engine
+    row['elapsedTime'] = result.elapsedTime
+
+    for bstnID in sorted(result.stats):
+        for statName, value in result.stats[bstnID].asDict().items():
+            row['{0}_{1}'.format(bstnID, statName)] = value
+
+        for sgnlIxClass, counts in zip(SGNL_IX_CLASSES, result.sgnlIxSummary[bstnID]):
+            row['{0}_sgnlIx_{1}'.format(bstnID, sgnlIxClass)] = int(np.sum(counts))
+
+    return row
+
+
+#------------------------------------------------------------------
+# Function to run the sweep
+#------------------------------------------------------------------
+def runSweep(sweepGrid, outputPath = None, workers = None, engine = cfg.SIMULATION_ENGINE, progress = True):
+    """ This function runs all the points of the sweep grid on a process pool.
+
+        Input:
+            1. sweepGrid - list of sweep points (see buildSweepGrid)
+            2. outputPath - CSV file to which every row is appended as soon as the run
+                            is complete. Points already present in the file (same tilt,
+                            users, hours, replication, seed and engine) are not run again,
+                            so an interrupted sweep can be continued. ValueError is raised
+                            if the file has rows of another engine (results of the engines
+                            are not mixed in one file).
+            3. workers - number of worker processes (default value = None, all the cores)
+            4. engine - 'tick' or 'event'
+            5. progress - boolean flag to say whether to print the progress
+
+        Output:
+            List of rows (dictionaries), one per sweep point (in completion order, rows
+            read back from outputPath come first and have string values) """
+
+    rows = []
+    doneKeys = set()
+
+    #1. Read the points already done from results file
+    if outputPath is not None and os.path.exists(outputPath):
+        with open(outputPath, newline='') as fp:
+            for row in csv.DictReader(fp):
+                if row.get('engine') != engine:
+                    raise ValueError('{0} has results of engine {1!r}, can not resume it with engine {2!r}' \
+                                     .format(outputPath, row.get('engine'), engine))
+
+                rows.append(row)
+                doneKeys.add(_pointKey(row, engine))
+
+    pendingPoints = [point for point in sweepGrid if _pointKey(point, engine) not in doneKeys]
+
+    totalPoints = len(pendingPoints)
+    numOfDone = 0
+
+    if progress and doneKeys:
+        print('Skipping {0} points already in {1}'.format(len(sweepGrid) - totalPoints, outputPath))
+
+    #2. Run the remaining points on the pool
+    writer = None
+    fp = None
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(runSweepPoint, point, engine) for point in pendingPoints]
+
+            for future in concurrent.futures.as_completed(futures):
+                row = future.result()
+                rows.append(row)
+                numOfDone += 1
+
+                if outputPath is not None:
+                    if writer is None:
+                        bNewFile = not os.path.exists(outputPath) or os.path.getsize(outputPath) == 0
+                        fp = open(outputPath, 'a', newline='')
+                        writer = csv.DictWriter(fp, fieldnames=list(row.keys()))
+                        if bNewFile:
+                            writer.writeheader()
+
+                    writer.writerow(row)
+                    fp.flush()
+
+                if progress:
+                    print('[{0}/{1}] tilt = {2}, users = {3}, hours = {4}, replication = {5} done in {6:.2f} seconds'.format( \
+                          numOfDone, totalPoints, row['tilt'], row['users'], row['hours'], row['replication'], row['elapsedTime']))
+    finally:
+        if fp is not None:
+            fp.close()
+
+    return rows
+
+
+def _pointKey(point, engine):
+    """ Key to identify a sweep point run with 'engine' (values from CSV file are strings,
+        rows of the file have their own engine) """
+
+    return (float(point['tilt']), int(point['users']), float(point['hours']), \
+            int(point['replication']), int(point['seed']), point.get('engine', engine))
+
+
+#------------------------------------------------------------------
+# Sweep execution starts from here!!
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Run the simulation for a grid of tilts, users and simulation times')
+
+    parser.add_argument('--tilts', type=float, nargs='+', required=True, help='Antenna tilts (in degrees)')
+    parser.add_argument('--users', type=int, nargs='+', required=True, help='Number of users')
+    parser.add_argument('--hours', type=float, nargs='+', required=True, help='Simulation times (in Hrs)')
+    parser.add_argument('--replications', type=int, default=1, help='Runs for each combination (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Root seed of the sweep (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: all cores)')
+    parser.add_argument('--engine', choices=['tick', 'event'], default=cfg.SIMULATION_ENGINE, \
+                        help='Simulation engine (default: %(default)s)')
+    parser.add_argument('--output', default='sweep_results.csv', help='Results file (default: %(default)s)')
+    parser.add_argument('--report', dest='reportDir', default=None, help='Write summary plots of the sweep to this directory')
+
+    args = parser.parse_args()
+
+    grid = buildSweepGrid(args.tilts, args.users, args.hours, args.replications, args.seed)
+
+    try:
+        rows = runSweep(grid, args.output, args.workers, args.engine)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.reportDir is not None:
+        report.renderSweepReport(rows, args.reportDir)
@@ -0,0 +1,91 @@
+###################################################################
+# test_antennaPattern.py
+#
+# This python module checks that the cached discrimination curves of
+# AntennaPattern (getDiscrimination, getDiscriminationGrid and
+# calculateEIRP) give the same values as the original per-distance
+# util.calculateEIRP, at several tilts and for mobiles below and
+# above the antenna. Run with
+#       python -m pytest test_antennaPattern.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import antennaPattern as antenna
+import utilities as util
+import config as cfg
+import numpy as np
+import unittest
+
+
+TILTS = [0, 2.5, 3, 8, 15]
+BORE_SIGHT_EIRP = 57
+DISTANCES = np.concatenate([[0.5, 1, 14.2, 15, 49, 50, 51.7], np.geomspace(2, 6000, 400)])
+MOBILE_HEIGHTS = [cfg.MOBILE_HEIGHT, 120]     # below and above the antenna (negative elevation)
+
+
+def findDirectEIRP(tilt, Hm, distances, vertDiscrmData):
+    """ Returns util.calculateEIRP at each distance, called distance by distance """
+
+    return np.array([util.calculateEIRP(BORE_SIGHT_EIRP, tilt, cfg.BSTN_HEIGHT, Hm, dst, vertDiscrmData) \
+                     for dst in distances])
+
+
+class TestAntennaPattern(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vertDiscrmData = util.readVertDiscrmData(cfg.VERTICAL_PATTERN_FILEPATH)
+
+    def assertSameValues(self, valuesA, valuesB):
+        self.assertTrue(np.allclose(valuesA, valuesB, rtol=0, atol=1e-9))
+
+    def test_calculateEIRPMatchesUtilities(self):
+        pattern = antenna.AntennaPattern(self.vertDiscrmData)
+
+        for tilt in TILTS:
+            for Hm in MOBILE_HEIGHTS:
+                with self.subTest(tilt=tilt, Hm=Hm):
+                    expected = findDirectEIRP(tilt, Hm, DISTANCES, self.vertDiscrmData)
+
+                    self.assertSameValues(pattern.calculateEIRP(BORE_SIGHT_EIRP, tilt, cfg.BSTN_HEIGHT, Hm, DISTANCES), \
+                                          expected)
+
+    def test_discriminationGridMatchesUtilities(self):
+        pattern = antenna.AntennaPattern(self.vertDiscrmData)
+
+        for Hm in MOBILE_HEIGHTS:
+            with self.subTest(Hm=Hm):
+                gamma = np.rad2deg( np.arctan2((cfg.BSTN_HEIGHT - Hm), DISTANCES) )
+                grid = pattern.getDiscriminationGrid(TILTS, gamma)
+
+                self.assertEqual(grid.shape, (len(TILTS), len(DISTANCES)))
+
+                for row, tilt in enumerate(TILTS):
+                    self.assertSameValues(BORE_SIGHT_EIRP - grid[row], \
+                                          findDirectEIRP(tilt, Hm, DISTANCES, self.vertDiscrmData))
+
+    def test_cachedCurveIsReused(self):
+        pattern = antenna.AntennaPattern(self.vertDiscrmData, cacheSize = 2)
+        gamma = np.linspace(-90, 90, 181)
+
+        first = pattern.getDiscrimination(3, gamma)
+        pattern.getDiscrimination(8, gamma)
+        self.assertEqual(pattern.getCacheInfo().misses, 2)
+
+        #Same tilt again is taken from the cache and gives the same curve
+        self.assertTrue(np.array_equal(pattern.getDiscrimination(3, gamma), first))
+        self.assertEqual(pattern.getCacheInfo().hits, 1)
+
+        #Least recently used tilt (8) is removed when a third tilt is added
+        pattern.getDiscrimination(15, gamma)
+        pattern.getDiscrimination(8, gamma)
+        self.assertEqual(pattern.getCacheInfo().misses, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+###################################################################
+# test_basestation.py
+#
+# This python module checks the precomputed RSL table of BaseStation
+# (getMedianRSL) against the direct calculation of the original
+# project: util.calculateEIRP - util.okamuraHata + shadow value of
+# the 20 m segment. Values must be the same at the knots of the table,
+# close between them, and -inf beyond maxRange. Run with
+#       python -m pytest test_basestation.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import utilities as util
+import config as cfg
+import numpy as np
+import unittest
+
+
+TILTS = [0, 3, 8]
+NUM_OF_DISTANCES = 2000
+SEED = 656
+
+#Largest difference (in dB) allowed between the knots of the table, for each resolution (in meters).
+#Interpolation is linear in distance, so the error is largest close to the bstn where the path loss
+#curves most, and where a cell spans a corner of the antenna pattern
+TOLERANCE_NEAR = {1: 0.5, 5: 1.5}
+TOLERANCE_FAR = 1e-3               # beyond FAR_DISTANCE
+FAR_DISTANCE = 1000                # In meters
+
+
+def findDirectRSL(bstn, dstFromBstn):
+    """ Returns the RSL without fading at each distance (in meters along the road), computed
+        point by point as in the original project (no table) """
+
+    actualDistances = np.sqrt( (bstn.getLocation() ** 2) + (dstFromBstn ** 2) )
+
+    eirp = np.array([util.calculateEIRP(bstn.getBoreSightEIRP(), bstn.getTilt(), bstn.getHeight(), \
+                                        cfg.MOBILE_HEIGHT, dst, bstn.getVertDiscrmnData()) for dst in actualDistances])
+
+    pLoss = util.okamuraHata(actualDistances/1000, bstn.getOperationalFreq(), bstn.getHeight(), cfg.MOBILE_HEIGHT)
+
+    shadowValues = bstn.getShadowValues()
+    shadowIndex = np.minimum((dstFromBstn//cfg.SHADOWING_RESOLUTION).astype(int), len(shadowValues) - 1)
+
+    return eirp - pLoss + shadowValues[shadowIndex]
+
+
+class TestRSLTable(unittest.TestCase):
+
+    def test_matchesDirectAtKnots(self):
+        for tilt in TILTS:
+            for tableResolution in TOLERANCE_NEAR:
+                with self.subTest(tilt=tilt, tableResolution=tableResolution):
+                    bstn = sim.createBaseStations(tilt)['A']
+                    bstn.setTableResolution(tableResolution)
+
+                    distances = np.arange(0, bstn.getMaxRange(), tableResolution, dtype=float)
+
+                    self.assertTrue(np.allclose(bstn.getMedianRSL(distances), findDirectRSL(bstn, distances), \
+                                                rtol=0, atol=1e-9))
+
+    def test_matchesDirectBetweenKnots(self):
+        distances = np.random.RandomState(SEED).uniform(0, cfg.BSTN_MAX_RANGE, NUM_OF_DISTANCES)
+        bFar = distances > FAR_DISTANCE
+
+        for tilt in TILTS:
+            for tableResolution, tolerance in TOLERANCE_NEAR.items():
+                with self.subTest(tilt=tilt, tableResolution=tableResolution):
+                    bstn = sim.createBaseStations(tilt)['A']
+                    bstn.setTableResolution(tableResolution)
+
+                    error = np.abs(bstn.getMedianRSL(distances) - findDirectRSL(bstn, distances))
+
+                    self.assertLessEqual(np.max(error), tolerance)
+                    self.assertLessEqual(np.max(error[bFar]), TOLERANCE_FAR)
+
+    def test_outOfRange(self):
+        bstn = sim.createBaseStations(3)['A']
+        maxRange = bstn.getMaxRange()
+
+        self.assertTrue(np.isfinite(bstn.getMedianRSL(maxRange)))
+        self.assertTrue(np.all(np.isneginf(bstn.getMedianRSL(np.array([maxRange + 0.5, maxRange + 20, 2*maxRange])))))
+
+
+if __name__ == '__main__':
+    unittest.main()
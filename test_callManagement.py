@@ -0,0 +1,111 @@
+###################################################################
+# test_callManagement.py
+#
+# This python module checks that the vectorized RSL functions of
+# callManagement (findRSLBatch, findRSLByIndex, findNeighbourRSLBatch
+# and findCallCandidatesBatch) give the same RSL values as findRSL
+# called mobile by mobile with the same seed (same fading values).
+# Run with
+#       python -m pytest test_callManagement.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import callManagement as callMngt
+import stationIndex as sidx
+import mobile
+import config as cfg
+import numpy as np
+import unittest
+
+
+NUM_OF_MOBILES = 200
+SEED = 656
+
+
+def findRSLOneByOne(positions, bstns):
+    """ Returns the RSL values of findRSL at each position from the base station of the
+        same index in 'bstns' (called in order, one fading value per call) """
+
+    rsl = []
+
+    for position, bstn in zip(positions, bstns):
+        mobl = mobile.Mobile(0, cfg.MOBILE_HEIGHT, cfg.HANDOFF_MARGIN, cfg.RX_THRESHOLD)
+        mobl.setPosition(position)
+        rsl.append(callMngt.findRSL(mobl, bstn))
+
+    return np.array(rsl)
+
+
+class TestBatchRSL(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bstnDataBase = sim.createBaseStations(3, 5)
+        cls.stationIdx = sidx.StationIndex(cls.bstnDataBase)
+
+        rng = np.random.RandomState(SEED)
+        cls.positions = rng.uniform(0, cfg.ROAD_LENGTH, NUM_OF_MOBILES)
+        cls.bstnIndex = rng.randint(len(cls.stationIdx), size=NUM_OF_MOBILES)
+
+    def assertSameRSL(self, rslA, rslB):
+        self.assertTrue(np.all((rslA == rslB) | np.isclose(rslA, rslB, rtol=0, atol=1e-9)))
+
+    def test_findRSLBatch(self):
+        bstns = [self.stationIdx.getBstn(index) for index in self.bstnIndex]
+
+        np.random.seed(SEED)
+        expected = findRSLOneByOne(self.positions, bstns)
+
+        np.random.seed(SEED)
+        rsl = callMngt.findRSLBatch(self.positions, [bstn.getID() for bstn in bstns], self.bstnDataBase)
+
+        self.assertSameRSL(rsl, expected)
+
+    def test_findRSLByIndex(self):
+        bstns = [self.stationIdx.getBstn(index) for index in self.bstnIndex]
+
+        np.random.seed(SEED)
+        expected = findRSLOneByOne(self.positions, bstns)
+
+        np.random.seed(SEED)
+        rsl = callMngt.findRSLByIndex(self.stationIdx, self.bstnIndex, self.positions)
+
+        self.assertSameRSL(rsl, expected)
+
+    def test_findNeighbourRSLBatch(self):
+        serverIndex = self.stationIdx.getStrongest(self.positions, 1)[:, 0]
+
+        np.random.seed(SEED)
+        neighbourIndex, rsl = callMngt.findNeighbourRSLBatch(self.stationIdx, self.positions, serverIndex, 2)
+
+        self.assertTrue(np.array_equal(neighbourIndex, self.stationIdx.getStrongest(self.positions, 2, serverIndex)))
+
+        #Fading values are drawn row by row (mobile by mobile)
+        np.random.seed(SEED)
+        expected = findRSLOneByOne(np.repeat(self.positions, 2), \
+                                   [self.stationIdx.getBstn(index) for index in neighbourIndex.ravel()])
+
+        self.assertSameRSL(rsl, expected.reshape(rsl.shape))
+
+    def test_findCallCandidatesBatch(self):
+        np.random.seed(SEED)
+        candidateIndex, rsl = callMngt.findCallCandidatesBatch(self.stationIdx, self.positions)
+
+        self.assertTrue(np.array_equal(candidateIndex, self.stationIdx.getStrongest(self.positions, 2)))
+
+        #Fading values are drawn for the first candidate of all the mobiles, then for the second
+        np.random.seed(SEED)
+        expected = findRSLOneByOne(np.tile(self.positions, 2), \
+                                   [self.stationIdx.getBstn(index) for index in candidateIndex.T.ravel()])
+
+        self.assertSameRSL(rsl, expected.reshape(rsl.shape[::-1]).T)
+
+
+if __name__ == '__main__':
+    unittest.main()
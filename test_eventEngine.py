@@ -0,0 +1,44 @@
+###################################################################
+# test_eventEngine.py
+#
+# This python module checks that the discrete event engine gives
+# the same statistics as the tick engine: blocking, drop and handoff
+# failure rates (and the number of call requests) of seeded runs of
+# both engines must agree within their confidence interval. Run with
+#       python -m pytest test_eventEngine.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import test_lockstepEngine
+import unittest
+
+
+NUM_OF_USERS = 600
+TILT = 3
+HOURS = 0.25
+SEEDS = range(8)
+
+
+class TestEventEngine(unittest.TestCase):
+
+    def test_matchesTickEngine(self):
+        kpis = {'tick': [], 'event': []}
+
+        for seed in SEEDS:
+            for engine in kpis:
+                result = sim.runSimulation(NUM_OF_USERS, TILT, HOURS, seed, engine, printStats = False)
+                kpis[engine].append(test_lockstepEngine.getKpis(result))
+
+        for name in kpis['tick'][0]:
+            test_lockstepEngine.assertSameMean(self, [values[name] for values in kpis['tick']], \
+                                               [values[name] for values in kpis['event']], name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+###################################################################
+# test_fading.py
+#
+# This python module checks that the fading values drawn with the
+# inverse CDF sampler (utilities.rayleighFadingInvCDF) follow the
+# distribution of the original sampler (utilities.rayleighFading)
+# and its closed form CDF (utilities.fadeCDF). Run with
+#       python -m pytest test_fading.py   or   python test_fading.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import numpy as np
+import unittest
+
+
+SAMPLE_SIZE = 200000          # fading values drawn from each sampler
+KS_COEFFICIENT = 1.949        # c(alpha) of Kolmogorov-Smirnov critical value for alpha = 0.001
+QUANTILES = [0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def ksStatistic(samplesA, samplesB):
+    """ Returns the two-sample Kolmogorov-Smirnov statistic (largest distance between
+        the empirical CDFs of the two samples) """
+
+    samplesA, samplesB = np.sort(samplesA), np.sort(samplesB)
+    values = np.concatenate((samplesA, samplesB))
+
+    cdfA = np.searchsorted(samplesA, values, side='right')/len(samplesA)
+    cdfB = np.searchsorted(samplesB, values, side='right')/len(samplesB)
+
+    return np.max(np.abs(cdfA - cdfB))
+
+
+def ksCriticalValue(sizeA, sizeB):
+    """ Returns the critical value of the two-sample KS statistic (alpha = 0.001).
+        With sizeB = inf it is the critical value of the one-sample test """
+
+    return KS_COEFFICIENT * np.sqrt(1/sizeA + 1/sizeB)
+
+
+def fadeQuantile(probability):
+    """ Returns the fading value (in dB) at which util.fadeCDF equals 'probability',
+        found with bisection """
+
+    low, high = -100.0, 30.0
+
+    for iCount in range(100):
+        mid = (low + high)/2
+
+        if util.fadeCDF(mid) < probability:
+            low = mid
+        else:
+            high = mid
+
+    return (low + high)/2
+
+
+class TestFadingSampler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        np.random.seed(656)
+        cls.invCDFSamples = util.rayleighFadingInvCDF(SAMPLE_SIZE)
+        cls.originalSamples = util.rayleighFading(SAMPLE_SIZE)
+
+    def test_matchesOriginalSampler(self):
+        statistic = ksStatistic(self.invCDFSamples, self.originalSamples)
+
+        self.assertLess(statistic, ksCriticalValue(SAMPLE_SIZE, SAMPLE_SIZE))
+
+    def test_matchesClosedFormCDF(self):
+        samples = np.sort(self.invCDFSamples)
+        cdf = util.fadeCDF(samples)
+        index = np.arange(1, SAMPLE_SIZE + 1)
+
+        #One sample KS statistic, distance of the CDF from both sides of each step
+        statistic = max(np.max(index/SAMPLE_SIZE - cdf), np.max(cdf - (index - 1)/SAMPLE_SIZE))
+
+        self.assertLess(statistic, ksCriticalValue(SAMPLE_SIZE, np.inf))
+
+    def test_quantiles(self):
+        for probability in QUANTILES:
+            expected = fadeQuantile(probability)
+
+            #Standard error of the sample quantile is sqrt(p(1-p)/n)/pdf, checked in probability
+            #scale: fraction of samples below the expected quantile
+            tolerance = 5 * np.sqrt(probability * (1 - probability)/SAMPLE_SIZE)
+
+            self.assertAlmostEqual(np.mean(self.invCDFSamples <= expected), probability, delta=tolerance)
+            self.assertAlmostEqual(np.mean(self.originalSamples <= expected), probability, delta=tolerance)
+
+    def test_singleValueMatchesArray(self):
+        np.random.seed(7)
+        singles = [util.rayleighFadingInvCDF() for iCount in range(100)]
+
+        np.random.seed(7)
+        self.assertTrue(np.allclose(singles, util.rayleighFadingInvCDF(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+###################################################################
+# test_lockstepEngine.py
+#
+# This python module checks that the lockstep engine gives each
+# configuration the same statistics as independent runs of the tick
+# engine: KPIs of lockstep runs and of independent runs with the same
+# seeds must agree within their confidence interval. Run with
+#       python -m pytest test_lockstepEngine.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import replication
+import numpy as np
+import unittest
+
+
+NUM_OF_USERS = 1200
+HOURS = 0.25
+SEEDS = range(6)
+Z_BOUND = 4.0                 # difference of means allowed, in standard errors of the difference
+
+
+def getKpis(result):
+    """ Returns the KPIs of a SimulationResult (see replication.computeKpis) with the
+        number of call requests (attempts and establishment failures) """
+
+    kpis = replication.computeKpis(result.stats)
+    kpis['requests'] = sum(stats.callAttempts + stats.callEstblFailDueSignlStrnt for stats in result.stats.values())
+
+    return kpis
+
+
+def assertSameMean(testCase, samplesA, samplesB, name):
+    """ Fails 'testCase' if the means of the two samples differ by more than Z_BOUND
+        standard errors of the difference (Welch) """
+
+    samplesA, samplesB = np.asarray(samplesA, dtype=float), np.asarray(samplesB, dtype=float)
+
+    standardError = np.sqrt(np.var(samplesA, ddof=1)/len(samplesA) + np.var(samplesB, ddof=1)/len(samplesB))
+    difference = abs(np.mean(samplesA) - np.mean(samplesB))
+
+    testCase.assertLessEqual(difference, Z_BOUND * standardError + 1e-12, \
+                             '{0}: means {1:.4f} and {2:.4f} differ'.format(name, np.mean(samplesA), np.mean(samplesB)))
+    return
+
+
+class TestLockstepEngine(unittest.TestCase):
+
+    def test_identicalConfigurations(self):
+        results = sim.runLockstepSimulation(NUM_OF_USERS, [3, 3], HOURS, seed=1)
+
+        self.assertEqual(getKpis(results[0]), getKpis(results[1]))
+
+    def test_matchesIndependentRuns(self):
+        tilts = [2, 8]
+        lockstepKpis = [[] for tilt in tilts]
+        independentKpis = [[] for tilt in tilts]
+
+        for seed in SEEDS:
+            results = sim.runLockstepSimulation(NUM_OF_USERS, tilts, HOURS, seed)
+
+            for configIndex, tilt in enumerate(tilts):
+                lockstepKpis[configIndex].append(getKpis(results[configIndex]))
+
+                result = sim.runSimulation(NUM_OF_USERS, tilt, HOURS, seed, 'tick', printStats = False)
+                independentKpis[configIndex].append(getKpis(result))
+
+        for configIndex, tilt in enumerate(tilts):
+            for name in lockstepKpis[configIndex][0]:
+                assertSameMean(self, [kpis[name] for kpis in lockstepKpis[configIndex]], \
+                               [kpis[name] for kpis in independentKpis[configIndex]], 'tilt {0} {1}'.format(tilt, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
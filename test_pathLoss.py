@@ -0,0 +1,93 @@
+###################################################################
+# test_pathLoss.py
+#
+# This python module checks the path loss models of pathLoss.py:
+# OkumuraHataModel against the baseline util.okamuraHata for every
+# area type, COST-231 Hata and free space models against their
+# reference formulas written out term by term, and all of them
+# against textbook values at 1 KM. Run with
+#       python -m pytest test_pathLoss.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import pathLoss
+import utilities as util
+import config as cfg
+import numpy as np
+import unittest
+
+
+DISTANCES = np.geomspace(0.015, 6, 200)                  # In KM
+HEIGHTS = [(cfg.BSTN_HEIGHT, cfg.MOBILE_HEIGHT), (30, 1.5), (200, 10)]     # (Hb, Hm) in meters
+
+
+def cost231Hata(d, f, Hb, Hm, bMetropolitan):
+    """ Reference COST-231 Hata formula (in dB), d in KM and f in MHz """
+
+    A_Hm = (1.1*np.log10(f) - 0.7)*Hm - (1.56*np.log10(f) - 0.8)
+
+    return 46.3 + 33.9*np.log10(f) - 13.82*np.log10(Hb) - A_Hm + (44.9 - 6.55*np.log10(Hb))*np.log10(d) \
+           + (3 if bMetropolitan else 0)
+
+
+def freeSpace(d, f):
+    """ Reference free space formula (in dB), d in KM and f in MHz """
+
+    return 20*np.log10(d) + 20*np.log10(f) + 32.44
+
+
+class TestPathLossModels(unittest.TestCase):
+
+    def assertSameLoss(self, lossA, lossB):
+        self.assertTrue(np.allclose(lossA, lossB, rtol=0, atol=1e-9))
+
+    def test_okumuraHataMatchesBaseline(self):
+        for areaType in util.AreaType:
+            for Hb, Hm in HEIGHTS:
+                for f in (cfg.FREQUENCY, 150, 1500):
+                    with self.subTest(areaType=areaType.name, Hb=Hb, Hm=Hm, f=f):
+                        model = pathLoss.OkumuraHataModel(f, Hb, Hm, areaType)
+
+                        self.assertSameLoss(model.getPathLoss(DISTANCES), util.okamuraHata(DISTANCES, f, Hb, Hm, areaType))
+                        self.assertSameLoss(model.getPathLoss(1.5), util.okamuraHata(1.5, f, Hb, Hm, areaType))
+
+    def test_cost231HataMatchesFormula(self):
+        for bMetropolitan in (False, True):
+            for Hb, Hm in HEIGHTS:
+                for f in (1500, 1800, 2000):
+                    with self.subTest(bMetropolitan=bMetropolitan, Hb=Hb, Hm=Hm, f=f):
+                        model = pathLoss.Cost231HataModel(f, Hb, Hm, bMetropolitan)
+
+                        self.assertSameLoss(model.getPathLoss(DISTANCES), cost231Hata(DISTANCES, f, Hb, Hm, bMetropolitan))
+
+    def test_freeSpaceMatchesFormula(self):
+        for f in (cfg.FREQUENCY, 1000, 2400):
+            with self.subTest(f=f):
+                self.assertSameLoss(pathLoss.FreeSpaceModel(f).getPathLoss(DISTANCES), freeSpace(DISTANCES, f))
+
+    def test_textbookValues(self):
+        #Urban Hata at 900 MHz and COST-231 at 1800 MHz (Hb = 30 m, Hm = 1.5 m), free space at 1000 MHz, all at 1 KM
+        self.assertAlmostEqual(pathLoss.OkumuraHataModel(900, 30, 1.5).getPathLoss(1), 126.42, delta=0.05)
+        self.assertAlmostEqual(pathLoss.Cost231HataModel(1800, 30, 1.5).getPathLoss(1), 136.20, delta=0.05)
+        self.assertAlmostEqual(pathLoss.FreeSpaceModel(1000).getPathLoss(1), 92.44, delta=1e-9)
+
+    def test_createPathLossModel(self):
+        for name, (modelClass, kwargs) in pathLoss.PATH_LOSS_MODELS.items():
+            with self.subTest(name=name):
+                model = pathLoss.createPathLossModel(name, cfg.FREQUENCY, cfg.BSTN_HEIGHT, cfg.MOBILE_HEIGHT)
+
+                self.assertIsInstance(model, modelClass)
+                self.assertSameLoss(model.getPathLoss(DISTANCES), \
+                                    modelClass(cfg.FREQUENCY, cfg.BSTN_HEIGHT, cfg.MOBILE_HEIGHT, **kwargs).getPathLoss(DISTANCES))
+
+        with self.assertRaises(ValueError):
+            pathLoss.createPathLossModel('walfisch-ikegami', cfg.FREQUENCY, cfg.BSTN_HEIGHT, cfg.MOBILE_HEIGHT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+###################################################################
+# test_population.py
+#
+# This python module checks the slot allocator of Population:
+# slots are handed out in order, released slots are reset and used
+# again before new ones, and the arrays grow (keeping the values of
+# the slots in use) when all the slots are taken. Run with
+#       python -m pytest test_population.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import population as pop
+import numpy as np
+import unittest
+
+
+def fillSlot(population, slot, userId):
+    """ Gives the slot values which differ from the defaults of Population.reset """
+
+    population.userId[slot] = userId
+    population.position[slot] = 100.0 + userId
+    population.direction[slot] = -1
+    population.speed[slot] = 12.5
+    population.bIsCallActive[slot] = True
+    population.callDurationLeft[slot] = 60.0
+    population.connectedBstn[slot] = population.getBstnIndex('B')
+    return
+
+
+def assertDefaults(testCase, population, slot):
+    testCase.assertEqual(population.userId[slot], -1)
+    testCase.assertEqual(population.position[slot], 0)
+    testCase.assertEqual(population.direction[slot], 0)
+    testCase.assertEqual(population.speed[slot], 0)
+    testCase.assertFalse(population.bIsCallActive[slot])
+    testCase.assertEqual(population.callDurationLeft[slot], 0)
+    testCase.assertEqual(population.connectedBstn[slot], -1)
+    return
+
+
+class TestPopulation(unittest.TestCase):
+
+    def test_allocateInOrder(self):
+        population = pop.Population(3, ['A', 'B'])
+
+        self.assertEqual([population.allocate() for iCount in range(3)], [0, 1, 2])
+        self.assertEqual(population.getCapacity(), 3)
+
+    def test_releasedSlotIsReused(self):
+        population = pop.Population(4, ['A', 'B'])
+        slots = [population.allocate() for iCount in range(3)]
+
+        for slot in slots:
+            fillSlot(population, slot, slot)
+
+        population.release(1)
+        assertDefaults(self, population, 1)
+
+        #Released slot is taken before the slot which was never used, other slots keep their values
+        self.assertEqual(population.allocate(), 1)
+        self.assertEqual(population.allocate(), 3)
+        self.assertEqual(population.userId[2], 2)
+        self.assertEqual(population.getConnectedBstnIDs([0, 2]).tolist(), ['B', 'B'])
+
+    def test_grow(self):
+        population = pop.Population(2, ['A', 'B'])
+
+        for slot in (population.allocate(), population.allocate()):
+            fillSlot(population, slot, slot)
+
+        #All the slots are in use, so the arrays double and the values of slots in use are kept
+        self.assertEqual(population.allocate(), 2)
+        self.assertEqual(population.getCapacity(), 4)
+
+        for array in (population.userId, population.position, population.direction, population.speed, \
+                      population.bIsCallActive, population.callDurationLeft, population.connectedBstn):
+            self.assertEqual(len(array), 4)
+
+        self.assertEqual(population.userId.tolist(), [0, 1, -1, -1])
+        self.assertEqual(population.position.tolist(), [100.0, 101.0, 0.0, 0.0])
+        assertDefaults(self, population, 3)
+
+        #Released slot is used again before the new slots
+        population.release(0)
+        self.assertEqual([population.allocate() for iCount in range(3)], [0, 3, 4])
+        self.assertEqual(population.getCapacity(), 8)
+
+    def test_emptyPopulation(self):
+        population = pop.Population(0)
+
+        self.assertEqual(population.allocate(), 0)
+        self.assertEqual(population.allocate(), 1)
+        self.assertEqual(population.getCapacity(), 2)
+
+    def test_bstnIndex(self):
+        population = pop.Population(1, ['A', 'B'])
+
+        self.assertEqual(population.getBstnIndex('B'), 1)
+        self.assertEqual(population.getBstnIndex('C'), 2)
+        self.assertEqual(population.getBstnIndex(None), -1)
+        self.assertEqual(population.getBstnID(2), 'C')
+        self.assertIsNone(population.getBstnID(-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+###################################################################
+# test_replication.py
+#
+# This python module checks replication.py: Student's t quantile
+# against table values, Welford's running statistic against numpy,
+# and the stopping rule for KPIs without observations (no events in
+# any replication) and with zero sample variance. Run with
+#       python -m pytest test_replication.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import replication
+import numpy as np
+import unittest
+
+
+#Values of t tables: (probability, degrees of freedom, quantile)
+STUDENT_T_TABLE = [(0.975, 1, 12.706), (0.975, 2, 4.303), (0.975, 5, 2.571), (0.975, 10, 2.228), \
+                   (0.975, 30, 2.042), (0.95, 4, 2.132), (0.995, 20, 2.845), (0.9, 60, 1.296)]
+
+HALF_WIDTHS = {'blocking': 0.01, 'handoffFailure': 0.01}
+
+
+def createStatistic(values):
+    statistic = replication.RunningStatistic()
+
+    for value in values:
+        statistic.add(value)
+
+    return statistic
+
+
+class TestStudentT(unittest.TestCase):
+
+    def test_quantileMatchesTable(self):
+        for probability, dof, quantile in STUDENT_T_TABLE:
+            with self.subTest(probability=probability, dof=dof):
+                self.assertAlmostEqual(replication.studentTQuantile(probability, dof), quantile, delta=5e-4)
+
+    def test_cdf(self):
+        for dof in (1, 2, 7, 30):
+            with self.subTest(dof=dof):
+                self.assertAlmostEqual(replication.studentTCDF(0, dof), 0.5)
+                self.assertAlmostEqual(replication.studentTCDF(-1.5, dof) + replication.studentTCDF(1.5, dof), 1.0)
+
+        #t with one degree of freedom is Cauchy distribution: P(T <= 1) = 0.75
+        self.assertAlmostEqual(replication.studentTCDF(1, 1), 0.75)
+
+
+class TestRunningStatistic(unittest.TestCase):
+
+    def test_matchesNumpy(self):
+        values = np.random.RandomState(656).normal(0.2, 0.05, 50)
+        statistic = createStatistic(values)
+
+        self.assertEqual(statistic.getCount(), 50)
+        self.assertAlmostEqual(statistic.getMean(), np.mean(values))
+        self.assertAlmostEqual(statistic.getVariance(), np.var(values, ddof=1))
+
+    def test_fewSamples(self):
+        self.assertTrue(np.isnan(createStatistic([]).getMean()))
+        self.assertTrue(np.isnan(createStatistic([0.1]).getVariance()))
+        self.assertEqual(createStatistic([0.1]).getHalfWidth(), float('inf'))
+
+
+class TestStoppingRule(unittest.TestCase):
+
+    def test_kpiWithoutObservations(self):
+        #No handoff in any replication, blocking is precise
+        statistics = {'blocking': createStatistic([0.100, 0.101, 0.099]), 'handoffFailure': createStatistic([])}
+        eventCounts = {'blocking': 3000, 'handoffFailure': 0}
+
+        self.assertTrue(replication.isConverged(statistics, eventCounts, HALF_WIDTHS, 0.95, 3))
+
+        #Not before the minimum number of replications
+        self.assertFalse(replication.isConverged(statistics, eventCounts, HALF_WIDTHS, 0.95, 2))
+
+        #A KPI with one observation has no interval yet
+        statistics['handoffFailure'] = createStatistic([0.2])
+        eventCounts['handoffFailure'] = 10
+
+        self.assertFalse(replication.isConverged(statistics, eventCounts, HALF_WIDTHS, 0.95, 3))
+
+    def test_kpiWithZeroVariance(self):
+        #No call blocked in three replications: t interval is zero, but 30 attempts do not bound the rate
+        statistic = createStatistic([0.0, 0.0, 0.0])
+        self.assertEqual(statistic.getHalfWidth(), 0.0)
+
+        self.assertAlmostEqual(replication.getKpiHalfWidth(statistic, 30, 0.95), 2.9957/30, places=4)
+        self.assertEqual(replication.getKpiHalfWidth(statistic, 0, 0.95), float('inf'))
+
+        statistics = {'blocking': statistic, 'handoffFailure': createStatistic([0.05, 0.051, 0.049])}
+
+        self.assertFalse(replication.isConverged(statistics, {'blocking': 30, 'handoffFailure': 900}, HALF_WIDTHS, 0.95, 3))
+        self.assertTrue(replication.isConverged(statistics, {'blocking': 3000, 'handoffFailure': 900}, HALF_WIDTHS, 0.95, 3))
+
+        #KPIs with variance keep the t interval
+        self.assertEqual(replication.getKpiHalfWidth(statistics['handoffFailure'], 900, 0.95), \
+                         statistics['handoffFailure'].getHalfWidth(0.95))
+
+    def test_runWithoutEvents(self):
+        #A few users for a few seconds make no call, so no KPI can be estimated
+        result = replication.runReplications(1, 3, 0.001, HALF_WIDTHS, maxReplications = 10, workers = 1, progress = False)
+
+        self.assertTrue(result.bConverged)
+        self.assertEqual(result.numOfReplications, replication.MIN_REPLICATIONS)
+        self.assertTrue(all(result.isUndefined(name) for name in replication.KPI_DEFINITIONS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+###################################################################
+# test_sgnlIx.py
+#
+# This python module checks that the S/I counts of the bincount
+# accumulator (utilities.SgnlIxAccumulator and binSgnlIxInfo) and
+# the bars drawn from them are the same as with the per-sample loop
+# of the original plotSgnlIxInfo, on a fixed set of S/I values with
+# values on the class and section boundaries. Run with
+#       python -m pytest test_sgnlIx.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import numpy as np
+import unittest
+
+
+ROAD_LENGTH = 1000
+
+#(location, serving base station, S/I value), with S/I on the class boundaries (5 and 10 dB)
+#and locations on the section boundaries
+SGNL_IX_DATA = [(0, 'A', 12.0), (0.5, 'A', 10.0), (99.9, 'A', 10.01), (100, 'A', 5.0), (100, 'B', 5.01), \
+                (150, 'B', -3.0), (250, 'A', 7.5), (250, 'A', 7.5), (399.99, 'B', 10.0), (400, 'B', 25.0), \
+                (555, 'A', -np.inf), (555, 'B', np.inf), (705, 'B', 4.99), (800, 'A', 9.99), (999.9, 'B', 11.0), \
+                (999.9, 'A', 0.0), (640, 'B', 6.0), (640, 'B', 6.0), (640, 'B', 16.0), (20, 'B', 1.0)]
+
+
+def binOneByOne(data, roadLen):
+    """ Counts S/I values sample by sample, as the loop of the original plotSgnlIxInfo """
+
+    totalRoadSections = roadLen//util.ROAD_SECTION_SIZE
+
+    dictSgnlIx = {'A': [[0]*totalRoadSections, [0]*totalRoadSections, [0]*totalRoadSections] , \
+                  'B': [[0]*totalRoadSections, [0]*totalRoadSections, [0]*totalRoadSections] }
+
+    for tupval in data:
+        locationIndex = int(np.floor(tupval[0]/util.ROAD_SECTION_SIZE))
+        servingBstn = tupval[1]
+        sgnlIxRatio = tupval[2]
+
+        if sgnlIxRatio > 10:
+            dictSgnlIx[servingBstn][2][locationIndex] += 1
+
+        elif sgnlIxRatio > 5:
+            dictSgnlIx[servingBstn][1][locationIndex] += 1
+
+        else:
+            dictSgnlIx[servingBstn][0][locationIndex] += 1
+
+    return dictSgnlIx
+
+
+class TestSgnlIxCounts(unittest.TestCase):
+
+    def setUp(self):
+        self.expected = binOneByOne(SGNL_IX_DATA, ROAD_LENGTH)
+
+    def test_binSgnlIxInfo(self):
+        self.assertEqual(util.binSgnlIxInfo(SGNL_IX_DATA, ROAD_LENGTH), self.expected)
+
+    def test_accumulatorInBatches(self):
+        locations, bstnIDs, sgnlIx = (np.array(column) for column in zip(*SGNL_IX_DATA))
+
+        #Counts added in batches of any size are the same as one batch
+        accumulator = util.SgnlIxAccumulator(['A', 'B'], ROAD_LENGTH)
+
+        for start, stop in [(0, 1), (1, 1), (1, 7), (7, len(SGNL_IX_DATA))]:
+            accumulator.add(locations[start:stop], bstnIDs[start:stop], sgnlIx[start:stop])
+
+        self.assertEqual({bstnID: counts.tolist() for bstnID, counts in accumulator.asDict().items()}, self.expected)
+
+        #Base stations given by index (order of getBstnIDs, here B before A)
+        accumulator = util.SgnlIxAccumulator(['B', 'A'], ROAD_LENGTH)
+        accumulator.addByIndex(locations, np.where(bstnIDs == 'B', 0, 1), sgnlIx)
+
+        self.assertEqual(accumulator.counts.sum(), len(SGNL_IX_DATA))
+        self.assertEqual({bstnID: counts.tolist() for bstnID, counts in accumulator.asDict().items()}, self.expected)
+
+    def test_endOfRoad(self):
+        #Mobile at the end of the road is counted in the last section
+        accumulator = util.SgnlIxAccumulator(['A', 'B'], ROAD_LENGTH)
+        accumulator.add([ROAD_LENGTH], ['B'], [7.0])
+
+        self.assertEqual(accumulator.counts[1, 1, -1], 1)
+        self.assertEqual(accumulator.counts.sum(), 1)
+
+    def test_sameBars(self):
+        from matplotlib.figure import Figure
+
+        accumulator = util.SgnlIxAccumulator(['A', 'B'], ROAD_LENGTH)
+        accumulator.add(*(np.array(column) for column in zip(*SGNL_IX_DATA)))
+
+        for bstnID, counts in accumulator.asDict().items():
+            with self.subTest(bstnID=bstnID):
+                axes = Figure().subplots()
+                util.drawSgnlIxBars(axes, counts, bstnID, ROAD_LENGTH)
+
+                heights = [[patch.get_height() for patch in container] for container in axes.containers]
+                self.assertEqual(heights, self.expected[bstnID])
+
+
+if __name__ == '__main__':
+    unittest.main()
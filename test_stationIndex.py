@@ -0,0 +1,90 @@
+###################################################################
+# test_stationIndex.py
+#
+# This python module checks StationIndex.getStrongest against a
+# brute force search (argmax of the median RSL over all the base
+# stations) for sparse and dense placements of the stations, with
+# and without an excluded (serving) station. Run with
+#       python -m pytest test_stationIndex.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import simulation as sim
+import stationIndex as sidx
+import config as cfg
+import numpy as np
+import unittest
+
+
+NUM_OF_POSITIONS = 3001
+PLACEMENTS = [(2, 3), (5, 0), (12, 8), (30, 0), (30, 3)]     # (number of stations, tilt)
+
+
+def bruteForceStrongest(stationIdx, positions, count, excludeIndex = None):
+    """ Returns (sorted median RSL values (mobiles x count) of the 'count' strongest
+        stations, count), evaluating every station """
+
+    allRSL = stationIdx.getMedianRSL(np.arange(len(stationIdx))[np.newaxis, :], positions[:, np.newaxis])
+
+    count = min(count, len(stationIdx))
+
+    if excludeIndex is not None:
+        allRSL[np.arange(len(positions)), excludeIndex] = -np.inf
+        count = min(count, len(stationIdx) - 1)
+
+    return np.sort(allRSL, axis=1)[:, len(stationIdx) - count:], count
+
+
+class TestGetStrongest(unittest.TestCase):
+
+    def assertStrongest(self, stationIdx, positions, count, excludeIndex = None):
+        strongest = stationIdx.getStrongest(positions, count, excludeIndex)
+        expected, count = bruteForceStrongest(stationIdx, positions, count, excludeIndex)
+
+        self.assertEqual(strongest.shape, (len(positions), count))
+
+        if excludeIndex is not None:
+            self.assertFalse(np.any(strongest == excludeIndex[:, np.newaxis]))
+
+        #Stations are compared by their RSL (ties between stations out of range are not unique)
+        rsl = np.sort(stationIdx.getMedianRSL(strongest, positions[:, np.newaxis]), axis=1)
+        self.assertTrue(np.all((rsl == expected) | np.isclose(rsl, expected)))
+
+    def test_matchesBruteForce(self):
+        positions = np.linspace(0, cfg.ROAD_LENGTH, NUM_OF_POSITIONS)
+
+        for numOfBstns, tilt in PLACEMENTS:
+            stationIdx = sidx.StationIndex(sim.createBaseStations(tilt, numOfBstns))
+
+            for count in (1, 2, 3):
+                with self.subTest(numOfBstns=numOfBstns, tilt=tilt, count=count):
+                    self.assertStrongest(stationIdx, positions, count)
+
+    def test_matchesBruteForceWithExclusion(self):
+        positions = np.linspace(0, cfg.ROAD_LENGTH, NUM_OF_POSITIONS)
+
+        for numOfBstns, tilt in PLACEMENTS:
+            stationIdx = sidx.StationIndex(sim.createBaseStations(tilt, numOfBstns))
+            excludeIndex = stationIdx.getStrongest(positions, 1)[:, 0]
+
+            for count in (1, 2, 3):
+                with self.subTest(numOfBstns=numOfBstns, tilt=tilt, count=count):
+                    self.assertStrongest(stationIdx, positions, count, excludeIndex)
+
+    def test_stackMatchesEachConfiguration(self):
+        positions = np.linspace(0, cfg.ROAD_LENGTH, NUM_OF_POSITIONS)
+        stationIndices = [sidx.StationIndex(sim.createBaseStations(tilt, 30)) for tilt in (0, 3, 8)]
+
+        strongest = sidx.StationIndexStack(stationIndices).getStrongest(positions, 2)
+
+        for configIndex, stationIdx in enumerate(stationIndices):
+            self.assertTrue(np.array_equal(strongest[configIndex], stationIdx.getStrongest(positions, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
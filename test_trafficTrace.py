@@ -0,0 +1,68 @@
+###################################################################
+# test_trafficTrace.py
+#
+# This python module checks that the fading values of traffic traces
+# (trafficTrace.keyedFades) depend only on their key (call, time
+# step, base station), so they stay aligned when a replay with
+# another tilt serves other calls, and that they follow the fading
+# distribution (utilities.fadeCDF). Run with
+#       python -m pytest test_trafficTrace.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import trafficTrace
+import utilities as util
+import test_fading
+import numpy as np
+import unittest
+
+
+FADE_SEED = 656
+
+
+class TestKeyedFades(unittest.TestCase):
+
+    def test_valueDependsOnlyOnKey(self):
+        callIds = np.array([3, 8, 20])
+        bstnIndex = np.array([[0, 1], [1, 0], [1, 1]])
+
+        fades = trafficTrace.keyedFades(FADE_SEED, callIds, 12, bstnIndex)
+
+        #Same links looked up one by one, in another order and with other calls in the batch
+        for row in range(len(callIds)):
+            for column in range(bstnIndex.shape[1]):
+                single = trafficTrace.keyedFades(FADE_SEED, [callIds[row]], 12, [bstnIndex[row, column]])
+                self.assertEqual(single[0], fades[row, column])
+
+        others = trafficTrace.keyedFades(FADE_SEED, [20, 5, 3], 12, [[1, 1], [0, 0], [0, 1]])
+        self.assertTrue(np.array_equal(others[[0, 2]], fades[[2, 0]]))
+
+    def test_keysGiveDifferentValues(self):
+        fades = trafficTrace.keyedFades(FADE_SEED, [1], 5, [0])[0]
+
+        self.assertNotEqual(fades, trafficTrace.keyedFades(FADE_SEED + 1, [1], 5, [0])[0])
+        self.assertNotEqual(fades, trafficTrace.keyedFades(FADE_SEED, [2], 5, [0])[0])
+        self.assertNotEqual(fades, trafficTrace.keyedFades(FADE_SEED, [1], 6, [0])[0])
+        self.assertNotEqual(fades, trafficTrace.keyedFades(FADE_SEED, [1], 5, [1])[0])
+
+    def test_matchesClosedFormCDF(self):
+        numOfCalls = test_fading.SAMPLE_SIZE//2
+        bstnIndex = np.tile([0, 1], (numOfCalls, 1))
+
+        samples = np.sort(trafficTrace.keyedFades(FADE_SEED, np.arange(numOfCalls), 1, bstnIndex).ravel())
+        cdf = util.fadeCDF(samples)
+        index = np.arange(1, len(samples) + 1)
+
+        #One sample KS statistic (see test_fading.py)
+        statistic = max(np.max(index/len(samples) - cdf), np.max(cdf - (index - 1)/len(samples)))
+
+        self.assertLess(statistic, test_fading.ksCriticalValue(len(samples), np.inf))
+
+
+if __name__ == '__main__':
+    unittest.main()
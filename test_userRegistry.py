@@ -0,0 +1,116 @@
+###################################################################
+# test_userRegistry.py
+#
+# This python module checks the swap-remove UserRegistry against a
+# plain dictionary of user states: after every setState and moveAll
+# the members and counts of each state, and the state of each user,
+# must be the same. Run with
+#       python -m pytest test_userRegistry.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import userRegistry as reg
+import numpy as np
+import unittest
+
+
+NUM_OF_OPERATIONS = 3000
+NUM_OF_USER_IDS = 60
+SEED = 656
+
+
+class TestUserRegistry(unittest.TestCase):
+
+    def assertSameStates(self, registry, expected):
+        """ Fails if the registry differs from 'expected' (dictionary of user ID -> state) """
+
+        for state in reg.UserState:
+            members = registry.members(state)
+
+            self.assertEqual(registry.count(state), len(members))
+            self.assertEqual(sorted(members.tolist()), sorted(userId for userId in expected if expected[userId] == state))
+
+        for userId in range(NUM_OF_USER_IDS + 1):
+            self.assertEqual(registry.getState(userId), expected.get(userId))
+        return
+
+    def test_setState(self):
+        registry = reg.UserRegistry(4)
+
+        registry.setState(0, reg.UserState.ACTIVE)
+        registry.setState(1, reg.UserState.ACTIVE)
+        registry.setState(2, reg.UserState.ACTIVE)
+
+        #First member leaves, last member takes its place
+        registry.setState(0, reg.UserState.ARCHIVED)
+        self.assertEqual(registry.members(reg.UserState.ACTIVE).tolist(), [2, 1])
+
+        #Same state again changes nothing
+        registry.setState(1, reg.UserState.ACTIVE)
+        self.assertEqual(registry.count(reg.UserState.ACTIVE), 2)
+
+        self.assertSameStates(registry, {0: reg.UserState.ARCHIVED, 1: reg.UserState.ACTIVE, 2: reg.UserState.ACTIVE})
+
+    def test_moveAll(self):
+        registry = reg.UserRegistry(8)
+
+        for userId in range(6):
+            registry.setState(userId, reg.UserState.ARCHIVED if userId % 2 else reg.UserState.ACTIVE)
+
+        registry.setState(7, reg.UserState.INACTIVE)
+        registry.moveAll(reg.UserState.ARCHIVED, reg.UserState.INACTIVE)
+
+        expected = {userId: reg.UserState.ACTIVE for userId in (0, 2, 4)}
+        expected.update({userId: reg.UserState.INACTIVE for userId in (1, 3, 5, 7)})
+        self.assertSameStates(registry, expected)
+
+        #Moved users can leave their new state again
+        registry.setState(3, reg.UserState.ACTIVE)
+        expected[3] = reg.UserState.ACTIVE
+        self.assertSameStates(registry, expected)
+
+    def test_membersIsCopy(self):
+        registry = reg.UserRegistry(4)
+
+        for userId in range(3):
+            registry.setState(userId, reg.UserState.ACTIVE)
+
+        #States can be changed while looping through the members (as the engines do)
+        for userId in registry.members(reg.UserState.ACTIVE):
+            registry.setState(userId, reg.UserState.ARCHIVED)
+
+        self.assertEqual(registry.count(reg.UserState.ACTIVE), 0)
+        self.assertEqual(registry.count(reg.UserState.ARCHIVED), 3)
+
+    def test_matchesDictionary(self):
+        #Starts without capacity, so the arrays grow while user IDs are registered
+        rng = np.random.RandomState(SEED)
+        registry = reg.UserRegistry()
+        expected = {}
+
+        for iCount in range(NUM_OF_OPERATIONS):
+            if rng.uniform() < 0.05:
+                fromState, toState = rng.choice(list(reg.UserState), 2)
+                registry.moveAll(fromState, toState)
+
+                for userId in expected:
+                    if expected[userId] == fromState:
+                        expected[userId] = reg.UserState(toState)
+            else:
+                userId, state = int(rng.randint(NUM_OF_USER_IDS)), reg.UserState(rng.randint(len(reg.UserState)))
+                registry.setState(userId, state)
+                expected[userId] = state
+
+            if iCount % 100 == 0:
+                self.assertSameStates(registry, expected)
+
+        self.assertSameStates(registry, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
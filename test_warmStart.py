@@ -0,0 +1,107 @@
+###################################################################
+# test_warmStart.py
+#
+# This python module checks warmStart.py: the Erlang B formula
+# against tabulated blocking probabilities, MSER-5 on synthetic
+# series with and without a known transient, and that the steady
+# state sample respects the number of users and channels. Run with
+#       python -m pytest test_warmStart.py
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import warmStart
+import simulation as sim
+import stationIndex as sidx
+import config as cfg
+import numpy as np
+import unittest
+
+
+SEED = 656
+
+#Blocking probabilities of Erlang B tables: (offered load in Erlangs, channels, blocking)
+ERLANG_B_TABLE = [(1, 1, 0.5), (5, 10, 0.0184), (10, 15, 0.0365), (50, 60, 0.0217)]
+
+TRANSIENT_LENGTH = 100          # observations of the synthetic warm-up
+SERIES_LENGTH = 2000
+
+
+class TestErlangB(unittest.TestCase):
+
+    def test_matchesTable(self):
+        for offeredLoad, numOfChannels, blocking in ERLANG_B_TABLE:
+            with self.subTest(offeredLoad=offeredLoad, numOfChannels=numOfChannels):
+                self.assertAlmostEqual(warmStart.erlangB(offeredLoad, numOfChannels), blocking, delta=5e-5)
+
+    def test_occupancy(self):
+        for offeredLoad in (0, 3.5, 5000):
+            with self.subTest(offeredLoad=offeredLoad):
+                probability = warmStart.erlangOccupancy(offeredLoad, 15)
+
+                self.assertEqual(len(probability), 16)
+                self.assertTrue(np.all(np.isfinite(probability)))
+                self.assertAlmostEqual(np.sum(probability), 1.0)
+
+        #No load means no busy channel, very high load means all busy
+        self.assertEqual(warmStart.erlangOccupancy(0, 15)[0], 1.0)
+        self.assertAlmostEqual(warmStart.erlangB(5000, 15), 1.0, delta=0.01)
+
+
+class TestMser(unittest.TestCase):
+
+    def test_knownTransient(self):
+        rng = np.random.RandomState(SEED)
+
+        #Mean rises from 0 to 20 in the transient, then noise around 20
+        series = 20 + rng.normal(0, 1, SERIES_LENGTH)
+        series[:TRANSIENT_LENGTH] -= np.linspace(20, 0, TRANSIENT_LENGTH)
+
+        truncation, bReliable = warmStart.mser(series)
+
+        self.assertTrue(bReliable)
+        self.assertEqual(truncation % warmStart.MSER_BATCH_SIZE, 0)
+        self.assertGreaterEqual(truncation, TRANSIENT_LENGTH//2)
+        self.assertLessEqual(truncation, 2*TRANSIENT_LENGTH)
+
+    def test_stationarySeries(self):
+        series = np.random.RandomState(SEED).normal(20, 1, SERIES_LENGTH)
+
+        truncation, bReliable = warmStart.mser(series)
+
+        self.assertTrue(bReliable)
+        self.assertLess(truncation, TRANSIENT_LENGTH)
+
+    def test_tooShort(self):
+        #Series still rising at the end has its minimum at the bound of the search
+        truncation, bReliable = warmStart.mser(np.arange(SERIES_LENGTH, dtype=float))
+        self.assertFalse(bReliable)
+
+        self.assertEqual(warmStart.mser(np.ones(warmStart.MSER_BATCH_SIZE + 1)), (0, False))
+
+
+class TestSteadyState(unittest.TestCase):
+
+    def test_sampleSteadyState(self):
+        stationIdx = sidx.StationIndex(sim.createBaseStations(3, 5))
+
+        for numOfUsers in (20, 2000):
+            with self.subTest(numOfUsers=numOfUsers):
+                np.random.seed(SEED)
+                positions, directions, speeds, durations, serverIndex = warmStart.sampleSteadyState(numOfUsers, stationIdx)
+
+                self.assertLessEqual(len(positions), numOfUsers)
+                self.assertTrue(np.all(np.bincount(serverIndex, minlength=len(stationIdx)) <= cfg.CHANNELS_PER_SECTOR))
+                self.assertTrue(np.all((positions > 0) & (positions < cfg.ROAD_LENGTH)))
+                self.assertTrue(np.all(durations > 0))
+
+                #Calls are served by the station with the highest median RSL (see computeOfferedLoads)
+                self.assertTrue(np.array_equal(serverIndex, stationIdx.getStrongest(positions, 1)[:, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
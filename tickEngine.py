@@ -0,0 +1,243 @@
+###################################################################
+# tickEngine.py
+#
+# This python module contains the time stepped simulation engine,
+# which advances the time in fixed steps of SIMULATION_STEP_SIZE
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import mobile as mobile
+import population as pop
+import userRegistry as reg
+import callManagement as callMngt
+import stationIndex as sidx
+import statRecord as stat
+import warmStart
+import config as cfg
+import numpy as np
+
+
+#------------------------------------------------------------------
+# Function to run the time stepped simulation
+#------------------------------------------------------------------
+def runTickSimulation(numOfUsers, bstnDataBase, tTotal, sgnlIxAccumulator, sgnlIxTrace = None, \
+                      kpiRecorder = None, printStats = cfg.PRINT_HOURLY_STATS, \
+                      numOfNeighbours = cfg.INTERFERENCE_NEIGHBOURS, traffic = None, bWarmStart = False):
+    """ This function runs the simulation by advancing the time in steps of
+        SIMULATION_STEP_SIZE. Every step, the active users are moved and their
+        signal is checked (call completion, drop and handoff), and every
+        inactive user may make a call request.
+
+        Input:
+            1. numOfUsers - Total number of users
+            2. bstnDataBase - dictionary of base station objects with key as ID
+            3. tTotal - Total simulation time (in seconds)
+            4. sgnlIxAccumulator - SgnlIxAccumulator object to which S/I values
+                                   are added
+            5. sgnlIxTrace - optional SgnlIxTraceWriter object to which every S/I
+                             sample is written (default value = None, no trace)
+            6. kpiRecorder - optional KpiRecorder object which takes snapshots of the
+                             statistics of base stations at its interval
+            7. printStats - boolean flag to say whether to print the statistics table of
+                            base stations after every hour
+            8. numOfNeighbours - number of strongest neighbour stations whose power is
+                                 summed as interference in S/I
+            9. traffic - optional TrafficRecorder or TrafficReplayer object (see
+                         trafficTrace.py) from which call requests and fading values
+                         are taken (default value = None, drawn with np.random)
+            10. bWarmStart - boolean flag to say whether to start with calls in progress
+                             sampled in steady state (see warmStart.py) instead of an
+                             empty network
+
+        Output:
+            Stats are updated on the base station objects """
+
+    #1. Inactive users are all alike (no position, speed or bstn), so only their count is kept.
+    #State of a user is allocated in the population object (numpy arrays) when the call starts
+    #Stations are looked up by their index in the spatial index, which is also the index
+    #stored in population.connectedBstn
+    stationIdx = sidx.StationIndex(bstnDataBase)
+    bstnIDs = stationIdx.getBstnIDs()
+
+    population = pop.Population(cfg.CHANNELS_PER_SECTOR * len(bstnDataBase), bstnIDs)
+
+    #Maintain a dictionary of user objects (views on population) in call with key as slot and value as object
+    userDataBase = {}
+
+    #2. Now maintain a registry of active, archived and inactive (free) slots for tracking purpose
+    registry = reg.UserRegistry(population.getCapacity())
+
+    callId = 0   #increments for every call request, used as ID of the user making the request
+
+    #Calls in progress at the start (steady state). They are not counted as call attempts or establishments
+    if bWarmStart:
+        positions, directions, speeds, durations, serverIndex = warmStart.sampleSteadyState(numOfUsers, stationIdx)
+
+        for iCount in range(len(positions)):
+        #{ start of for loop
+            slot = population.allocate()
+            user = mobile.Mobile(callId, cfg.MOBILE_HEIGHT, cfg.HANDOFF_MARGIN, cfg.RX_THRESHOLD, population, slot)
+            callId += 1
+
+            user.setPosition(positions[iCount])
+            user.setDirection(int(directions[iCount]))
+            user.setSpeed(speeds[iCount])
+            user.setCallDurationLeft(durations[iCount])
+
+            bstn = stationIdx.getBstn(serverIndex[iCount])
+            user.setConnectedBstnID(bstn.getID())
+            bstn.decrFreeChanCount()
+
+            userDataBase[slot] = user
+            registry.setState(slot, reg.UserState.ACTIVE)
+        #} End of for loop
+
+
+    #---------------------------------------------------
+    # ** START SIMULATION **
+    #---------------------------------------------------
+    for count in range((tTotal//cfg.SIMULATION_STEP_SIZE)+1):
+    #{ Start of for loop
+
+        #Fading values are drawn, or taken from the traffic trace (keyed by user ID, step and station)
+        fadeSource = None if traffic is None else traffic.getFadeSource(count*cfg.SIMULATION_STEP_SIZE)
+
+        #1. Deal with active users, all users are updated together with array operations
+        #Note: members() gives a copy, so the state of users can be changed while looping through it
+        activeSlots = registry.members(reg.UserState.ACTIVE)
+
+        #Update the info of users (updates new location and checks if call is complete)
+        bCompleted = callMngt.updateUserCallInfoBatch(population, activeSlots, cfg.SIMULATION_STEP_SIZE)
+
+        #This means calls are sucessfully completed, increment stat and free the channels
+        completedSlots = activeSlots[bCompleted]
+        completedCalls = stat.addStatEvents(bstnDataBase, util.StatName.SUCCESSFUL_CALLS, \
+                                            population.getConnectedBstnIDs(completedSlots))
+
+        for bstnID, numOfCalls in completedCalls.items():
+            bstnDataBase[bstnID].incrFreeChanCount(numOfCalls)
+
+        for slot in completedSlots:
+            #move the user from active to archived state (slot is released at the end of the step)
+            del userDataBase[slot]
+            registry.setState(slot, reg.UserState.ARCHIVED)
+
+        #Calculate the RSL at new location from serving base stations for all the remaining users
+        activeSlots = activeSlots[~bCompleted]
+
+        serverIndex = population.connectedBstn[activeSlots]
+        serverIds = bstnIDs[serverIndex]
+        rslServer = callMngt.findRSLByIndex(stationIdx, serverIndex, population.position[activeSlots], fadeSource, \
+                                            population.userId[activeSlots])
+
+        bDropped = rslServer < cfg.RX_THRESHOLD
+
+        #Drop the calls
+        droppedCalls = stat.addStatEvents(bstnDataBase, util.StatName.CALL_DROP_SIG_STRENGTH, serverIds[bDropped])
+
+        for bstnID, numOfCalls in droppedCalls.items():
+            bstnDataBase[bstnID].incrFreeChanCount(numOfCalls)
+
+        for slot in activeSlots[bDropped]:
+            #move the user to archived state
+            del userDataBase[slot]
+            registry.setState(slot, reg.UserState.ARCHIVED)
+
+        #Calculate the RSL from the strongest neighbour stations for the users still in call
+        activeSlots = activeSlots[~bDropped]
+        serverIndex = serverIndex[~bDropped]
+        serverIds = serverIds[~bDropped]
+        rslServer = rslServer[~bDropped]
+
+        neighbourIndex, rslNeighbours = callMngt.findNeighbourRSLBatch(stationIdx, population.position[activeSlots], \
+                                                                       serverIndex, numOfNeighbours, fadeSource, \
+                                                                       population.userId[activeSlots])
+
+        sgnlIx = callMngt.calculateSgnlIx(rslServer, rslNeighbours)
+
+        #Add S/I values to the accumulator.....
+        sgnlIxAccumulator.add(population.position[activeSlots], serverIds, sgnlIx)
+
+        if sgnlIxTrace is not None:
+            sgnlIxTrace.add(count*cfg.SIMULATION_STEP_SIZE, population.userId[activeSlots], population.position[activeSlots], \
+                            serverIds, sgnlIx)
+
+        #Handoff to the strongest neighbour if it is better than server by the margin
+        targetIndex, rslTarget = callMngt.findHandoffTargets(neighbourIndex, rslNeighbours)
+
+        bHandoff = rslTarget > rslServer + cfg.HANDOFF_MARGIN
+
+        for slot, iTarget in zip(activeSlots[bHandoff], targetIndex[bHandoff]):
+            user = userDataBase[slot]
+            callMngt.attemptHandoff(user, bstnDataBase[user.getConnectedBstnID()], stationIdx.getBstn(iTarget))
+
+        #2. We are done dealing with active users. Now, deal with inactive users
+        #(users archived in this step become inactive only at the end of the step)
+        numOfInactiveUsers = numOfUsers - registry.count(reg.UserState.ACTIVE) - registry.count(reg.UserState.ARCHIVED)
+
+        #Determine how many inactive users make a call (one binomial draw for all of them)
+        probability = (cfg.CALL_RATE/3600) * cfg.SIMULATION_STEP_SIZE
+
+        #1. Determine users' location (call duration and speed are drawn when the call is established,
+        #or taken from the traffic trace with the direction)
+        if traffic is None:
+            numOfCallers = np.random.binomial(numOfInactiveUsers, probability)
+            locations = np.random.uniform(0, cfg.ROAD_LENGTH, numOfCallers)
+            directions = np.where(locations > cfg.ROAD_LENGTH/2, -1, 1)
+            durations = speeds = [None] * numOfCallers
+        else:
+            locations, directions, durations, speeds = traffic.getCallRequests(count*cfg.SIMULATION_STEP_SIZE, \
+                                                                               numOfInactiveUsers, probability)
+            numOfCallers = len(locations)
+
+        #2. Find the two strongest Bstns near the mobiles and RSL at mobiles from them
+        #(the users get the next call IDs in order of the requests)
+        candidateIndex, rslCandidates = callMngt.findCallCandidatesBatch(stationIdx, locations, fadeSource, \
+                                                                         np.arange(callId, callId + numOfCallers))
+
+        #3. Allocate the state of the users and establish the calls (on the base station with higher RSL if possible)
+        for iCount in range(numOfCallers):
+        #{ start of for loop
+            slot = population.allocate()
+            user = mobile.Mobile(callId, cfg.MOBILE_HEIGHT, cfg.HANDOFF_MARGIN, cfg.RX_THRESHOLD, population, slot)
+            callId += 1
+
+            #Set Direction (-1 means right to left, +1 means left to right)
+            user.setPosition(locations[iCount])
+            user.setDirection(int(directions[iCount]))
+
+            bstnCandidates = [stationIdx.getBstn(iBstn) for iBstn in candidateIndex[iCount]]
+
+            if callMngt.attemptCall(user, rslCandidates[iCount], bstnCandidates, durations[iCount], speeds[iCount]):
+                userDataBase[slot] = user
+                registry.setState(slot, reg.UserState.ACTIVE)   #Add user to active state
+            else:
+                population.release(slot)        #User stays inactive
+        #} End of for loop
+
+        #4. we are done dealing with both active and inactive user at this time stamp
+        #Move the archived users to inactive pool and release their slots
+        for slot in registry.members(reg.UserState.ARCHIVED):
+            population.release(slot)
+
+        registry.moveAll(reg.UserState.ARCHIVED, reg.UserState.INACTIVE)
+
+        #5. Check the timer, take KPI snapshot and print stats after every hour
+        if kpiRecorder is not None and kpiRecorder.isDue(count*cfg.SIMULATION_STEP_SIZE):
+            kpiRecorder.record(count*cfg.SIMULATION_STEP_SIZE, bstnDataBase)
+
+        if printStats and count > 0 and count%3600 == 0:
+            for bstnID in bstnIDs:
+                bstnDataBase[bstnID].printStats(count//3600)
+                print('\n\n')
+            print('-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-x-\n')
+
+    #} End of simulation timer For loop
+
+    return
@@ -0,0 +1,301 @@
+###################################################################
+# tiltOptimizer.py
+#
+# This python module searches the antenna tilt of every base station
+# (and optionally its height and transmit power) that maximizes a
+# weighted sum of coverage and share of road with S/I above 10 dB.
+# The objective is the analytical estimate of coverageEstimator.py,
+# so each candidate takes milliseconds. The search is a coarse to
+# fine grid over one parameter at a time, the candidates of a grid
+# are evaluated in parallel, and every evaluated configuration is
+# cached so it is never computed twice.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import coverageEstimator as ce
+import rslProfile
+import basestation as bstn
+import config as cfg
+import numpy as np
+import concurrent.futures
+import functools
+import argparse
+import time
+import os
+
+
+#Parameters of a base station that can be optimized, as name -> (lower bound, upper bound, final step)
+OPTIMIZER_PARAMETERS = {'tilt'    : (0, 15, 0.1),     # In degrees
+                        'height'  : (20, 80, 0.5),    # In meters
+                        'txPower' : (30, 50, 0.1)}    # In dBm
+
+COVERAGE_WEIGHT = 1.0       # weight of coverage probability in the objective
+SGNL_IX_WEIGHT = 1.0        # weight of share of road with S/I > 10dB in the objective
+
+
+#------------------------------------------------------------------
+# Objective function
+#------------------------------------------------------------------
+@functools.lru_cache(maxsize=4096)
+def _getBstnRSL(iBstn, bstnPosition, tilt, height, txPower, resolution):
+    """ Median RSL of one base station, cached so that a station whose parameters did
+        not change is not computed again when other stations are varied """
+
+    rsl = rslProfile.computeBstnRSL(iBstn, bstnPosition, tilt, height, txPower, resolution)
+    rsl.flags.writeable = False
+
+    return rsl
+
+
+def evaluateConfiguration(bstnParams, bstnPositions, coverageWeight = COVERAGE_WEIGHT, sgnlIxWeight = SGNL_IX_WEIGHT, \
+                          resolution = cfg.RSL_TABLE_RESOLUTION, rxThreshold = cfg.RX_THRESHOLD):
+    """ Returns (objective, coverage, share of S/I > 10dB) of a configuration
+
+        Input:
+            1. bstnParams - tuple of (tilt, height, txPower) of every base station
+            2. bstnPositions - tuple of positions of the base stations along the road (in meters)
+            3. coverageWeight, sgnlIxWeight - weights of the objective
+            4. resolution - distance between positions at which RSL is evaluated (in meters)
+            5. rxThreshold - minimum RSL of a call (in dBm) """
+
+    medianRSL = np.stack([_getBstnRSL(iBstn, bstnPositions[iBstn], tilt, height, txPower, resolution) \
+                          for iBstn, (tilt, height, txPower) in enumerate(bstnParams)])
+
+    estimate = ce.estimateFromMedianRSL(None, list(range(len(bstnParams))), rslProfile.getProfilePositions(resolution), \
+                                        medianRSL, rxThreshold)
+
+    coverage = estimate.getCoverage()
+    sgnlIxShare = estimate.getSgnlIxShares()['gt10dB']
+
+    return coverageWeight * coverage + sgnlIxWeight * sgnlIxShare, coverage, sgnlIxShare
+
+
+def _evaluateCandidate(args):
+    """ evaluateConfiguration with one argument (for the process pool) """
+
+    return evaluateConfiguration(*args)
+
+
+#------------------------------------------------------------------
+# Class to hold the result of an optimization
+#------------------------------------------------------------------
+class OptimizationResult:
+
+    def __init__(self, bstnIDs, bstnParams, objective, coverage, sgnlIxShare, numOfEvaluations, numOfCacheHits, elapsedTime):
+
+        self.bstnIDs = bstnIDs                      # IDs of the base stations
+        self.objective = objective                  # value of the objective at the optimum
+        self.coverage = coverage                    # expected fraction of road covered
+        self.sgnlIxShare = sgnlIxShare              # expected share of road with S/I > 10dB
+        self.numOfEvaluations = numOfEvaluations    # configurations evaluated
+        self.numOfCacheHits = numOfCacheHits        # candidates found in the cache
+        self.elapsedTime = elapsedTime              # wall clock time taken (in seconds)
+
+        #Optimal parameters of each base station with key as base station ID
+        self.params = {bstnID: dict(zip(('tilt', 'height', 'txPower'), params)) \
+                       for bstnID, params in zip(bstnIDs, bstnParams)}
+
+    def getTilts(self):
+        """ Returns dictionary of optimal tilt with key as base station ID """
+
+        return {bstnID: params['tilt'] for bstnID, params in self.params.items()}
+
+
+#------------------------------------------------------------------
+# Tilt optimizer
+#------------------------------------------------------------------
+class TiltOptimizer:
+
+    def __init__(self, numOfBstns = cfg.NUM_OF_BSTNS, parameters = ('tilt',), coverageWeight = COVERAGE_WEIGHT, \
+                 sgnlIxWeight = SGNL_IX_WEIGHT, gridSize = 9, workers = 1, resolution = cfg.RSL_TABLE_RESOLUTION, \
+                 rxThreshold = cfg.RX_THRESHOLD):
+        """ Constructor is called when instantiating the object
+
+            Input:
+                1. numOfBstns - number of base stations spaced evenly along the road
+                2. parameters - names of the parameters optimized for every base station
+                                (any of OPTIMIZER_PARAMETERS), others keep config.py values
+                3. coverageWeight, sgnlIxWeight - weights of the objective
+                4. gridSize - number of candidates of each grid
+                5. workers - number of worker processes evaluating the candidates of a grid
+                             (1 - evaluated in this process, None - all the cores)
+                6. resolution - distance between positions at which RSL is evaluated (in meters)
+                7. rxThreshold - minimum RSL of a call (in dBm) """
+
+        for name in parameters:
+            if name not in OPTIMIZER_PARAMETERS:
+                raise ValueError('Unknown parameter {0!r}, must be one of {1}'.format(name, list(OPTIMIZER_PARAMETERS)))
+
+        if gridSize < 3:
+            raise ValueError('gridSize must be at least 3, got {0}'.format(gridSize))
+
+        self._parameters = list(parameters)
+        self._bstnPositions = tuple(float(pos) for pos in np.linspace(0, cfg.ROAD_LENGTH, numOfBstns))
+        self._coverageWeight = coverageWeight
+        self._sgnlIxWeight = sgnlIxWeight
+        self._gridSize = gridSize
+        self._workers = workers
+        self._resolution = resolution
+        self._rxThreshold = rxThreshold
+
+        self._cache = {}            # configuration -> (objective, coverage, share of S/I > 10dB)
+        self._numOfCacheHits = 0
+
+    def getNumOfEvaluations(self):
+        return len(self._cache)
+
+    def evaluate(self, candidates, executor = None):
+        """ Returns list of (objective, coverage, share of S/I > 10dB) of the candidate
+            configurations. Configurations not in the cache are evaluated (on the executor
+            if given) and added to the cache """
+
+        pending = list(dict.fromkeys(candidate for candidate in candidates if candidate not in self._cache))
+        self._numOfCacheHits += len(candidates) - len(pending)
+
+        args = [(candidate, self._bstnPositions, self._coverageWeight, self._sgnlIxWeight, \
+                 self._resolution, self._rxThreshold) for candidate in pending]
+
+        if executor is not None and len(pending) > 1:
+            chunkSize = max(1, len(pending)//(4*(self._workers or os.cpu_count())))
+            values = list(executor.map(_evaluateCandidate, args, chunksize=chunkSize))
+        else:
+            values = [_evaluateCandidate(arg) for arg in args]
+
+        self._cache.update(zip(pending, values))
+
+        return [self._cache[candidate] for candidate in candidates]
+
+    def optimize(self, initial = None):
+        """ Searches the optimal parameters with a coarse to fine grid. Every round, for
+            each base station and parameter in turn, 'gridSize' values around the current
+            best value are evaluated (all others fixed) and the best one is kept. The first
+            grid covers the whole range of the parameter, and each round shrinks the grid to
+            two steps of the previous one, until the step is below the final step of
+            OPTIMIZER_PARAMETERS. Values are rounded to the final step, so configurations of
+            different rounds are shared through the cache.
+
+            Input:
+                1. initial - optional tuple of (tilt, height, txPower) of every base station
+                             (default: middle of tilt range, height and power from config.py)
+
+            Output:
+                OptimizationResult object """
+
+        tStart = time.perf_counter()
+
+        numOfBstns = len(self._bstnPositions)
+        parameterIndex = {'tilt': 0, 'height': 1, 'txPower': 2}
+
+        if initial is None:
+            tiltLow, tiltHigh, tiltStep = OPTIMIZER_PARAMETERS['tilt']
+            initial = ((_snap((tiltLow + tiltHigh)/2, tiltStep), float(cfg.BSTN_HEIGHT), float(cfg.TX_POWER)),) * numOfBstns
+
+        current = tuple(tuple(float(value) for value in params) for params in initial)
+        spans = {name: OPTIMIZER_PARAMETERS[name][1] - OPTIMIZER_PARAMETERS[name][0] for name in self._parameters}
+
+        executor = None
+        if self._workers != 1:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=self._workers)
+
+        try:
+            bDone = False
+
+            while not bDone:
+            #{ Start of while loop
+                for iBstn in range(numOfBstns):
+                    for name in self._parameters:
+                        low, high, step = OPTIMIZER_PARAMETERS[name]
+                        value = current[iBstn][parameterIndex[name]]
+
+                        #Grid of values around current value (whole range in first round)
+                        gridLow = max(low, value - spans[name]/2)
+                        gridHigh = min(high, value + spans[name]/2)
+
+                        values = sorted({_snap(candidate, step) for candidate in np.linspace(gridLow, gridHigh, self._gridSize)} \
+                                        | {value})
+
+                        candidates = [_replace(current, iBstn, parameterIndex[name], candidate) for candidate in values]
+                        objectives = [result[0] for result in self.evaluate(candidates, executor)]
+
+                        #Keep current value unless another one is strictly better
+                        iBest = int(np.argmax(objectives))
+                        if objectives[iBest] > objectives[values.index(value)]:
+                            current = candidates[iBest]
+
+                #Shrink the grids to two steps of this round
+                bDone = True
+
+                for name in self._parameters:
+                    gridStep = spans[name]/(self._gridSize - 1)
+
+                    if gridStep > OPTIMIZER_PARAMETERS[name][2]:
+                        spans[name] = 2*gridStep
+                        bDone = False
+            #} End of while loop
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        objective, coverage, sgnlIxShare = self.evaluate([current])[0]
+
+        bstnIDs = [bstn.getBstnID(iBstn, numOfBstns) for iBstn in range(numOfBstns)]
+
+        return OptimizationResult(bstnIDs, current, objective, coverage, sgnlIxShare, len(self._cache), \
+                                  self._numOfCacheHits, time.perf_counter() - tStart)
+
+
+def _snap(value, step):
+    """ Rounds value to a multiple of step (rounded again to remove floating point noise) """
+
+    return round(round(value/step) * step, 9)
+
+
+def _replace(bstnParams, iBstn, index, value):
+    """ Returns copy of bstnParams with parameter 'index' of base station iBstn set to value """
+
+    params = list(bstnParams[iBstn])
+    params[index] = value
+
+    return bstnParams[:iBstn] + (tuple(params),) + bstnParams[iBstn + 1:]
+
+
+#------------------------------------------------------------------
+# Command line interface
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Search the antenna tilts (and optionally heights and transmit powers) ' \
+                                                 'that maximize coverage and share of road with S/I > 10dB')
+
+    parser.add_argument('--bstns', dest='numOfBstns', type=int, default=cfg.NUM_OF_BSTNS, \
+                        help='Number of base stations spaced evenly along the road (default: %(default)s)')
+    parser.add_argument('--height', action='store_true', help='Also optimize the height of base stations')
+    parser.add_argument('--tx-power', dest='txPower', action='store_true', help='Also optimize the transmit power')
+    parser.add_argument('--coverage-weight', dest='coverageWeight', type=float, default=COVERAGE_WEIGHT)
+    parser.add_argument('--sgnlix-weight', dest='sgnlIxWeight', type=float, default=SGNL_IX_WEIGHT)
+    parser.add_argument('--grid-size', dest='gridSize', type=int, default=9, help='Candidates per grid (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: %(default)s, 0 - all the cores)')
+    parser.add_argument('--resolution', type=float, default=10, \
+                        help='Distance between positions at which RSL is evaluated in meters (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    parameters = ['tilt'] + (['height'] if args.height else []) + (['txPower'] if args.txPower else [])
+
+    optimizer = TiltOptimizer(args.numOfBstns, parameters, args.coverageWeight, args.sgnlIxWeight, args.gridSize, \
+                              args.workers or None, args.resolution)
+    result = optimizer.optimize()
+
+    for bstnID, params in result.params.items():
+        print('BSTN-{0}: tilt = {1:g} degrees, height = {2:g} m, TX power = {3:g} dBm'.format( \
+              bstnID, params['tilt'], params['height'], params['txPower']))
+
+    print('objective = {0:.4f}, coverage = {1:.2f}%, S/I > 10dB = {2:.2f}%'.format( \
+          result.objective, 100*result.coverage, 100*result.sgnlIxShare))
+    print('{0} configurations evaluated ({1} cache hits) in {2:.2f} seconds'.format( \
+          result.numOfEvaluations, result.numOfCacheHits, result.elapsedTime))
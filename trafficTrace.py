@@ -0,0 +1,311 @@
+###################################################################
+# trafficTrace.py
+#
+# This python module contains the recorder and replayer of traffic
+# trace files. A traffic trace keeps the random inputs of a run:
+# every call request (time, position, direction, call duration and
+# speed) and optionally the seed of the fading values. Fading values
+# are keyed by (call, time step, base station), so they stay the same
+# for a link even when a replay with another tilt has other calls in
+# progress. A run can then be replayed on the same traffic with
+# another tilt or another version of the code, so that the difference
+# of the results is not hidden by the noise of independent random
+# numbers. Records are written in buffered chunks and read back with
+# np.memmap, so traces of long runs do not have to fit in memory.
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import utilities as util
+import config as cfg
+import numpy as np
+import json
+import os
+
+
+#------------------------------------------------------------------
+# Trace file format
+#------------------------------------------------------------------
+# [8 bytes magic][4 bytes header length (little endian)][JSON header][padding]
+# [records of CALL_DTYPE ...]
+# Records start at a multiple of TRAFFIC_ALIGNMENT bytes. Record i is the call request
+# of call ID i. The header keeps 'fadeSeed' (None if fading values are not recorded).
+
+TRAFFIC_MAGIC = b'TRAFIC02'
+TRAFFIC_ALIGNMENT = 64
+
+CALL_DTYPE = np.dtype([('time',      '<f8'),   # simulation time of the request (in seconds)
+                       ('position',  '<f8'),   # position on the road (in meters)
+                       ('direction', '<i1'),   # +1 if moving from left to right, else -1
+                       ('duration',  '<f8'),   # call duration (in seconds)
+                       ('speed',     '<f8')])  # speed of the user (in meter per sec)
+
+
+
+#------------------------------------------------------------------
+# Fading values keyed by call, time step and base station
+#------------------------------------------------------------------
+def _mix64(values):
+    """ SplitMix64 finalizer, maps uint64 array to well mixed uint64 array """
+
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return values ^ (values >> np.uint64(31))
+
+
+def keyedFades(fadeSeed, callIds, step, bstnIndex):
+    """ Returns fading values (same distribution as util.rayleighFadingInvCDF) which depend
+        only on the seed, call ID, time step and base station index (a hash of the key is
+        the uniform sample), so the same link gets the same value in every run
+
+        Input:
+            1. fadeSeed - seed of the fading values of the trace
+            2. callIds - array of call IDs, one per row of bstnIndex
+            3. step - time step (simulation time / SIMULATION_STEP_SIZE)
+            4. bstnIndex - array of base station indices (calls x ...)
+
+        Output:
+            numpy array of fading values in dB, shape of bstnIndex """
+
+    bstnIndex = np.asarray(bstnIndex, dtype=np.int64)
+    callIds = np.asarray(callIds, dtype=np.int64).reshape((-1,) + (1,)*(bstnIndex.ndim - 1))
+
+    keys = _mix64(np.full(bstnIndex.shape, fadeSeed, dtype=np.uint64))
+    keys = _mix64(keys ^ callIds.astype(np.uint64))
+    keys = _mix64(keys ^ np.uint64(step))
+    keys = _mix64(keys ^ bstnIndex.astype(np.uint64))
+
+    #53 bits of the hash as uniform sample in (0, 1)
+    uniform = ((keys >> np.uint64(11)).astype(float) + 0.5) * 2.0**-53
+
+    return util.fadeFromUniform(uniform)
+
+
+def _getFadeSource(fadeSeed, time):
+    """ Returns function(callIds, bstnIndex) of keyed fading values at 'time' (None if
+        fadeSeed is None, fading values are then drawn with np.random) """
+
+    if fadeSeed is None:
+        return None
+
+    step = int(round(time/cfg.SIMULATION_STEP_SIZE))
+
+    return lambda callIds, bstnIndex: keyedFades(fadeSeed, callIds, step, bstnIndex)
+
+
+def _writeHeader(fp, magic, header):
+    """ Writes magic, header length and JSON header (padded to TRAFFIC_ALIGNMENT) """
+
+    header = json.dumps(header).encode()
+    padding = (-(len(magic) + 4 + len(header))) % TRAFFIC_ALIGNMENT
+
+    fp.write(magic)
+    fp.write(np.uint32(len(header) + padding).astype('<u4').tobytes())
+    fp.write(header + b' ' * padding)
+    return
+
+
+def _openRecords(filepath, magic, dtype):
+    """ Returns (memmap of the records of the file, header dictionary) """
+
+    with open(filepath, 'rb') as fp:
+        if fp.read(len(magic)) != magic:
+            raise ValueError('{0} is not a traffic trace file'.format(filepath))
+
+        headerLen = int(np.frombuffer(fp.read(4), dtype='<u4')[0])
+        header = json.loads(fp.read(headerLen).decode())
+
+    offset = len(magic) + 4 + headerLen
+
+    if os.path.getsize(filepath) == offset:
+        return np.zeros(0, dtype=dtype), header    #np.memmap can not map an empty file
+
+    return np.memmap(filepath, dtype=dtype, mode='r', offset=offset), header
+
+
+#------------------------------------------------------------------
+# Class to buffer records and write them in chunks
+#------------------------------------------------------------------
+class _ChunkWriter:
+
+    def __init__(self, filepath, magic, header, dtype, chunkSize):
+
+        self._buffer = np.empty(chunkSize, dtype=dtype)
+        self._numBuffered = 0
+        self._numWritten = 0
+
+        self._fp = open(filepath, 'wb')
+        _writeHeader(self._fp, magic, header)
+
+    def add(self, records):
+        """ Adds records (array of the dtype of the file, or values of its fields) """
+
+        start = 0
+
+        while start < len(records):
+            count = min(len(records) - start, len(self._buffer) - self._numBuffered)
+
+            self._buffer[self._numBuffered:self._numBuffered + count] = records[start:start + count]
+            self._numBuffered += count
+            start += count
+
+            if self._numBuffered == len(self._buffer):
+                self.flush()
+
+        return
+
+    def flush(self):
+        self._buffer[:self._numBuffered].tofile(self._fp)
+        self._numWritten += self._numBuffered
+        self._numBuffered = 0
+        self._fp.flush()
+        return
+
+    def getNumOfRecords(self):
+        return self._numWritten + self._numBuffered
+
+    def close(self):
+        if not self._fp.closed:
+            self.flush()
+            self._fp.close()
+        return
+
+
+#------------------------------------------------------------------
+# Class to draw the traffic and record it
+#------------------------------------------------------------------
+class TrafficRecorder:
+
+    def __init__(self, filepath, recordFades = True, chunkSize = 65536):
+        """ Draws the random inputs of the simulation (np.random) and writes them to
+            the trace file. Call duration and speed are drawn for every call request
+            (also the ones which are not established), so that a replay with another
+            tilt has them for every request.
+
+            Input:
+                1. filepath - path of the trace file (overwritten if exists)
+                2. recordFades - boolean flag to say whether to record the fading values.
+                                 A seed is drawn and saved, and fading values are keyed
+                                 by (call, time step, base station) with it (see keyedFades)
+                3. chunkSize - number of records buffered before writing """
+
+        self._fadeSeed = int(np.random.randint(2**31)) if recordFades else None
+
+        header = {'stepSize': cfg.SIMULATION_STEP_SIZE, 'roadLength': cfg.ROAD_LENGTH, 'fadeSeed': self._fadeSeed, \
+                  'dtype': CALL_DTYPE.descr}
+
+        self._calls = _ChunkWriter(filepath, TRAFFIC_MAGIC, header, CALL_DTYPE, chunkSize)
+
+    def getCallRequests(self, time, numOfInactiveUsers, probability):
+        """ Draws the call requests of inactive users at 'time' (one binomial draw for all
+            of them) and records them
+
+            Output:
+                (array of positions, array of directions, array of call durations,
+                 array of speeds), one value per call request """
+
+        numOfCallers = np.random.binomial(numOfInactiveUsers, probability)
+
+        records = np.empty(numOfCallers, dtype=CALL_DTYPE)
+        records['time'] = time
+        records['position'] = np.random.uniform(0, cfg.ROAD_LENGTH, numOfCallers)
+        records['direction'] = np.where(records['position'] > cfg.ROAD_LENGTH/2, -1, 1)
+        records['duration'] = np.random.exponential(cfg.AVG_CALL_DURATION, numOfCallers)
+        records['speed'] = np.random.normal(cfg.MOBILE_SPEED_MEAN, cfg.MOBILE_SPEED_STD, numOfCallers)
+
+        self._calls.add(records)
+
+        return records['position'], records['direction'], records['duration'], records['speed']
+
+    def getFadeSource(self, time):
+        """ Returns function(callIds, bstnIndex) of the fading values at 'time' (None if
+            fading values are not recorded) """
+
+        return _getFadeSource(self._fadeSeed, time)
+
+    def getNumOfCalls(self):
+        return self._calls.getNumOfRecords()
+
+    def close(self):
+        self._calls.close()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+
+#------------------------------------------------------------------
+# Class to replay the traffic of a trace file
+#------------------------------------------------------------------
+class TrafficReplayer:
+
+    def __init__(self, filepath):
+        """ Opens the trace file as a memory mapped array, records are read from disk
+            only when they are used
+
+            Input:
+                1. filepath - path of the trace file """
+
+        self._calls, header = _openRecords(filepath, TRAFFIC_MAGIC, CALL_DTYPE)
+
+        if header['stepSize'] != cfg.SIMULATION_STEP_SIZE or header['roadLength'] != cfg.ROAD_LENGTH:
+            raise ValueError('{0} was recorded with another step size or road length'.format(filepath))
+
+        self._fadeSeed = header['fadeSeed']
+        self._callCursor = 0            # first call request not replayed yet
+
+    def getCallRequests(self, time, numOfInactiveUsers = None, probability = None):
+        """ Returns the recorded call requests at 'time' (same output as
+            TrafficRecorder.getCallRequests). The requests do not depend on the
+            number of inactive users of the replay, so the offered traffic is the same """
+
+        #Requests are in order of time, search for the end of this step in windows after the
+        #cursor (searching the whole memmap would copy the column of times every step)
+        start = end = self._callCursor
+        windowSize = 1024
+
+        while end < len(self._calls):
+            times = np.array(self._calls['time'][end:end + windowSize])
+            count = int(np.searchsorted(times, time, side='right'))
+            end += count
+
+            if count < len(times):
+                break
+
+            windowSize *= 2
+
+        records = np.array(self._calls[start:end])
+        self._callCursor = end
+
+        return records['position'], records['direction'].astype(int), records['duration'], records['speed']
+
+    def getFadeSource(self, time):
+        """ Returns function(callIds, bstnIndex) of the recorded fading values at 'time'.
+            Values of a link (call, time step, base station) are the same as in the recorded
+            run and in every other replay, whatever other calls are in progress. None if
+            fading values were not recorded (they are then drawn with np.random) """
+
+        return _getFadeSource(self._fadeSeed, time)
+
+    def getNumOfCalls(self):
+        return len(self._calls)
+
+    def close(self):
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
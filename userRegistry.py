@@ -0,0 +1,127 @@
+###################################################################
+# userRegistry.py
+#
+# This python module contains the declaration and definition of
+# UserRegistry class, which keeps track of the state (active,
+# archived or inactive) of the users with constant time transitions
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import numpy as np
+import enum
+
+
+#-------------------------------------------------------------------
+# Enums class for user states
+#-------------------------------------------------------------------
+class UserState(enum.IntEnum):
+    INACTIVE = 0
+    ACTIVE   = 1
+    ARCHIVED = 2
+
+
+class UserRegistry:
+
+    def __init__(self, capacity = 0):
+        """ Constructor is called when instantiating the object
+
+            Every user (integer ID from 0) is a member of one state. Members of each
+            state are kept in a dense array, and the index of every user inside its
+            array is remembered, so that a user is moved between states in constant
+            time (the last member is swapped into the hole left behind).
+
+            Input:
+                1. capacity - number of user IDs to allocate arrays for (grows
+                              automatically when bigger IDs are seen) """
+
+        self._state = np.full(capacity, -1, dtype=np.int8)   # state of each user (-1 if never registered)
+        self._index = np.full(capacity, -1, dtype=np.int64)  # index of user in members array of its state
+        self._members = [np.empty(capacity, dtype=np.int64) for state in UserState]
+        self._counts = [0] * len(UserState)
+
+    def getState(self, userId):
+        """ Returns state of the user (None if user is not registered) """
+
+        if userId >= len(self._state) or self._state[userId] < 0:
+            return None
+
+        return UserState(self._state[userId])
+
+    def count(self, state):
+        return self._counts[state]
+
+    def members(self, state):
+        """ Returns copy of the user IDs in 'state'. As it is a copy, it is safe to change
+            the state of the users while looping through it (order is not defined) """
+
+        return self._members[state][:self._counts[state]].copy()
+
+    def setState(self, userId, state):
+        """ Moves the user to 'state' (registers the user if not yet registered) """
+
+        if userId >= len(self._state):
+            self._grow(userId + 1)
+
+        oldState = self._state[userId]
+
+        if oldState == state:
+            return
+
+        #1. Remove from old state, last member of old state takes the place of user
+        if oldState >= 0:
+            index = self._index[userId]
+            lastIndex = self._counts[oldState] - 1
+            lastUser = self._members[oldState][lastIndex]
+
+            self._members[oldState][index] = lastUser
+            self._index[lastUser] = index
+            self._counts[oldState] = lastIndex
+
+        #2. Append to new state
+        self._members[state][self._counts[state]] = userId
+        self._index[userId] = self._counts[state]
+        self._counts[state] += 1
+        self._state[userId] = state
+
+        return
+
+    def moveAll(self, fromState, toState):
+        """ Moves all the users of 'fromState' to 'toState' (cost depends only on number
+            of users moved) """
+
+        if fromState == toState:
+            return
+
+        numMoved = self._counts[fromState]
+        moved = self._members[fromState][:numMoved]
+        start = self._counts[toState]
+
+        self._members[toState][start:start + numMoved] = moved
+        self._index[moved] = np.arange(start, start + numMoved)
+        self._state[moved] = toState
+
+        self._counts[toState] += numMoved
+        self._counts[fromState] = 0
+
+        return
+
+    def _grow(self, minCapacity):
+        """ Grows the arrays (at least doubles) to hold 'minCapacity' user IDs """
+
+        oldCapacity = len(self._state)
+        newCapacity = max(minCapacity, 2 * oldCapacity)
+
+        self._state = np.concatenate((self._state, np.full(newCapacity - oldCapacity, -1, dtype=np.int8)))
+        self._index = np.concatenate((self._index, np.full(newCapacity - oldCapacity, -1, dtype=np.int64)))
+
+        for state in UserState:
+            members = np.empty(newCapacity, dtype=np.int64)
+            members[:self._counts[state]] = self._members[state][:self._counts[state]]
+            self._members[state] = members
+
+        return
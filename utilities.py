@@ -10,8 +10,8 @@
 #
 ###################################################################
 
+import math
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 #-------------------------------------------------------------------
@@ -35,6 +35,15 @@ class StatName(enum.Enum):
     HANDOFF_RQTS_REJECTED               = 12
     
 
+#-------------------------------------------------------------------
+# Enums class for area types of path loss models
+#-------------------------------------------------------------------
+class AreaType(enum.IntEnum):
+    URBAN     = 0     # Small or medium city
+    SUBURBAN  = 1
+    RURAL     = 2
+
+
 #-------------------------------------------------------------------
 # Okamura-Hata Model
 #-------------------------------------------------------------------
@@ -46,11 +55,11 @@ def okamuraHata(d, f, Hb, Hm, corrFactor = 0):
           2. f - frequency in MHz
           3. Hb - height of base station from the ground (in meters)
           4. Hm - height of the mobile from the ground (in meters)
-          5. corrFactor - Correction factor,
-                          default value = 0 (Small or medium city)
-                               if value = 1 (Sub urban)
-                                  value = 2 (Rural)
-                          #TODO: use enums to make the code more clean 
+          5. corrFactor - Correction factor (AreaType or its integer value),
+                          default value = 0 (AreaType.URBAN, small or medium city)
+                               if value = 1 (AreaType.SUBURBAN)
+                                  value = 2 (AreaType.RURAL)
+          (pathLoss.py has the same model with the constant terms precomputed)
 
         Output: path loss based on Okamura-Hata propagation model in dB
     """
@@ -60,10 +69,10 @@ def okamuraHata(d, f, Hb, Hm, corrFactor = 0):
     pL50 = 69.55 + 26.16*(np.log10(f)) - 13.82*(np.log10(Hb)) + (44.9 - 6.55*(np.log10(Hb)))*(np.log10(d)) - A_Hm 
 
     #Correction Factor computation:
-    if corrFactor == 1:
+    if corrFactor == AreaType.SUBURBAN:
         pL50 = pL50 - 2*((np.log10(f/28))**2) - 5.4
 
-    elif corrFactor == 2:
+    elif corrFactor == AreaType.RURAL:
         pL50 = pL50 - 4.78*((np.log10(f))**2) + 18.33*((np.log10(f))) - 40.95
 
     else:
@@ -96,17 +105,13 @@ def shadowing(sampleSize, mean = 2, std = 2, seedVal = 0, useSeed = False):
     #As the shadowing values depends on surroundings, 
     #these values does not change with different simulation runs.
     #To make sure the shadowing values stays constant across the simulation executions,
-    #setting a pre-defined seed to geneate same set of values all the time
+    #a random generator of its own with a pre-defined seed is used to geneate same set of values all the time
     #This makes the executions comparable (for different input values in differnt simulations)
+    #and the global random state of the simulation is not touched (same values as np.random.seed(seedVal))
     if useSeed == True:
-        np.random.seed(seedVal)
-    
-    #Generate samples
-    samples = np.random.normal(mean, std, sampleSize)
-       
-    #Reset the effect of random seed (So that other random functions are not affected)
-    if useSeed == True:
-        np.random.seed()
+        samples = np.random.RandomState(seedVal).normal(mean, std, sampleSize)
+    else:
+        samples = np.random.normal(mean, std, sampleSize)
 
     return samples
 
@@ -114,20 +119,37 @@ def shadowing(sampleSize, mean = 2, std = 2, seedVal = 0, useSeed = False):
 #-------------------------------------------------------------------
 # Fading (using Rayleigh distribution)
 #-------------------------------------------------------------------
-def rayleighFading():
+def rayleighFading(size = None):
     
     """ This function generates two arrays of random samples. One for real and other 
         for imaginary part of size 10 using gaussian distribution with
         mean = zero and unit varience (which means std = 1). The magnitude is then 
         computed for generating complex gaussian distribution.
 
+        Input:
+          1. size - Number of fading values to be generated in one call
+                    (default value = None, returns a single value)
+
         Output: 
-                Fading value in dB
+                Fading value in dB (numpy array of fading values if size is given)
 
         (To make the system survice the isolated deep fade, the second least value is 
-        reported as the fading value)"""
+        reported as the fading value)
+
+        Note: A call with size = N consumes the random numbers in the same order 
+        as N calls with size = None, so both give the same values for a fixed seed."""
 
     mean, std = 0.0, 1.0
+
+    if size is not None:
+        #Row i holds [real parts, imaginary parts] of the i-th fading value
+        samples = np.random.normal(mean, std, (size, 2, 10))
+        rayleigh = np.abs(samples[:, 0, :] + samples[:, 1, :]*(1j))
+
+        #Second least value of each row
+        rayleigh = np.sort(rayleigh, axis=1)
+
+        return 20 * (np.log10(rayleigh[:, 1]))
     
     x = np.random.normal(mean, std, 10)
     y = np.random.normal(mean, std, 10)
@@ -146,6 +168,143 @@ def rayleighFading():
     return fadeInDB
 
 
+#-------------------------------------------------------------------
+# Fading (using inverse CDF of the second least Rayleigh value)
+#-------------------------------------------------------------------
+FADE_INV_CDF_TABLE_SIZE = 4097  # Number of points in inverse CDF table
+
+_fadeInvCDFTable = None  # Built on first use
+
+def _secondLeastCDF(p):
+    """ CDF of the second least of 10 i.i.d. uniform values, evaluated at p.
+        (P(at least two of the 10 values are below p)) """
+
+    return 1 - (1 - p)**10 - 10 * p * ((1 - p)**9)
+
+
+def _secondLeastPDF(p):
+    """ Derivative of _secondLeastCDF with respect to p """
+
+    return 90 * p * ((1 - p)**8)
+
+
+def fadeCDF(fadeInDB):
+    """ Closed form CDF of the fading value generated by rayleighFading.
+
+        Each Rayleigh magnitude r (unit varience real and imaginary parts) has 
+        CDF F(r) = 1 - exp(-r^2/2), so the second least of 10 values is below r
+        with probability _secondLeastCDF(F(r)).
+
+        Input:
+          1. fadeInDB - fading value (or numpy array of values) in dB
+
+        Output: Probability that the fading value is less than or equal to fadeInDB"""
+
+    rSquare = 10**(np.asarray(fadeInDB, dtype=float)/10)
+    p = -np.expm1(-rSquare/2)
+
+    return _secondLeastCDF(p)
+
+
+def _getFadeInvCDFTable():
+    """ Returns the inverse CDF table of rayleighFadingInvCDF (built on first use) """
+
+    global _fadeInvCDFTable
+
+    if _fadeInvCDFTable is None:
+        #Solve _secondLeastCDF(p) = u for the u values in the table (using bisection)
+        uValues = np.linspace(0, 1, FADE_INV_CDF_TABLE_SIZE)
+        low, high = np.zeros(FADE_INV_CDF_TABLE_SIZE), np.ones(FADE_INV_CDF_TABLE_SIZE)
+
+        for iCount in range(60):
+            mid = (low + high)/2
+            below = _secondLeastCDF(mid) < uValues
+            low = np.where(below, mid, low)
+            high = np.where(below, high, mid)
+
+        _fadeInvCDFTable = (low + high)/2
+
+    return _fadeInvCDFTable
+
+
+def rayleighFadingInvCDF(size = None):
+
+    """ Generates fading values with the same distribution as rayleighFading, 
+        using one uniform random sample per fading value instead of 20 gaussian 
+        samples and a sort.
+
+        The uniform sample u is mapped to p (CDF value of a single Rayleigh magnitude)
+        using a precomputed inverse CDF table of the second least order statistic,
+        refined with one newton step. The fading value is then obtained in closed 
+        form from p.
+
+        Input:
+          1. size - Number of fading values to be generated in one call
+                    (default value = None, returns a single value)
+
+        Output:
+                Fading value in dB (numpy array of fading values if size is given)
+
+        Note: A call with size = N uses the same random numbers as N calls with 
+        size = None for a fixed seed, and gives the same values up to floating 
+        point rounding."""
+
+    table = _getFadeInvCDFTable()
+    
+    if size is None:
+        #Single value, plain float arithmetic is faster than numpy for scalars
+        u = np.random.uniform()
+
+        #1. Lookup p from the table and refine with newton step
+        x = u * (FADE_INV_CDF_TABLE_SIZE - 1)
+        index = min(int(x), FADE_INV_CDF_TABLE_SIZE - 2)
+        p = table[index] + (x - index) * (table[index + 1] - table[index])
+
+        pdf = _secondLeastPDF(p)
+        if pdf > 0:
+            pNewton = p - (_secondLeastCDF(p) - u)/pdf
+            if 0 < pNewton < 1 and abs(_secondLeastCDF(pNewton) - u) < abs(_secondLeastCDF(p) - u):
+                p = pNewton
+
+        #Keep p away from 0 and 1 (fading of -inf or +inf dB)
+        p = min(max(p, 1e-300), 1 - 1e-16)
+
+        #2. Rayleigh magnitude square from p and convert to decibles
+        return 10 * math.log10(-2 * math.log1p(-p))
+
+    return fadeFromUniform(np.random.uniform(size=size))
+
+
+def fadeFromUniform(u):
+    """ Maps uniform samples 'u' (numpy array, 0 <= u < 1) to fading values in dB with the
+        inverse CDF of rayleighFadingInvCDF (same values for the same uniform samples). Used
+        with uniform samples which do not come from np.random (see trafficTrace.py) """
+
+    table = _getFadeInvCDFTable()
+
+    u = np.asarray(u, dtype=float)
+
+    #1. Lookup p from the table and refine with newton step
+    x = u * (FADE_INV_CDF_TABLE_SIZE - 1)
+    index = np.minimum(x.astype(int), FADE_INV_CDF_TABLE_SIZE - 2)
+    p = table[index] + (x - index) * (table[index + 1] - table[index])
+
+    pdf = _secondLeastPDF(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pNewton = p - (_secondLeastCDF(p) - u)/pdf
+        bImproved = np.abs(_secondLeastCDF(pNewton) - u) < np.abs(_secondLeastCDF(p) - u)
+
+    p = np.where((pdf > 0) & (pNewton > 0) & (pNewton < 1) & bImproved, pNewton, p)
+
+    #Keep p away from 0 and 1 (fading of -inf or +inf dB)
+    p = np.clip(p, 1e-300, 1 - 1e-16)
+
+    #2. Rayleigh magnitude square from p and convert to decibles
+    fadeInDB = 10 * np.log10(-2 * np.log1p(-p))
+
+    return fadeInDB
+
+
 #-------------------------------------------------------------------
 # Function to calculate EIRP in mobile direction
 #-------------------------------------------------------------------
@@ -196,6 +355,46 @@ def calculateEIRP(EIRP_boreSight, tiltAngle, Hb, Hm, dstFromBstn, vertDiscrmData
     return actualEIRP
 
 
+#-------------------------------------------------------------------
+# Function to calculate EIRP in mobile direction for array of distances
+#-------------------------------------------------------------------
+def calculateEIRPArray(EIRP_boreSight, tiltAngle, Hb, Hm, dstFromBstn, vertDiscrmData):
+
+    """Vectorized version of calculateEIRP. Computes the actual EIRP for an array
+       of distances in one pass, using the same interpolation as calculateEIRP
+       (so both return the same values for the same distance)
+
+       Input:
+         1. EIRP_boreSight - EIRP in the direction of bore sight.
+         2. tiltAngle - Angle by which antenna is down tilted
+         3. Hb - Height of base station (in meters)
+         4. Hm - Height of mobile (in meters)
+         5. dstFromBstn - numpy array of distances of the mobiles from Base station (in meters)
+         6. vertDiscrmData - a list containg float values of vertical discrimination values for angles 0 to 360
+
+       Output:
+               Returns numpy array of actual EIRP values in dB in the direction of mobiles.   """
+
+    vertDiscrmData = np.asarray(vertDiscrmData)
+
+    #1. Compute angle between tip of the bstn to mobiles
+    gamma = np.rad2deg( np.arctan2((Hb - Hm), np.asarray(dstFromBstn, dtype=float)) )
+
+    #2. Calculate vertical angle discrimination and convert to positive value if negative
+    beta = gamma - tiltAngle
+    beta = np.where(beta < 0, beta + 360, beta)
+
+    #3. Interpolate between the values above and below (exact value for integer angles)
+    x1 = np.floor(beta).astype(int)
+    x2 = np.ceil(beta).astype(int)
+
+    vertDiscrmtn = np.where(x1 == x2, vertDiscrmData[x1], \
+                            ( (beta - x1) * vertDiscrmData[x2] ) + ( (x2 - beta) * vertDiscrmData[x1] ))
+
+    #4. Now Compute the Actual EIRP in the direction of mobiles
+    return EIRP_boreSight - vertDiscrmtn
+
+
 #-------------------------------------------------------------------
 # Function to read vertical discrimination data from file
 #-------------------------------------------------------------------
@@ -304,8 +503,151 @@ def validateFloat(value, addnlCondition = 'all'):
     return bRet
 
 #------------------------------------------------------------------
-# Function to plot S/I values as bar graph
+# Function to count S/I values in each road section
+#------------------------------------------------------------------
+ROAD_SECTION_SIZE = 100  # In meters
+
+def binSgnlIxInfo(data, roadLen):
+    """ This function takes the S/I values obtained at differnt locations 
+        during the call time and counts the number of points which have
+               S/I >= 10dB
+               10dB > S/I >= 5dB
+               S/i < 5dB     for each base station and each section of road
+
+        Input: 
+            1. data - list of tuples [(location, serving base station, S/I value)]
+            2. roadLen - length of road in meters
+
+        Output:
+            Dictionary with base station ID as key and a list of lists as value
+                   [ [count of S/I < 5dB in each section],
+                     [count of 5dB < S/I < 10 dB in each section],
+                     [count of S/I > 10dB in each section] ]  """
+
+    #Columns of the list of tuples as arrays, counted in bulk by the accumulator
+    locations, servingBstns, sgnlIxRatios = zip(*data) if len(data) > 0 else ((), (), ())
+
+    locations = np.array(locations, dtype=float)
+    servingBstns = np.array(servingBstns)
+    sgnlIxRatios = np.array(sgnlIxRatios, dtype=float)
+
+    bstnIDs = ['A', 'B'] + sorted(set(np.unique(servingBstns).tolist()) - {'A', 'B'})
+
+    accumulator = SgnlIxAccumulator(bstnIDs, roadLen)
+    accumulator.add(locations, servingBstns, sgnlIxRatios)
+
+    return {bstnID: counts.tolist() for bstnID, counts in accumulator.asDict().items()}
+
+
+#------------------------------------------------------------------
+# Class to count S/I values in each road section while simulating
+#------------------------------------------------------------------
+class SgnlIxAccumulator:
+
+    def __init__(self, bstnIDs, roadLen, sectionSize = ROAD_SECTION_SIZE):
+        """ Keeps the count of S/I values in each class (S/I < 5dB, 5dB to 10dB, > 10dB)
+            for each base station and each road section in a preallocated numpy array
+            of shape (base stations, 3, road sections). Memory does not depend on the
+            number of S/I values added.
+
+            Input:
+                1. bstnIDs - IDs of the base stations
+                2. roadLen - length of road in meters
+                3. sectionSize - length of road section in meters """
+
+        self._bstnIDs = list(bstnIDs)
+        self._bstnIndex = {bstnID: index for index, bstnID in enumerate(self._bstnIDs)}
+        self._sectionSize = sectionSize
+
+        self.counts = np.zeros((len(self._bstnIDs), 3, roadLen//sectionSize), dtype=np.int64)
+
+    def getBstnIDs(self):
+        return self._bstnIDs
+
+    def getSectionSize(self):
+        return self._sectionSize
+
+    def add(self, positions, bstnIDs, sgnlIx):
+        """ Counts a batch of S/I values
+
+            Input:
+                1. positions - array of locations of the mobiles on road
+                2. bstnIDs - array of serving base station IDs
+                3. sgnlIx - array of S/I values (in dB) """
+
+        if len(positions) == 0:
+            return
+
+        #Map IDs to indices once per distinct ID (not once per sample)
+        uniqueIDs, inverse = np.unique(np.asarray(bstnIDs), return_inverse=True)
+        bstnIndex = np.array([self._bstnIndex[bstnID] for bstnID in uniqueIDs], dtype=int)[inverse]
+
+        self.addByIndex(positions, bstnIndex, sgnlIx)
+        return
+
+    def addByIndex(self, positions, bstnIndex, sgnlIx):
+        """ Same as add(), with the base stations given as indices into getBstnIDs() """
+
+        if len(positions) == 0:
+            return
+
+        numOfSections = self.counts.shape[2]
+
+        sectionIndex = np.minimum((np.asarray(positions)//self._sectionSize).astype(int), numOfSections - 1)
+
+        #0 - S/I <= 5dB, 1 - 5dB < S/I <= 10dB, 2 - S/I > 10dB
+        sgnlIx = np.asarray(sgnlIx)
+        classIndex = (sgnlIx > 5).astype(int) + (sgnlIx > 10)
+
+        flatIndex = (np.asarray(bstnIndex, dtype=int) * 3 + classIndex) * numOfSections + sectionIndex
+        self.counts += np.bincount(flatIndex, minlength=self.counts.size).reshape(self.counts.shape)
+
+        return
+
+    def asDict(self):
+        """ Returns the counts in the format of binSgnlIxInfo (dictionary with base station
+            ID as key and array of [< 5dB, 5dB to 10dB, > 10dB] counts per section as value) """
+
+        return {bstnID: self.counts[index] for index, bstnID in enumerate(self._bstnIDs)}
+
+
 #------------------------------------------------------------------
+# Functions to plot S/I values as bar graph
+#------------------------------------------------------------------
+def _getSgnlIxCounts(data, roadLen):
+    """ Returns the dictionary of S/I counts for an accumulator or a list of tuples """
+
+    if isinstance(data, SgnlIxAccumulator):
+        return data.asDict()
+
+    return binSgnlIxInfo(data, roadLen)
+
+
+def drawSgnlIxBars(axes, counts, bstnID, roadLen):
+    """ Draws the S/I bar graph of one base station on matplotlib axes
+
+        Input:
+            1. axes - matplotlib axes to draw on
+            2. counts - [< 5dB, 5dB to 10dB, > 10dB] counts per road section
+            3. bstnID - ID of the base station (used in the title)
+            4. roadLen - length of road in meters """
+
+    barWidth = 25
+    xaxis = np.arange(ROAD_SECTION_SIZE, roadLen+ROAD_SECTION_SIZE, ROAD_SECTION_SIZE)
+
+    axes.bar(xaxis, counts[0], barWidth, label='< 5dB', color='r')
+    axes.bar(xaxis+barWidth, counts[1], barWidth, label='> 5dB and < 10dB', color='m')
+    axes.bar(xaxis+2*barWidth, counts[2], barWidth, label='> 10dB', color='g')
+    axes.set_xticks(np.arange(0, roadLen+1, ROAD_SECTION_SIZE))
+    axes.tick_params(axis='x', labelrotation=-45)
+    axes.set_xlabel('distances on road (left to right)')
+    axes.set_ylabel('Count')
+    axes.set_title('S/I bar chart for BASE STATION-{0}'.format(bstnID))
+    axes.legend(loc='best', prop={'size': 20})
+
+    return
+
+
 def plotSgnlIxInfo(data, roadLen):
     """ This function takes the S/I values obtained at differnt locations 
         during the call time. Counts the number of points which have
@@ -315,70 +657,83 @@ def plotSgnlIxInfo(data, roadLen):
         and plots a bar graph to classify each section of road block
 
         Input: 
-            1. data - list of tuples [(location, serving base station, S/I value)]
+            1. data - SgnlIxAccumulator object with the counts, or
+                      list of tuples [(location, serving base station, S/I value)]
             2. roadLen - length of road in meters
 
         Output:
             Plots seperate bar graphs for each base station. """
 
-    ROAD_SECTION_SIZE = 100
-    
-    #Maintain a lists of lists for each base station in a dictionary
-    #           [ [count of S/I > 10dB in a section],
-    #             [count of 5dB < S/I < 10 dB],
-    #             [count of S/I > 10dB] ]
-    
-    totalRoadSections = roadLen//ROAD_SECTION_SIZE
+    #pyplot is imported only for interactive plots (headless runs use saveSgnlIxInfo)
+    import matplotlib.pyplot as plt
 
-    dictSgnlIx = {'A': [[0]*totalRoadSections, [0]*totalRoadSections, [0]*totalRoadSections] , \
-                  'B': [[0]*totalRoadSections, [0]*totalRoadSections, [0]*totalRoadSections] }
+    dictSgnlIx = _getSgnlIxCounts(data, roadLen)
+
+    #Now plot the bar graph for each base station
+    for figNum, bstnID in enumerate(dictSgnlIx):
+        fig = plt.figure(figNum, figsize=(20, 10))
+        drawSgnlIxBars(fig.gca(), dictSgnlIx[bstnID], bstnID, roadLen)
+
+    plt.show()
     
+    return
 
-    for tupval in data:
-        #1. check the location and determine to which block it belongs to..
-        locationIndex = int(np.floor(tupval[0]/ROAD_SECTION_SIZE))
-       
-        #2. identify serving base station
-        servingBstn = tupval[1]
 
-        #2. determine the category of S/I value
-        sgnlIxRatio = tupval[2]
+class SgnlIxFigureRenderer:
 
-        if sgnlIxRatio > 10:
-            dictSgnlIx[servingBstn][2][locationIndex] += 1
-        
-        elif sgnlIxRatio > 5:
-            dictSgnlIx[servingBstn][1][locationIndex] += 1
+    def __init__(self, roadLen, fileFormat = 'png', dpi = 100):
+        """ Renders S/I bar graphs to image files without a display (Agg canvas).
+            One figure is created and reused for all the plots, so rendering many
+            runs in one process does not set up matplotlib again for every plot.
 
-        else:
-            dictSgnlIx[servingBstn][0][locationIndex] += 1
+            Input:
+                1. roadLen - length of road in meters
+                2. fileFormat - 'png' or 'svg'
+                3. dpi - resolution of png files """
 
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-    #Now plot the bar graph for each base station
-    barWidth = 25
-    xaxis = np.arange(100, roadLen+100, 100)
-    
-    plt.figure(0, figsize=(20, 10))
-    plt.bar(xaxis, dictSgnlIx['A'][0], barWidth, label='< 5dB', color='r')
-    plt.bar(xaxis+barWidth, dictSgnlIx['A'][1], barWidth, label='> 5dB and < 10dB', color='m')
-    plt.bar(xaxis+2*barWidth, dictSgnlIx['A'][2], barWidth, label='> 10dB', color='g')
-    plt.xticks(np.arange(0, 6001, 100),rotation = -45)
-    plt.xlabel('distances on road (left to right)')
-    plt.ylabel('Count')
-    plt.title('S/I bar chart for BASE STATION-A')
-    plt.legend(loc='best', prop={'size': 20})
-
-    plt.figure(1, figsize=(20, 10))
-    plt.bar(xaxis, dictSgnlIx['B'][0], barWidth, label='< 5dB', color='r')
-    plt.bar(xaxis+barWidth, dictSgnlIx['B'][1], barWidth, label='> 5dB and < 10dB', color='m')
-    plt.bar(xaxis+2*barWidth, dictSgnlIx['B'][2], barWidth, label='> 10dB', color='g')
-    plt.xticks(np.arange(0, 6001, 100),rotation = -45)
-    plt.xlabel('distances on road (left to right)')
-    plt.ylabel('Count')
-    plt.title('S/I bar chart for BASE STATION-B')
-    plt.legend(loc='best', prop={'size': 20})
+        self._roadLen = roadLen
+        self._fileFormat = fileFormat
+        self._dpi = dpi
 
-    plt.show()
-    
-    return
+        self._figure = Figure(figsize=(20, 10))
+        FigureCanvasAgg(self._figure)
+
+    def getFigure(self):
+        return self._figure
+
+    def render(self, data, filePrefix):
+        """ Writes one image file per base station named <filePrefix>_<bstn ID>.<format>
+
+            Input:
+                1. data - SgnlIxAccumulator object or list of tuples (see plotSgnlIxInfo)
+                2. filePrefix - path of the image files without base station ID and extension
+
+            Output:
+                List of paths of the image files written """
+
+        dictSgnlIx = _getSgnlIxCounts(data, self._roadLen)
+
+        filePaths = []
+
+        for bstnID in dictSgnlIx:
+            self._figure.clear()
+            drawSgnlIxBars(self._figure.add_subplot(), dictSgnlIx[bstnID], bstnID, self._roadLen)
+
+            filePath = '{0}_{1}.{2}'.format(filePrefix, bstnID, self._fileFormat)
+            self._figure.savefig(filePath, format=self._fileFormat, dpi=self._dpi)
+            filePaths.append(filePath)
+
+        return filePaths
+
+
+def saveSgnlIxInfo(data, roadLen, filePrefix, fileFormat = 'png'):
+    """ Same as plotSgnlIxInfo, but writes the bar graphs to image files instead
+        of showing them (works without a display)
+
+        Output:
+            List of paths of the image files written """
 
+    return SgnlIxFigureRenderer(roadLen, fileFormat).render(data, filePrefix)
@@ -0,0 +1,237 @@
+###################################################################
+# warmStart.py
+#
+# This python module starts the simulation in statistical steady
+# state instead of an empty network. The number of calls in progress
+# on each base station is sampled from the Erlang loss (truncated
+# Poisson) occupancy distribution of its offered load, and the calls
+# get stationary positions, directions, speeds and residual call
+# durations. For runs where this approximation does not apply, the
+# MSER-5 rule detects the warm-up period to be truncated from a KPI
+# time series (see kpiRecorder.py).
+#
+# Author: @Uttej
+# Date:   20th Nov 2021
+#
+# ENTS656 Python project
+#
+###################################################################
+
+import kpiRecorder as kpi
+import config as cfg
+import numpy as np
+import argparse
+import math
+
+
+WARM_START_SAMPLES = 20000      # stationary calls sampled to estimate the offered load of each base station
+MSER_BATCH_SIZE = 5             # batch size of MSER-5
+
+
+#------------------------------------------------------------------
+# Erlang loss occupancy distribution
+#------------------------------------------------------------------
+def erlangOccupancy(offeredLoad, numOfChannels):
+    """ Returns numpy array of P(n channels busy), n = 0 .. numOfChannels, of a loss
+        system (Erlang B) with 'offeredLoad' Erlangs: P(n) is proportional to a**n/n! """
+
+    if offeredLoad <= 0:
+        probability = np.zeros(numOfChannels + 1)
+        probability[0] = 1.0
+        return probability
+
+    #Computed with logarithms, a**n/n! overflows for large loads
+    n = np.arange(numOfChannels + 1)
+    logProbability = n * math.log(offeredLoad) - np.array([math.lgamma(value + 1) for value in n])
+
+    probability = np.exp(logProbability - np.max(logProbability))
+
+    return probability / np.sum(probability)
+
+
+def erlangB(offeredLoad, numOfChannels):
+    """ Returns the blocking probability (all channels busy) of Erlang B formula """
+
+    return float(erlangOccupancy(offeredLoad, numOfChannels)[-1])
+
+
+#------------------------------------------------------------------
+# Stationary calls
+#------------------------------------------------------------------
+def sampleStationaryCalls(numOfSamples):
+    """ Samples calls in progress of an unlimited network in steady state. A call in
+        progress started at a uniform position, its direction follows from the start
+        position (same rule as the engines) and its age is exponential with mean
+        AVG_CALL_DURATION (a call of exponential duration is alive at age a with
+        probability exp(-a/mean)). Calls whose mobile would have left the road are
+        rejected, as those calls are already completed. By the same memoryless
+        property, residual call durations are exponential with the same mean.
+
+        Output:
+            (array of positions, array of directions, array of speeds, array of
+             residual durations, fraction of samples accepted) """
+
+    startPositions = np.random.uniform(0, cfg.ROAD_LENGTH, numOfSamples)
+    directions = np.where(startPositions > cfg.ROAD_LENGTH/2, -1, 1)
+    speeds = np.random.normal(cfg.MOBILE_SPEED_MEAN, cfg.MOBILE_SPEED_STD, numOfSamples)
+    ages = np.random.exponential(cfg.AVG_CALL_DURATION, numOfSamples)
+
+    positions = startPositions + directions * speeds * ages
+
+    bAlive = (positions > 0) & (positions < cfg.ROAD_LENGTH)
+    numOfAlive = int(np.sum(bAlive))
+
+    durations = np.random.exponential(cfg.AVG_CALL_DURATION, numOfAlive)
+
+    return positions[bAlive], directions[bAlive], speeds[bAlive], durations, numOfAlive/max(numOfSamples, 1)
+
+
+def computeOfferedLoads(numOfUsers, stationIdx, numOfSamples = WARM_START_SAMPLES):
+    """ Estimates the offered load (in Erlangs) of every base station: calls arrive at
+        numOfUsers x CALL_RATE per hour, the mean holding time on the road is
+        AVG_CALL_DURATION x fraction of stationary samples accepted (calls also end at
+        the ends of the road), and each call in progress is offered to the base station
+        with the highest median RSL at its position. This is an approximation: in the
+        engines a call is set up on the station with the higher faded RSL of the two
+        strongest (coverageEstimator.py weights them by this probability), stays on its
+        station until the handoff margin is exceeded, and goes to the second station when
+        the first is blocked, so near the cell edges the loads are shared differently
+
+        Input:
+            1. numOfUsers - Total number of users
+            2. stationIdx - StationIndex object of the base stations
+            3. numOfSamples - number of stationary calls sampled
+
+        Output:
+            (array of offered loads in order of stationIdx, samples of sampleStationaryCalls
+             with array of serving station index appended) """
+
+    positions, directions, speeds, durations, acceptRate = sampleStationaryCalls(numOfSamples)
+
+    serverIndex = stationIdx.getStrongest(positions, 1)[:, 0]
+
+    arrivalRate = numOfUsers * cfg.CALL_RATE/3600
+    holdingTime = cfg.AVG_CALL_DURATION * acceptRate
+
+    share = np.bincount(serverIndex, minlength=len(stationIdx)) / max(len(serverIndex), 1)
+
+    return arrivalRate * holdingTime * share, (positions, directions, speeds, durations, serverIndex)
+
+
+def sampleSteadyState(numOfUsers, stationIdx, numOfChannels = cfg.CHANNELS_PER_SECTOR, numOfSamples = WARM_START_SAMPLES):
+    """ Samples the calls in progress of the network in steady state. The number of calls
+        of each base station is drawn from erlangOccupancy of its offered load, and the calls
+        are drawn from the stationary calls served by that base station. Effects of handoff
+        failures and drops on the occupancy are not modelled (they only shorten the warm-up).
+
+        Input:
+            1. numOfUsers - Total number of users (upper bound of the calls in progress)
+            2. stationIdx - StationIndex object of the base stations
+            3. numOfChannels - channels of each base station
+            4. numOfSamples - number of stationary calls sampled to estimate the loads
+
+        Output:
+            (array of positions, array of directions, array of speeds, array of residual
+             durations, array of serving station indices), one value per call """
+
+    offeredLoads, samples = computeOfferedLoads(numOfUsers, stationIdx, numOfSamples)
+    serverIndex = samples[4]
+
+    chosen = []
+    numOfCalls = 0
+
+    for index, offeredLoad in enumerate(offeredLoads):
+    #{ Start of for loop
+        numOfBusy = np.random.choice(numOfChannels + 1, p=erlangOccupancy(offeredLoad, numOfChannels))
+        numOfBusy = min(numOfBusy, numOfUsers - numOfCalls)
+
+        candidates = np.flatnonzero(serverIndex == index)
+
+        if numOfBusy == 0 or len(candidates) == 0:
+            continue
+
+        chosen.append(np.random.choice(candidates, numOfBusy, replace=len(candidates) < numOfBusy))
+        numOfCalls += numOfBusy
+    #} End of for loop
+
+    chosen = np.concatenate(chosen) if chosen else np.zeros(0, dtype=int)
+
+    return tuple(values[chosen] for values in samples)
+
+
+#------------------------------------------------------------------
+# MSER-5 warm-up truncation
+#------------------------------------------------------------------
+def mser(series, batchSize = MSER_BATCH_SIZE):
+    """ Finds the warm-up period of a time series with the MSER rule: the series is
+        averaged in batches of 'batchSize', and the number of batches d removed from the
+        start minimizes the squared standard error of the mean of the rest,
+        sum((x - mean)**2)/(n - d)**2. Only d up to half of the batches is searched; a
+        minimum at that bound means the run is too short to tell.
+
+        Input:
+            1. series - array of observations at equal time intervals
+            2. batchSize - number of observations per batch (5 for MSER-5)
+
+        Output:
+            (number of observations to truncate, boolean flag which is False if the
+             minimum is at the bound of the search) """
+
+    series = np.asarray(series, dtype=float)
+    numOfBatches = len(series)//batchSize
+
+    if numOfBatches < 2:
+        return 0, False
+
+    batches = series[:numOfBatches * batchSize].reshape(numOfBatches, batchSize).mean(axis=1)
+
+    #Sums of batches[d:] and of their squares for every d, from the end
+    sums = np.cumsum(batches[::-1])[::-1]
+    sumSquares = np.cumsum(batches[::-1]**2)[::-1]
+    counts = numOfBatches - np.arange(numOfBatches)
+
+    mserValues = (sumSquares - sums**2/counts)/counts**2
+
+    maxTruncation = numOfBatches//2
+    truncation = int(np.argmin(mserValues[:maxTruncation + 1]))
+
+    return truncation * batchSize, truncation < maxTruncation
+
+
+def detectWarmup(kpiRecorder, batchSize = MSER_BATCH_SIZE):
+    """ Applies mser to the total channels in use of the KPI snapshots (take snapshots
+        at a short interval, e.g. --kpi-interval 10)
+
+        Output:
+            (time in seconds after which the statistics are in steady state, boolean
+             flag which is False if the run is too short to tell) """
+
+    channelsInUse = sum(kpiRecorder.getChannelsInUse(bstnID) for bstnID in kpiRecorder.getBstnIDs())
+
+    truncation, bReliable = mser(channelsInUse, batchSize)
+
+    times = kpiRecorder.getTimes()
+    warmupTime = float(times[truncation - 1]) if truncation > 0 else 0.0
+
+    return warmupTime, bReliable
+
+
+#------------------------------------------------------------------
+# Command line interface
+#------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Detect the warm-up period of a KPI file with MSER-5')
+
+    parser.add_argument('kpiPath', help='KPI file written by main.py --kpi-file (short --kpi-interval)')
+    parser.add_argument('--batch-size', dest='batchSize', type=int, default=MSER_BATCH_SIZE, \
+                        help='Snapshots per batch (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    warmupTime, bReliable = detectWarmup(kpi.readKpiFile(args.kpiPath), args.batchSize)
+
+    print('Warm-up period: {0:g} seconds'.format(warmupTime))
+
+    if not bReliable:
+        print('Minimum is at the end of the search, the run may be too short to reach steady state')